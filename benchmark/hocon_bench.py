@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Hocon parse time benchmark on the large generated config
+
+Usage::
+
+    python benchmark/hocon_bench.py
+"""
+
+import timeit
+
+from medoly.config.hocon import ConfigFactory
+
+
+def generate(sections):
+    """Generates the hocon text with the sections"""
+    lines = []
+    for i in range(sections):
+        lines.append("# the service %d" % i)
+        lines.append("service_%d {" % i)
+        lines.append('    host = "service-%d.internal.example.com"' % i)
+        lines.append("    port = %d" % (8000 + i))
+        lines.append("    timeout = 2.5 // seconds")
+        lines.append("    enabled = on")
+        lines.append("    url = http_%d_endpoint_with_a_long_unquoted_value" % i)
+        lines.append('    tags = [web, "api", v%d]' % i)
+        lines.append("    pool { size = 20, recycle = 3600 }")
+        lines.append("}")
+    return "\n".join(lines)
+
+
+def bench(sections, number=3):
+    text = generate(sections)
+    for pystyle in (False, True):
+        cost = timeit.timeit(lambda: ConfigFactory.parse(text, pystyle=pystyle), number=number) / number
+        print("%5d sections %4d KB pystyle=%-5s %8.2f ms/parse" % (
+            sections, len(text) // 1024, pystyle, cost * 1e3))
+
+
+if __name__ == "__main__":
+    for sections in (100, 1000, 3000):
+        bench(sections)
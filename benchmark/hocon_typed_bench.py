@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Hocon typed getters benchmark on a deeply nested config: the unsealed nodes vs the sealed cached nodes
+
+Usage::
+
+    python benchmark/hocon_typed_bench.py
+"""
+
+import timeit
+
+from medoly.config.hocon import Config, HoconRoot, Parser
+
+
+def generate(depth=12, width=100):
+    lines = []
+    for i in range(depth):
+        lines.append("level%d {" % i)
+    lines.append("ports = [%s]" % ", ".join(str(i) for i in range(width)))
+    lines.append("ratio = 0.75")
+    lines.append("enabled = on")
+    lines.append("}" * depth)
+    return "\n".join(lines)
+
+
+def create_config(sealed):
+    root = Parser().parse_text(generate(), None, False, resolve=False)
+    if sealed:
+        root.value.seal()
+    return Config(HoconRoot(root.value))
+
+
+def bench(number=20000):
+    prefix = ".".join("level%d" % i for i in range(12))
+    for sealed in (False, True):
+        config = create_config(sealed)
+        for getter, key in ((config.get_int_list, "ports"), (config.get_float, "ratio"),
+                            (config.get_bool, "enabled")):
+            path = prefix + "." + key
+            cost = timeit.timeit(lambda: getter(path), number=number)
+            print("%-8s %-14s %8.3f us" % ("sealed" if sealed else "unsealed", getter.__name__,
+                                          cost / number * 1e6))
+
+
+if __name__ == "__main__":
+    bench()
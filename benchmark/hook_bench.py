@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Per-request hook overhead benchmark: the unfrozen vs frozen hook map
+
+Usage::
+
+    python benchmark/hook_bench.py
+"""
+
+import timeit
+
+from medoly.anthem.hook import HookMap
+
+
+def on_request(handler):
+    pass
+
+
+def create_hooks(count, failsafe, frozen):
+    hooks = HookMap()
+    for i in range(count):
+        hooks.attach("on_start_request", on_request, failsafe=failsafe, priority=i)
+    if frozen:
+        hooks.freeze()
+    return hooks
+
+
+def bench(count, failsafe=False, number=100000):
+    handler = object()
+    for frozen in (False, True):
+        hooks = create_hooks(count, failsafe, frozen)
+        # a request runs the start and end hook points
+        cost = timeit.timeit(lambda: (hooks.run("on_start_request", handler),
+                                      hooks.run("on_end_request", handler)), number=number)
+        print("%2d hooks failsafe=%-5s %-8s %6.2f us/request" % (
+            count, failsafe, "frozen" if frozen else "unfrozen", cost / number * 1e6))
+
+
+if __name__ == "__main__":
+    for count in (0, 1, 5):
+        bench(count)
+    bench(5, failsafe=True)
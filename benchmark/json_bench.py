@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Json encoding benchmark of a mixed payload: the ``hasattr``/``isinstance`` chain
+vs the serializer type dispatch
+
+Usage::
+
+    python benchmark/json_bench.py
+"""
+
+import datetime
+import decimal
+import json
+import timeit
+
+from medoly.anthem import serializer
+
+
+class Entry(object):
+
+    def __init__(self, i):
+        self.i = i
+
+    def __json__(self):
+        return {"id": self.i, "title": "entry %d" % self.i,
+                "updated": datetime.datetime(2016, 1, 1, 12, 0, self.i % 60)}
+
+
+def chain_as_json(obj):
+    """The isinstance chain adapter"""
+    if hasattr(obj, '__json__') and callable(obj.__json__):
+        return obj.__json__()
+    if isinstance(obj, (datetime.date,
+                        datetime.datetime,
+                        datetime.time)):
+        return obj.isoformat()[:19].replace('T', ' ')
+    elif isinstance(obj, (int, long)):
+        return int(obj)
+    elif isinstance(obj, decimal.Decimal):
+        return str(obj)
+    else:
+        raise TypeError(repr(obj) + " is not JSON serializable")
+
+
+def payload(count):
+    return {"entries": [Entry(i) for i in range(count)],
+            "prices": [decimal.Decimal("%d.50" % i) for i in range(count)],
+            "dates": [datetime.date(2016, 1, 1 + i % 28) for i in range(count)]}
+
+
+def bench(count=1000, number=200):
+    data = payload(count)
+    cost = timeit.timeit(lambda: json.dumps(data, default=chain_as_json), number=number)
+    print("%-22s %8.2f ms/encode" % ("isinstance chain", cost / number * 1e3))
+
+    cost = timeit.timeit(lambda: serializer.dumps(data), number=number)
+    print("%-22s %8.2f ms/encode" % ("type dispatch", cost / number * 1e3))
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Muses lookup benchmark: the function, the attribute and the item lookups of a resolved singleton thing
+
+Usage::
+
+    python benchmark/muses_bench.py
+"""
+
+import timeit
+
+from medoly import muses
+from medoly.kanon.scope import SingletonProvider
+
+
+class EntryThing(object):
+    pass
+
+
+def bench(number=1000000):
+    registry = muses.Registry()
+    registry.things._mount({"Entry": SingletonProvider(EntryThing)})
+    muses.activate(registry)
+    things = registry.things
+    for name, lookup in (("muses.Thing", lambda: muses.Thing("Entry")),
+                         ("muses.things", lambda: muses.things.Entry),
+                         ("registry.things", lambda: things.Entry),
+                         ("registry item", lambda: things["Entry"])):
+        cost = timeit.timeit(lookup, number=number)
+        print("%-16s %8.3f us" % (name, cost / number * 1e6))
+
+
+if __name__ == "__main__":
+    bench()
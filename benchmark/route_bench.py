@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Route dispatch benchmark: the tornado regex router vs the segment trie router
+
+Usage::
+
+    python benchmark/route_bench.py
+"""
+
+import timeit
+
+from tornado.httputil import HTTPServerRequest
+
+from medoly import anthem
+from medoly.kanon.manager import InventoryManager
+
+
+class Handler(anthem.Handler):
+    pass
+
+
+def create_app(count, route_engine=None):
+    mgr = InventoryManager()
+    for i in range(count // 2):
+        mgr.connect("/res%d" % i, Handler)
+        mgr.connect("/res%d/{item_id:int}" % i, Handler)
+    return anthem.Application(mgr.app_ctx.routes, lambda app: None, route_engine=route_engine)
+
+
+def bench(count, number=2000):
+    # the worst case for the regex router, the last route
+    request = HTTPServerRequest(uri="/res%d/42" % (count // 2 - 1))
+    for engine in (None, "trie"):
+        app = create_app(count, engine)
+        cost = timeit.timeit(lambda: app.find_handler(request), number=number)
+        print("%5d routes %-6s %8.2f us/lookup" % (count, engine or "regex", cost / number * 1e6))
+
+
+if __name__ == "__main__":
+    for count in (10, 100, 1000):
+        bench(count)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""SelectConfig lookup benchmark: the nested dict walk vs the compiled flat index
+
+Usage::
+
+    python benchmark/select_config_bench.py
+"""
+
+import timeit
+
+from medoly.config import SelectConfig
+
+
+def create_config(compiled):
+    config = SelectConfig()
+    config.set("theme", "default")
+    for i in range(50):
+        config.set("section_%d.name" % i, "section")
+        config.set("section_%d.pool.size" % i, i)
+    config.set("sqlalchemy.pool.size", 20)
+    if compiled:
+        config.compile()
+    return config
+
+
+def bench(number=500000):
+    for compiled in (False, True):
+        config = create_config(compiled)
+        for key in ("theme", "sqlalchemy.pool", "sqlalchemy.pool.size", "not.found.key"):
+            cost = timeit.timeit(lambda: config.get(key, None), number=number)
+            print("%-8s get(%-22r) %6.3f us" % ("compiled" if compiled else "walk", key, cost / number * 1e6))
+
+
+if __name__ == "__main__":
+    bench()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 from datetime import datetime
+from sqlalchemy import func
 from medoly import kanon
 from medoly.muses import Model
 
@@ -31,6 +32,10 @@ class EntryMapper(object):
 
         return q.all()
 
+    def last_updated(self):
+        """Gets the last updated timestamp of the entries, ``None`` if no entry"""
+        return db.query(func.max(self.model.updated)).scalar()
+
     def find_by_slug(self, slug):
         """Find entries by the entry slug
 
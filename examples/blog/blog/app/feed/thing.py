@@ -21,3 +21,7 @@ class FeedThing(object):
         else:
             updated = datetime.utcnow().strftime(date_format)
         return {"entries": entries, "updated": updated}
+
+    def last_updated(self):
+        """Get the last updated time of the feed entries"""
+        return self.mapper.last_updated()
@@ -10,6 +10,9 @@ class FeedHandler(anthem.Handler):
 
     feed_thing = kanon.Melos("thing:Feed")
 
+    def get_validator(self):
+        return self.feed_thing.last_updated()
+
     def get(self):
         feed_data = self.feed_thing.feed_entries()
         self.set_header("Content-Type", "application/atom+xml")
@@ -22,10 +22,14 @@ patch_tornado()
 
 from .handler import Handler, RenderHandler, url
 from .app import Application
+from .cache import cached
+from .host import Host
 
 
 __all__ = ('Handler',
            'RenderHandler',
            'url',
            'Application',
+           'cached',
+           'Host',
            )
@@ -45,11 +45,36 @@ Examples:
         app.error_page(404, nof_found)
 
 
+Route engine
+~~~~~~~~~~~~~~~~~~
+
+Defaults, the routes are matched by the tornado regex router one after another. Sets the
+``route_engine`` setting to ``"trie"`` to use the segment trie router (see ``medoly.anthem.router``).
+
+.. code-block:: python
+
+        app = Appliction(handlers, intialize, route_engine="trie")
+
+Muses registry
+~~~~~~~~~~~~~~~~~~
+
+If the ``registry`` is set, the requests are handled under it by ``muses.use``, including the coroutine callbacks
+of the request, so the ``muses.Thing`` and the other muses functions in the handlers resolve the inventory of
+the application when several applications are served in one process.
+
 """
 
+import functools
+
 import tornado.web
+from tornado import httputil
+from tornado.stack_context import StackContext
+
+from medoly import muses
+from medoly.config import ConfigSnapshot
 
 from .hook import HookMap
+from .router import TrieRouter
 
 
 class Application(tornado.web.Application):
@@ -65,19 +90,61 @@ class Application(tornado.web.Application):
     :param initialize: the function for initailize  application
     :param settings: the more tornado application settings,
         configuration options for customizing the behavior.
+        The ``route_engine`` setting selects the route dispatcher, ``"trie"`` uses the segment trie router,
+        defaults to the tornado regex router.
+        The ``freeze_hooks`` setting controls to freeze the hooks after initializing, defaults to ``True``.
+        The ``concurrent_hooks`` setting runs the coroutine hooks at the same priority concurrently,
+        defaults to ``False``.
     """
 
     hookpoints = ['on_start_request', 'on_end_request',
                   'before_error_response', 'after_error_response']
     """Hook entry  key points"""
 
+    config = ConfigSnapshot()
+    """The application config, the immutable ``ConfigSnapshot`` swapped by ``update_config``"""
+
+    registry = None
+    """The muses registry of the inventory manager created the application, the requests are handled under it"""
+
     def __init__(self, handlers, initialize, **settings):
         #: error pages, contains the error process handler for the status codes
         self.error_pages = {}
-        self.hooks = HookMap()
+        self.hooks = HookMap(concurrent=settings.get("concurrent_hooks", False))
         initialize(self)
+        if settings.get("freeze_hooks", True):
+            self.hooks.freeze()
         tornado.web.Application.__init__(
             self, handlers, **settings)
+        if settings.get("route_engine") == "trie":
+            self.use_trie_router()
+
+    def use_trie_router(self):
+        """Replaces the wildcard host regex router by the segment trie router"""
+        router = TrieRouter(self, self.wildcard_router.rules)
+        for rule in self.default_router.rules:
+            if rule.target is self.wildcard_router:
+                rule.target = router
+        self.wildcard_router = router
+
+    def get_handler_delegate(self, request, target_class, target_kwargs=None,
+                             path_args=None, path_kwargs=None):
+        """Returns the handler delegate, runs the request under the ``registry`` if it's set"""
+        delegate = super(Application, self).get_handler_delegate(
+            request, target_class, target_kwargs, path_args, path_kwargs)
+        if self.registry is None:
+            return delegate
+        return _RegistryDelegate(delegate, self.registry)
+
+    def update_config(self, config):
+        """Swaps in a new config snapshot updated by the settings
+
+        The running requests keep reading the snapshot they got, returns the new snapshot.
+
+        :param config: the dict or ``SelectConfig`` settings
+        """
+        self.config = self.config.updated(config)
+        return self.config
 
     def attach(self, point, callback, failsafe=None, priority=None, **kwargs):
         """Added hook point"""
@@ -112,3 +179,31 @@ class Application(tornado.web.Application):
         if not isinstance(code, int):
             raise TypeError("code:%d is not int type" % (code))
         self.error_pages[str(code)] = callback
+
+
+class _RegistryDelegate(httputil.HTTPMessageDelegate):
+    """Runs the handler delegate in the stack context of the muses registry
+
+    :param delegate: the handler delegate
+    :param registry: the muses registry
+    """
+
+    def __init__(self, delegate, registry):
+        self.delegate = delegate
+        self.context = functools.partial(muses.use, registry)
+
+    def headers_received(self, start_line, headers):
+        with StackContext(self.context):
+            return self.delegate.headers_received(start_line, headers)
+
+    def data_received(self, chunk):
+        with StackContext(self.context):
+            return self.delegate.data_received(chunk)
+
+    def finish(self):
+        with StackContext(self.context):
+            return self.delegate.finish()
+
+    def on_connection_close(self):
+        with StackContext(self.context):
+            return self.delegate.on_connection_close()
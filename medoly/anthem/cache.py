@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Response cache
+-------------------------------------------------
+
+Caches the ``GET`` responses of a request handler, keyed on the host, path, query string and the vary headers.
+On a cache hit, the request handler method is skipped, and the request with a matched ``If-None-Match``
+gets the ``304`` response directly.
+
+Only the ``GET`` responses are stored, the ``HEAD`` request is served by the cached ``GET`` response.
+The responses setting cookies, reading the cookies or the ``current_user``, or with a status code other than ``200``
+are not cached. Adds ``Cookie`` in the ``vary`` headers to cache the responses depending on the cookies.
+
+Examples:
+
+.. code-block:: python
+
+    @anthem.cached(ttl=60, vary=["Accept-Language"])
+    class ArchiveHandler(anthem.Handler):
+
+        def get(self):
+            self.render("archive.html", entries=self.entry_thing.archive())
+
+    # or the menu option
+    @kanon.menu("/feed", cache=dict(ttl=300))
+    class FeedHandler(object):
+        pass
+
+    # caches in memory, then in memory-mapped files shared by the worker processes
+    @kanon.route()
+    def pages(c):
+        c.connect("/about", render="about.html", cache=dict(ttl=3600, disk_path="/var/cache/blog"))
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import time
+from collections import OrderedDict
+
+from tornado.escape import utf8
+
+
+class CachedResponse(object):
+    """A cached response
+
+    :param headers: the response header ``(name, value)`` list
+    :param bytes body: the response body
+    :param etag: the etag of the body
+    :param float expires: the expired timestamp
+    """
+
+    __slots__ = ('headers', 'body', 'etag', 'expires')
+
+    def __init__(self, headers, body, etag, expires):
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.expires = expires
+
+    def expired(self, now=None):
+        """Checks the response is expired"""
+        return (now or time.time()) >= self.expires
+
+
+class MemoryStore(object):
+    """In memory LRU response store
+
+    :param int max_entries: the max entries, the least recently used entry is evicted when full.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Gets the response, returns ``None`` if not found or expired"""
+        response = self._entries.pop(key, None)
+        if response is None or response.expired():
+            return None
+        # move to the most recently used end
+        self._entries[key] = response
+        return response
+
+    def put(self, key, response):
+        """Puts the response"""
+        self._entries.pop(key, None)
+        self._entries[key] = response
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Removes the response"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Removes all responses"""
+        self._entries.clear()
+
+
+class DiskStore(object):
+    """Memory-mapped file response store
+
+    Each response is written in a file under the directory, and read by ``mmap``, the page cache
+    is shared by the processes on the host. The file mtime is set to the expired timestamp, the expired
+    files are removed when read or when the directory is full, then the files expiring first are evicted.
+    The size of the files written by the other processes is counted on the next eviction, so the directory
+    may exceed ``max_size`` by the writes of the other processes.
+
+    :param string path: the cache directory
+    :param int max_size: the max bytes of the cache files, defaults to 64M.
+    """
+
+    def __init__(self, path, max_size=64 * 1024 * 1024):
+        self.path = path
+        self.max_size = max_size
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        #: the bytes of the cache files at the last eviction and the files written since
+        self.size = self.evict()
+
+    def _file(self, key):
+        return os.path.join(self.path, hashlib.sha1(utf8(repr(key))).hexdigest())
+
+    def get(self, key):
+        """Gets the response, returns ``None`` if not found or expired"""
+        try:
+            with open(self._file(key), "rb") as f:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError):
+            return None
+        try:
+            end = m.find(b"\n")
+            if end < 0:
+                return None
+            meta = json.loads(m[:end].decode("utf-8"))
+            if meta["expires"] <= time.time():
+                self.delete(key)
+                return None
+            headers = [(str(name), value) for name, value in meta["headers"]]
+            return CachedResponse(headers, m[end + 1:], meta["etag"], meta["expires"])
+        except (ValueError, KeyError, TypeError):
+            # the corrupt entry is a cache miss, it's replaced by the next response
+            return None
+        finally:
+            m.close()
+
+    def put(self, key, response):
+        """Writes the response file atomically, evicts the files if the directory is full"""
+        meta = utf8(json.dumps({"headers": response.headers, "etag": response.etag, "expires": response.expires}))
+        # the dot files being written are skipped by the eviction
+        fd, tmp = tempfile.mkstemp(prefix=".", dir=self.path)
+        with os.fdopen(fd, "wb") as f:
+            f.write(meta)
+            f.write(b"\n")
+            f.write(response.body)
+        os.utime(tmp, (response.expires, response.expires))
+        os.rename(tmp, self._file(key))
+        self.size += len(meta) + 1 + len(response.body)
+        if self.size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Removes the expired files, then the files expiring first until the files fit in 90% of the ``max_size``
+
+        :returns: the bytes of the left files
+        """
+        now = time.time()
+        files, size = [], 0
+        for name in os.listdir(self.path):
+            if name.startswith("."):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if st.st_mtime <= now:
+                self._remove(path)
+            else:
+                files.append((st.st_mtime, st.st_size, path))
+                size += st.st_size
+        if size > self.max_size:
+            files.sort()
+            low = self.max_size * 0.9
+            for _, file_size, path in files:
+                if size <= low:
+                    break
+                self._remove(path)
+                size -= file_size
+        self.size = size
+        return size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def delete(self, key):
+        """Removes the response"""
+        self._remove(self._file(key))
+
+    def clear(self):
+        """Removes all responses"""
+        for name in os.listdir(self.path):
+            self._remove(os.path.join(self.path, name))
+        self.size = 0
+
+
+class ResponseCache(object):
+    """Response cache of a request handler
+
+    :param int ttl: the seconds to keep a response, defaults to 60.
+    :param vary: the request header names the response varies on, defaults to None.
+    :param int max_entries: the max entries in memory, defaults to 1024.
+    :param disk_path: the directory of the memory-mapped file tier, defaults to None, only caches in memory.
+    :param int disk_max_size: the max bytes of the disk tier files, defaults to 64M.
+    """
+
+    def __init__(self, ttl=60, vary=None, max_entries=1024, disk_path=None, disk_max_size=64 * 1024 * 1024):
+        self.ttl = ttl
+        self.vary = tuple(vary or ())
+        self.memory = MemoryStore(max_entries)
+        self.disk = DiskStore(disk_path, disk_max_size) if disk_path else None
+
+    def key(self, request):
+        """Returns the cache key of the request"""
+        if self.vary:
+            headers = request.headers
+            return (request.host, request.path, request.query) + tuple(headers.get(name) for name in self.vary)
+        return request.host, request.path, request.query
+
+    def get(self, key):
+        """Gets the response from memory, then the disk tier"""
+        response = self.memory.get(key)
+        if response is None and self.disk is not None:
+            response = self.disk.get(key)
+            if response is not None:
+                self.memory.put(key, response)
+        return response
+
+    def put(self, key, headers, body, etag):
+        """Caches the response"""
+        response = CachedResponse(headers, body, etag, time.time() + self.ttl)
+        self.memory.put(key, response)
+        if self.disk is not None:
+            self.disk.put(key, response)
+
+    def clear(self):
+        """Removes all cached responses"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+def create_cache(options):
+    """Creates a response cache
+
+    :param options: a ``ResponseCache``, the ``ResponseCache`` arguments dict, or the ttl seconds.
+    """
+    if isinstance(options, ResponseCache):
+        return options
+    if isinstance(options, dict):
+        return ResponseCache(**options)
+    return ResponseCache(ttl=options)
+
+
+def cached(ttl=60, vary=None, max_entries=1024, disk_path=None, disk_max_size=64 * 1024 * 1024):
+    """The request handler class decorator to cache the ``GET`` responses
+
+    See ``ResponseCache`` for the arguments.
+    """
+    def _cached(handler):
+        handler.response_cache = ResponseCache(ttl, vary, max_entries, disk_path, disk_max_size)
+        return handler
+    return _cached
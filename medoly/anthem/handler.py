@@ -18,26 +18,158 @@
 -------------------------------------------------
 """
 
+import datetime
+import email.utils
+import hashlib
+
+from tornado import gen
+from tornado.ioloop import IOLoop
 from tornado.web import RequestHandler, url
 from tornado.escape import utf8, json_encode
 
+from .patch import json_iterencode
+from .router import TypedArgumentsMixin
+
 
 from .flash import FlashMessagesMixin
 
 
-class Handler(RequestHandler, FlashMessagesMixin):
+class Handler(TypedArgumentsMixin, RequestHandler, FlashMessagesMixin):
     """Medoly Request Handler class
 
     Extends:
+        TypedArgumentsMixin
         RequestHandler
         FlashMessagesMixin
     """
 
+    #: the ``ResponseCache`` for the ``GET`` responses, see ``medoly.anthem.cache``
+    response_cache = None
+
+    _cache_key = None
+
+    #: ``True`` if the cookies are read, the response may depend on the user
+    _cookies_read = False
+
+    #: the request and pooled scoped inventory, the provider to ``(provider, instance)``
+    _scoped_instances = None
+
     def prepare(self):
         """Perpare request process
+
+        Returns a Future when the ``on_start_request`` hooks are coroutines.
         """
-        self.hooks.run('on_start_request', self)
+        future = self.hooks.run('on_start_request', self)
+        if future is not None:
+            return self._prepare_async(future)
+        self.on_start_request()
+        self._check_not_modified()
+        self._serve_cache()
+
+    @gen.coroutine
+    def _prepare_async(self, future):
+        """Awaits the ``on_start_request`` hooks"""
+        yield future
         self.on_start_request()
+        self._check_not_modified()
+        self._serve_cache()
+
+    def get_validator(self, *args, **kwargs):
+        """Returns the cheap validator of the requested resource
+
+        Override it to skip the handler method on the conditional ``GET`` when the resource is not changed.
+        The validator is a UTC ``datetime`` sets the ``Last-Modified`` header, or a version string,
+        both set the weak ``Etag`` header. Defaults to ``None``, no validator.
+
+        Example:
+
+        .. code-block:: python
+
+            def get_validator(self, slug):
+                return self.entry_thing.last_updated(slug)
+
+        :param args: the path arguments of the request
+        :param kwargs: the path keyword arguments of the request
+        """
+        return None
+
+    def _check_not_modified(self):
+        """Finishes the request with ``304`` when the validator matches the request conditions"""
+        if self._finished or self.request.method not in ("GET", "HEAD"):
+            return
+        validator = self.get_validator(*self.path_args, **self.path_kwargs)
+        if validator is None:
+            return
+
+        modified = None
+        if isinstance(validator, datetime.datetime):
+            modified = datetime.datetime(*validator.utctimetuple()[:6])
+            self.set_header("Last-Modified", modified)
+            validator = modified.isoformat()
+        self.set_header("Etag", 'W/"%s"' % hashlib.sha1(utf8(validator)).hexdigest())
+
+        headers = self.request.headers
+        if "If-None-Match" in headers:
+            not_modified = self.check_etag_header()
+        else:
+            since = headers.get("If-Modified-Since")
+            since = since and email.utils.parsedate(since)
+            not_modified = bool(modified and since) and datetime.datetime(*since[:6]) >= modified
+
+        if not_modified:
+            self.set_status(304)
+            self.finish()
+
+    def _serve_cache(self):
+        """Finishes the request by the cached response, the request handler method is skipped"""
+        cache = self.response_cache
+        if cache is None or self._finished or self.request.method not in ("GET", "HEAD"):
+            return
+        key = cache.key(self.request)
+        response = cache.get(key)
+        etag = self._headers.get("Etag")
+        # the response is stale when the validator etag is changed
+        if response is None or (etag is not None and response.etag != etag):
+            # caches the ``GET`` response on finish, the ``HEAD`` response has no body
+            if self.request.method == "GET":
+                self._cache_key = key
+            return
+
+        # the cached headers replace the default ones, like the ``Content-Type``
+        for name in set(name for name, _ in response.headers):
+            self.clear_header(name)
+        for name, value in response.headers:
+            self.add_header(name, value)
+        if response.etag is not None:
+            self.set_header("Etag", response.etag)
+            if self.check_etag_header():
+                self.set_status(304)
+                self.finish()
+                return
+        self.finish(response.body)
+
+    def _cache_response(self, key):
+        """Caches the buffered response, skips the response depends on the user"""
+        if self.get_status() != 200 or self._headers_written or hasattr(self, "_new_cookie"):
+            return
+        if (self._cookies_read or hasattr(self, "_current_user")) and "Cookie" not in self.response_cache.vary:
+            return
+        headers = [(name, value) for name, value in self._headers.get_all()
+                   if name not in ("Date", "Server", "Etag", "Content-Length")]
+        body = b"".join(self._write_buffer)
+        etag = self._headers.get("Etag") or self.compute_etag()
+        self.response_cache.put(key, headers, body, etag)
+
+    @property
+    def cookies(self):
+        """An alias for ``self.request.cookies``, marks the cookies are read"""
+        self._cookies_read = True
+        return self.request.cookies
+
+    def get_cookie(self, name, default=None):
+        """Gets the cookie value, marks the cookies are read"""
+        self._cookies_read = True
+        return super(Handler, self).get_cookie(name, default)
 
     def on_start_request(self):
         """Process hook after ``on_start_request''
@@ -83,6 +215,54 @@ class Handler(RequestHandler, FlashMessagesMixin):
         chunk = utf8(chunk)
         self._write_buffer.append(chunk)
 
+    @gen.coroutine
+    def jsonify_stream(self, json_obj, chunk_size=65536):
+        """Streaming json data write
+
+        Encodes the data incrementally and flushes the chunks in bounded size, the nested dicts and lists
+        are encoded item by item and the generators in the data are consumed lazily, see ``json_iterencode``.
+        Must be awaited in a coroutine method.
+
+        Example:
+
+        .. code-block:: python
+
+            @gen.coroutine
+            def get(self):
+                yield self.jsonify_stream({"entries": self.mapper.iter_entries()})
+
+        Arguments:
+            json_obj {object} -- the data can json encoding
+            chunk_size {int} -- the chunk size in bytes to flush
+
+        Raises:
+            RuntimeError --  run time exception when  request had finshed
+        """
+        if self._finished:
+            raise RuntimeError("Cannot jsonify_stream() after finish().  May be caused "
+                               "by using async operations without the "
+                               "@asynchronous decorator.")
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+        chunks, size = [], 0
+        for chunk in json_iterencode(json_obj):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= chunk_size:
+                self._write_buffer.append(utf8("".join(chunks)))
+                chunks, size = [], 0
+                yield self.flush()
+        if chunks:
+            self._write_buffer.append(utf8("".join(chunks)))
+
+    def finish(self, chunk=None):
+        """Finishes this response, and caches the response if the handler has the response cache"""
+        if self._cache_key is not None and not self._finished:
+            if chunk is not None:
+                self.write(chunk)
+                chunk = None
+            self._cache_response(self._cache_key)
+        return super(Handler, self).finish(chunk)
+
     def render(self, template_name, **kwargs):
         """Renders the template with the given arguments as the response."""
         html = self.render_string(template_name, **kwargs)
@@ -90,9 +270,26 @@ class Handler(RequestHandler, FlashMessagesMixin):
 
     def on_finish(self):
         """Hook pointer process  on request finshing
+
+        The response has been sent, the coroutine ``on_end_request`` hooks are run on the IOLoop.
         """
         self.on_end_request()
-        self.hooks.run('on_end_request', self)
+        future = self.hooks.run('on_end_request', self)
+        if future is not None:
+            IOLoop.current().add_future(future, self._on_end_request_done)
+        else:
+            self._release_scoped()
+
+    def _on_end_request_done(self, future):
+        self._release_scoped()
+        future.result()
+
+    def _release_scoped(self):
+        """Releases the request and pooled scoped inventory instances, see ``medoly.kanon.scope``"""
+        scoped, self._scoped_instances = self._scoped_instances, None
+        if scoped:
+            for provider, instance in scoped.itervalues():
+                provider.release(instance)
 
     def on_end_request(self):
         """Custom request handler hook on end request
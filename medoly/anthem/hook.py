@@ -18,10 +18,29 @@
 """Http RequestHandler hook point manager
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+The ``HookMap`` can be frozen when the hooks are all attached, each hook point
+is compiled to an execution plan of the bare callbacks. The point without hooks returns at once,
+and the point without failsafe hooks runs the callbacks in a plain loop.
+
+The coroutine callbacks (``tornado.gen.coroutine`` or ``async def`` functions) are supported,
+when a hook point has coroutine hooks, ``HookMap.run`` returns a Future, the hooks are awaited
+one by one keeping the priority and failsafe semantics. If the ``HookMap`` is ``concurrent``, the hooks
+at the same priority are run concurrently.
+
+.. code-block:: python
+
+    @kanon.hook("on_start_request")
+    @gen.coroutine
+    def load_session(req_handler):
+        req_handler.session = yield session_store.load(req_handler)
 """
+import inspect
 import logging
 from sys import exc_info
 
+from tornado import gen
+from tornado.concurrent import is_future
+
 
 LOGGER = logging.getLogger('anthem.hook')
 
@@ -46,8 +65,13 @@ class Hook(object):
     should be limited to the closed interval [0, 100], but values outside
     this range are acceptable, as are fractional values."""
 
+    coroutine = False
+    """
+    If True, the callback is a coroutine function, the result is awaited."""
+
     def __init__(self, callback, failsafe=None, priority=None):
         self.callback = callback
+        self.coroutine = is_coroutine_function(callback)
 
         if failsafe is None:
             failsafe = getattr(callback, "failsafe", False)
@@ -76,20 +100,37 @@ class Hook(object):
                    self.failsafe, self.priority))
 
 
+def is_coroutine_function(func):
+    """Checks the function is a tornado coroutine or a native coroutine function"""
+    if getattr(func, "__tornado_coroutine__", False):
+        return True
+    iscoroutinefunction = getattr(inspect, "iscoroutinefunction", None)
+    return bool(iscoroutinefunction and iscoroutinefunction(func))
+
+
 class HookMap(dict):
 
     """A Manager of Request call points to lists of callbacks (Hook objects)."""
 
-    def __new__(cls, points=None):
+    _plans = None
+    """The compiled execution plans of the frozen hook map, ``None`` if not frozen"""
+
+    concurrent = False
+    """If True, the coroutine hooks at the same priority run concurrently"""
+
+    SIMPLE, FAILSAFE, COROUTINE = range(3)
+    """The execution plan kinds"""
+
+    def __new__(cls, points=None, concurrent=False):
         d = dict.__new__(cls)
         for p in points or []:
             d[p] = []
         return d
 
-    def __init__(self, *a, **kw):
+    def __init__(self, points=None, concurrent=False):
         """Init
         """
-        pass
+        self.concurrent = concurrent
 
     def attach(self, point, callback, failsafe=None, priority=None, **kwargs):
         """Append a new Hook made from the supplied arguments."""
@@ -97,17 +138,113 @@ class HookMap(dict):
             self[point] = []
         self[point].append(Hook(callback, failsafe, priority, **kwargs))
         self[point].sort()
+        if self._plans is not None:
+            self._plans[point] = self._compile(self[point])
+
+    @property
+    def frozen(self):
+        """Checks the hook map is frozen"""
+        return self._plans is not None
+
+    def freeze(self):
+        """Compiles the execution plans of all hook points
+
+        The hooks attached after freezing are compiled in the plan at once.
+        """
+        self._plans = {}
+        for point, hooks in self.items():
+            if hooks:
+                self._plans[point] = self._compile(hooks)
+
+    def thaw(self):
+        """Drops the execution plans, runs the Hook objects directly"""
+        self._plans = None
+
+    def _compile(self, hooks):
+        """Compiles the hooks to an execution plan
+
+        Returns ``(SIMPLE, callbacks)`` if none of the hooks is failsafe or coroutine,
+        ``(FAILSAFE, (callback, failsafe) pairs)`` if none of the hooks is coroutine,
+        else ``(COROUTINE, hooks)``.
+        """
+        if any(hook.coroutine for hook in hooks):
+            return self.COROUTINE, tuple(hooks)
+        if any(hook.failsafe for hook in hooks):
+            return self.FAILSAFE, tuple((hook.callback, hook.failsafe) for hook in hooks)
+        return self.SIMPLE, tuple(hook.callback for hook in hooks)
 
     def run(self, point, *args, **kw):
-        """Execute all registered Hooks (callbacks) for the given point."""
+        """Execute all registered Hooks (callbacks) for the given point.
+
+        Returns a Future if the point has coroutine hooks, else ``None``.
+        """
+        if self._plans is None:
+            hooks = self.get(point, [])
+            if any(hook.coroutine for hook in hooks):
+                return self._run_coroutine(hooks, args, kw)
+            callbacks = ((hook.callback, hook.failsafe) for hook in hooks)
+        else:
+            plan = self._plans.get(point)
+            if plan is None:
+                return
+            kind, callbacks = plan
+            if kind == self.COROUTINE:
+                return self._run_coroutine(callbacks, args, kw)
+            if kind == self.SIMPLE:
+                try:
+                    for callback in callbacks:
+                        callback(*args, **kw)
+                except (KeyboardInterrupt, SystemExit):
+                    raise
+                except Exception:
+                    LOGGER.exception("Hook Error: %s", exc_info()[1])
+                    raise
+                return
+
         exc = None
-        hooks = self.get(point, [])
-        for hook in hooks:
+        for callback, failsafe in callbacks:
             # Running the hook pointer, if fails, keep the exception info in exc,
             # then raises it, when all hook pointer finished.
-            if exc is None or hook.failsafe:
+            if exc is None or failsafe:
+                try:
+                    callback(*args, **kw)
+                except (KeyboardInterrupt, SystemExit):
+                    raise
+                except Exception:
+                    exc = exc_info()[1]
+                    LOGGER.exception("Hook Error: %s", exc)
+        if exc:
+            raise exc
+
+    @gen.coroutine
+    def _run_coroutine(self, hooks, args, kw):
+        """Runs and awaits the hooks, the hooks at the same priority are a batch in concurrent mode"""
+        exc = None
+        i, count = 0, len(hooks)
+        while i < count:
+            batch = [hooks[i]]
+            i += 1
+            if self.concurrent:
+                while i < count and hooks[i].priority == batch[0].priority:
+                    batch.append(hooks[i])
+                    i += 1
+
+            futures = []
+            for hook in batch:
+                if exc is None or hook.failsafe:
+                    try:
+                        result = hook.callback(*args, **kw)
+                        if hook.coroutine or is_future(result):
+                            futures.append(gen.convert_yielded(result))
+                    except (KeyboardInterrupt, SystemExit):
+                        raise
+                    except Exception:
+                        exc = exc_info()[1]
+                        LOGGER.exception("Hook Error: %s", exc)
+
+            for future in futures:
                 try:
-                    hook(*args, **kw)
+                    yield future
                 except (KeyboardInterrupt, SystemExit):
                     raise
                 except Exception:
@@ -117,7 +254,7 @@ class HookMap(dict):
             raise exc
 
     def __copy__(self):
-        newmap = self.__class__()
+        newmap = self.__class__(concurrent=self.concurrent)
         # We can't just use 'update' because we want copies of the
         # mutable values (each is a list) as well.
         for k, v in self.items():
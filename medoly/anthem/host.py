@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""Application host
+------------------------------------------------
+
+The ``Host`` serves the applications in one process on a single IOLoop. The applications listening on the same
+port are dispatched by the request host, the application added without the host pattern handles the other hosts.
+
+Examples:
+
+.. code-block:: python
+
+        host = Host()
+        host.add(api_app, 8888)
+        host.add(admin_app, 8888, host="admin\\.example\\.com")
+        host.add(metrics_app, 9100, address="127.0.0.1")
+        host.listen()
+        IOLoop.current().start()
+
+"""
+
+from collections import OrderedDict
+
+from tornado.httpserver import HTTPServer
+from tornado.routing import AnyMatches, HostMatches, Rule, RuleRouter
+
+
+class Host(object):
+    """Multiple applications host"""
+
+    def __init__(self):
+        #: the applications of the listening addresses, the ``(port, address)`` to the host pattern to application
+        self.applications = OrderedDict()
+        #: the started http servers
+        self.servers = []
+
+    def add(self, app, port, host=None, address=""):
+        """Adds the application
+
+        :param app: the application
+        :param int port: the listening port
+        :param host: the host regex pattern, defaults to None, handles the hosts not matched by the others
+        :param address: the listening address, defaults to all the addresses
+        :raises: ValueError if the host of the port is added
+        """
+        apps = self.applications.setdefault((port, address), OrderedDict())
+        if host in apps:
+            raise ValueError("The host ``%s`` on port %d exists" % (host or "*", port))
+        apps[host] = app
+
+    def router(self, port, address=""):
+        """Returns the connection delegate of the listening address, dispatches the requests by the host
+
+        :param int port: the listening port
+        :param address: the listening address, defaults to all the addresses
+        """
+        apps = self.applications[(port, address)]
+        if len(apps) == 1 and None in apps:
+            return apps[None]
+        rules = [Rule(HostMatches(host), app) for host, app in apps.iteritems() if host is not None]
+        if None in apps:
+            rules.append(Rule(AnyMatches(), apps[None]))
+        return RuleRouter(rules)
+
+    def listen(self, **kwargs):
+        """Starts the http servers on the current IOLoop
+
+        :param kwargs: the ``HTTPServer`` arguments
+        :returns: the started http servers
+        """
+        for port, address in self.applications:
+            server = HTTPServer(self.router(port, address), **kwargs)
+            server.listen(port, address)
+            self.servers.append(server)
+        return self.servers
+
+    def stop(self):
+        """Stops the http servers"""
+        for server in self.servers:
+            server.stop()
+        self.servers = []
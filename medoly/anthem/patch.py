@@ -19,65 +19,185 @@ The tornado methods or functions patch  module
 """
 
 import traceback
-import datetime
-import decimal
+import functools
+from collections import Iterator
 
-try:
-    import simplejson as json  # try external module
-except ImportError:
-    import json
+from tornado import gen, web
+from tornado.ioloop import IOLoop
+from tornado.log import app_log, gen_log
+from tornado.util import basestring_type
 
-__all__ = ('patch_tornado', 'as_json', 'hooks', 'json_encode', 'write_error')
+from . import serializer
+from .serializer import json
+
+__all__ = ('patch_tornado', 'as_json', 'hooks', 'json_encode', 'json_iterencode', 'write_error', 'send_error')
 
 
 def as_json(obj):
     """Returns the json serialize content
 
     When the ``obj`` is a class object instance and has ``__json__`` method, then it will call the method,
-    and dumps the return content. Also it can handle the datetime.date and decimal dumps
+    and dumps the return content. Also it can handle the datetime.date, decimal, uuid, set and iterator(generator) dumps.
+    The more types can be registered by ``medoly.anthem.serializer.register``.
     """
-    if hasattr(obj, '__json__') and callable(obj.__json__):
-        return obj.__json__()
-    if isinstance(obj, (datetime.date,
-                        datetime.datetime,
-                        datetime.time)):
-        return obj.isoformat()[:19].replace('T', ' ')
-    elif isinstance(obj, (int, long)):
-        return int(obj)
-    elif isinstance(obj, decimal.Decimal):
-        return str(obj)
-    else:
-        raise TypeError(repr(obj) + " is not JSON serializable")
+    return serializer.default(obj)
+
+
+def json_encode(value, ensure_ascii=True, default=None):
+    """Returns the json serialize stream
+
+    Defaults using the serializer type adapters to convert the object json can't encode.
+    """
+    return serializer.dumps(value, ensure_ascii, default)
+
+
+def json_iterencode(value, ensure_ascii=True, default=None):
+    """Encodes the value incrementally, yields the json string pieces
 
+    The dicts, lists and iterators (like generators) are encoded item by item at any depth, the ``__json__``
+    results are streamed too, the other values are encoded at once, so the memory is bounded by the size of
+    a scalar value.
 
-def json_encode(value, ensure_ascii=True, default=as_json):
-    """Returns the json serialize stream"""
-    return json.dumps(value, default=default, ensure_ascii=ensure_ascii)
+    :raises: ValueError when the containers are circular
+    """
+    encoder = json.JSONEncoder(default=default or serializer.default, ensure_ascii=ensure_ascii)
+    return _iterencode(value, encoder, set())
+
+
+def _iterencode(value, encoder, markers):
+    """Yields the json pieces of the streamed containers"""
+    if hasattr(value, '__json__') and callable(value.__json__):
+        value = value.__json__()
+    if isinstance(value, (dict, list, tuple, Iterator)):
+        marker = id(value)
+        if marker in markers:
+            raise ValueError("Circular reference detected")
+        markers.add(marker)
+        if isinstance(value, dict):
+            yield '{'
+            first = True
+            for key, item in value.items():
+                if first:
+                    first = False
+                else:
+                    yield ','
+                if not isinstance(key, basestring_type):
+                    key = encoder.encode(key)
+                yield encoder.encode(key)
+                yield ':'
+                for chunk in _iterencode(item, encoder, markers):
+                    yield chunk
+            yield '}'
+        else:
+            yield '['
+            first = True
+            for item in value:
+                if first:
+                    first = False
+                else:
+                    yield ','
+                for chunk in _iterencode(item, encoder, markers):
+                    yield chunk
+            yield ']'
+        markers.remove(marker)
+    else:
+        yield encoder.encode(value)
 
 
 def write_error(self, status_code, **kwargs):
-    """Handle the last unanticipated exception. (Core)"""
+    """Handle the last unanticipated exception. (Core)
+
+    Returns a Future when the error response hooks are coroutines.
+    """
+    future = None
     try:
-        self.hooks.run("before_error_response",
-                       self, status_code, **kwargs)
-        handler = self.application.error_pages.get(str(status_code), None)
-        if handler:
-            handler(self, status_code, **kwargs)
+        future = self.hooks.run("before_error_response",
+                                self, status_code, **kwargs)
+        if future is None:
+            _write_error_page(self, status_code, **kwargs)
+    finally:
+        if future is None:
+            future = self.hooks.run("after_error_response", self, status_code, **kwargs)
         else:
-            if self.settings.get("serve_traceback") and "exc_info" in kwargs:
-                # in debug mode, try to send a traceback
-                self.set_header('Content-Type', 'text/plain')
-                for line in traceback.format_exception(*kwargs["exc_info"]):
-                    self.write(line)
-                self.finish()
-            else:
-                self.finish("<html><title>%(code)d: %(message)s</title>"
-                            "<body>%(code)d: %(message)s</body></html>" % {
-                                "code": status_code,
-                                "message": self._reason,
-                            })
+            future = _write_error_async(self, future, status_code, kwargs)
+    return future
+
+
+@gen.coroutine
+def _write_error_async(self, future, status_code, kwargs):
+    """Awaits the ``before_error_response`` hooks, then writes the error page"""
+    try:
+        yield future
+        _write_error_page(self, status_code, **kwargs)
     finally:
-        self.hooks.run("after_error_response", self, status_code, **kwargs)
+        future = self.hooks.run("after_error_response", self, status_code, **kwargs)
+        if future is not None:
+            yield future
+
+
+def _write_error_page(self, status_code, **kwargs):
+    """Writes the error page by the application error page handler or the default page"""
+    handler = self.application.error_pages.get(str(status_code), None)
+    if handler:
+        handler(self, status_code, **kwargs)
+    else:
+        if self.settings.get("serve_traceback") and "exc_info" in kwargs:
+            # in debug mode, try to send a traceback
+            self.set_header('Content-Type', 'text/plain')
+            for line in traceback.format_exception(*kwargs["exc_info"]):
+                self.write(line)
+            self.finish()
+        else:
+            self.finish("<html><title>%(code)d: %(message)s</title>"
+                        "<body>%(code)d: %(message)s</body></html>" % {
+                            "code": status_code,
+                            "message": self._reason,
+                        })
+
+
+def send_error(self, status_code=500, **kwargs):
+    """Sends the given HTTP error code to the browser. (Core)
+
+    Same as the tornado ``send_error``, but when ``write_error`` returns a Future,
+    finishes the response after the Future is done.
+    """
+    if self._headers_written:
+        gen_log.error("Cannot send error response after headers written")
+        if not self._finished:
+            try:
+                self.finish()
+            except Exception:
+                gen_log.error("Failed to flush partial response",
+                              exc_info=True)
+        return
+    self.clear()
+
+    reason = kwargs.get('reason')
+    if 'exc_info' in kwargs:
+        exception = kwargs['exc_info'][1]
+        if isinstance(exception, web.HTTPError) and exception.reason:
+            reason = exception.reason
+    self.set_status(status_code, reason=reason)
+    try:
+        future = self.write_error(status_code, **kwargs)
+    except Exception:
+        app_log.error("Uncaught exception in write_error", exc_info=True)
+    else:
+        if future is not None:
+            IOLoop.current().add_future(future, functools.partial(_finish_error, self))
+            return
+    if not self._finished:
+        self.finish()
+
+
+def _finish_error(self, future):
+    """Finishes the error response after the asynchronous ``write_error``"""
+    try:
+        future.result()
+    except Exception:
+        app_log.error("Uncaught exception in write_error", exc_info=True)
+    if not self._finished:
+        self.finish()
 
 
 @property
@@ -92,13 +212,14 @@ def patch_tornado():
     Here are the methods or fucntions are patched :
 
      :web.RequestHandler.write_error: ``medoly.anthem.pathc.write_error``
+     :web.RequestHandler.send_error: ``medoly.anthem.pathc.send_error``
      :web.RequestHandler.hooks: ``medoly.anthem.pathc.hooks``
      :escape.json_encode:  ``medoly.anthem.pathc.json_encode``
 
     """
 
     from tornado import escape
-    from tornado import web
     web.RequestHandler.write_error = write_error
+    web.RequestHandler.send_error = send_error
     web.RequestHandler.hooks = hooks
     escape.json_encode = json_encode
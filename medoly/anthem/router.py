@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Segment trie route dispatcher
+-------------------------------------------------
+
+The tornado default router tests the url regexes one after another. The ``TrieRouter``
+compiles the routes having path ``segments`` (see ``URLPatternManager.segments``) into a segment trie,
+the lookup cost is related to the path depth, not the number of routes.
+
+In a trie node, the static segments are tested firstly, then the typed captures by the
+registration order. The routes without segments (custom ``(...)`` patterns, the raw regex routes, the static file
+routes) fall back to the regex matching, and keep the registration order priority with the trie routes.
+
+Enables it by the application setting ``route_engine``:
+
+.. code-block:: python
+
+    app = Application(handlers, initialize, route_engine="trie")
+
+The typed path arguments are matched and converted by the ``Converter`` in one step,
+the handler gets the native value, like ``int``, ``float``, ``uuid.UUID`` and ``datetime.date``.
+The handler must extend the ``TypedArgumentsMixin`` to keep the converted values, the ``anthem.Handler`` does.
+"""
+
+import re
+
+from tornado.routing import ReversibleRuleRouter, PathMatches
+from tornado.web import RequestHandler
+from tornado.escape import url_unescape
+
+
+class Converter(object):
+    """Path argument converter
+
+    Matches a path segment by the regex, and converts the  matched text to python value.
+
+    :param regex: the regex expression matches in a path segment
+    :type regex: string
+    :param to_python: the callable converts the unescaped text to python value,
+        raises ``ValueError`` when the value is invalid. Defaults to None, keeps the text.
+    """
+
+    __slots__ = ('regex', 'to_python', 'segment_regex')
+
+    def __init__(self, regex, to_python=None):
+        self.regex = regex
+        self.to_python = to_python
+        # the capture must stop at the segment boundary
+        self.segment_regex = re.compile(r'(?:%s)(?=/|\Z)' % regex)
+
+    def __call__(self, value):
+        """Unescapes and converts the raw path text"""
+        value = url_unescape(value, encoding=None, plus=False)
+        if self.to_python is None:
+            return value
+        return self.to_python(value)
+
+    def __repr__(self):
+        return "%s(%r, %r)" % (self.__class__.__name__, self.regex, self.to_python)
+
+
+class TypedArgumentsMixin(object):
+    """Passes the typed path arguments converted by the router through the ``decode_argument``
+
+    The tornado request handler decodes every path argument as a string, the converted values like ``int`` and
+    ``datetime.date`` are kept as they are.
+    """
+
+    def decode_argument(self, value, name=None):
+        if value is None or isinstance(value, basestring):
+            return super(TypedArgumentsMixin, self).decode_argument(value, name)
+        return value
+
+
+class TypedPathMatches(PathMatches):
+    """Matches requests with paths by the regex, then converts the path arguments
+
+    :param path_pattern: the path regex
+    :param converters: the tuple of the ``(name, to_python)`` for the named groups
+    """
+
+    def __init__(self, path_pattern, converters):
+        super(TypedPathMatches, self).__init__(path_pattern)
+        self.converters = converters
+
+    def match(self, request):
+        params = super(TypedPathMatches, self).match(request)
+        if params:
+            kwargs = params['path_kwargs']
+            try:
+                for name, to_python in self.converters:
+                    kwargs[name] = to_python(kwargs[name])
+            except ValueError:
+                return None
+        return params
+
+
+class SegmentTrie(object):
+    """The url segment trie"""
+
+    def __init__(self):
+        self.root = _Node()
+
+    def add(self, segments, route):
+        """Adds a route with the path segments
+
+        :param segments: the path segments, a static segment is a string,
+            a capture segment is a ``(name, converter)`` tuple.
+        :param route: the route target
+        """
+        node = self.root
+        names = []
+        for segment in segments:
+            if isinstance(segment, tuple):
+                name, converter = segment
+                names.append(name)
+                node = node.capture_child(converter)
+            else:
+                node = node.static_child(segment)
+
+        # the first registered route wins
+        if node.route is None:
+            node.route = (route, tuple(names))
+
+    def match(self, path):
+        """Matches the path, returns the ``(route, {name: value})`` or ``None`` if not found"""
+        values = []
+        found = self.root.walk(path, 0, len(path), values)
+        if found is None:
+            return None
+        route, names = found
+        return route, dict(zip(names, values))
+
+
+class _Node(object):
+    """Segment trie node"""
+
+    __slots__ = ('statics', 'captures', 'route')
+
+    def __init__(self):
+        #: the static segment children
+        self.statics = {}
+        #: the capture children, the list of ``(converter, node)``
+        self.captures = []
+        #: the route ends at the node
+        self.route = None
+
+    def static_child(self, segment):
+        node = self.statics.get(segment)
+        if node is None:
+            node = self.statics[segment] = _Node()
+        return node
+
+    def capture_child(self, converter):
+        for c, node in self.captures:
+            if c is converter:
+                return node
+        node = _Node()
+        self.captures.append((converter, node))
+        return node
+
+    def walk(self, path, pos, length, values):
+        if pos > length:
+            return self.route
+
+        end = path.find('/', pos)
+        if end == -1:
+            end = length
+
+        node = self.statics.get(path[pos:end])
+        if node is not None:
+            found = node.walk(path, end + 1, length, values)
+            if found is not None:
+                return found
+
+        for converter, node in self.captures:
+            m = converter.segment_regex.match(path, pos)
+            if m is None:
+                continue
+            end = m.end()
+            try:
+                values.append(converter(path[pos:end]))
+            except ValueError:
+                continue
+            found = node.walk(path, end + 1, length, values)
+            if found is not None:
+                return found
+            values.pop()
+
+        return None
+
+
+class TrieRouter(ReversibleRuleRouter):
+    """Segment trie router for anthem application
+
+    The rule having the ``segments`` attribute is added in the segment trie, otherwise it is matched
+    by its matcher as the tornado default router.
+
+    :param application: the anthem application
+    :param rules: the rule list
+    """
+
+    def __init__(self, application, rules=None):
+        self.application = application
+        self.trie = SegmentTrie()
+        #: the regex rules, the list of ``(index, rule)``
+        self.fallbacks = []
+        super(TrieRouter, self).__init__(rules)
+
+    def process_rule(self, rule):
+        rule = super(TrieRouter, self).process_rule(rule)
+        if isinstance(rule.target, (list, tuple)):
+            rule.target = TrieRouter(self.application, rule.target)
+
+        index = len(self.rules)
+        segments = getattr(rule, "segments", None)
+        if segments is None:
+            self.fallbacks.append((index, rule))
+        else:
+            self.trie.add(segments, (index, rule))
+        return rule
+
+    def find_handler(self, request, **kwargs):
+        found = self.trie.match(request.path)
+        limit = found[0][0] if found else len(self.rules)
+
+        # the regex rules registered before the trie route has the priority
+        for index, rule in self.fallbacks:
+            if index >= limit:
+                break
+            target_params = rule.matcher.match(request)
+            if target_params is not None:
+                delegate = self._delegate(rule, request, target_params)
+                if delegate is not None:
+                    return delegate
+
+        if found:
+            (_, rule), path_kwargs = found
+            return self._delegate(rule, request, dict(path_args=[], path_kwargs=path_kwargs))
+
+        return None
+
+    def _delegate(self, rule, request, target_params):
+        if rule.target_kwargs:
+            target_params['target_kwargs'] = rule.target_kwargs
+        return self.get_target_delegate(rule.target, request, **target_params)
+
+    def get_target_delegate(self, target, request, **target_params):
+        if isinstance(target, type) and issubclass(target, RequestHandler):
+            return self.application.get_handler_delegate(request, target, **target_params)
+
+        return super(TrieRouter, self).get_target_delegate(target, request, **target_params)
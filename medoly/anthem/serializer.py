@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Json serializer
+-------------------------------------------------
+
+The ``JsonSerializer`` converts the objects which json can't encode by the type adapters,
+the adapter is resolved by the object type once, then cached.
+
+Examples:
+
+.. code-block:: python
+
+    from medoly.anthem import serializer
+
+    # custom type adapter
+    serializer.register(sqlalchemy.engine.RowProxy, dict)
+
+The json is encoded by the ``simplejson`` module if it's installed, its C speedups are faster than the ``json`` module,
+otherwise by the ``json`` module.
+"""
+
+import datetime
+import decimal
+import inspect
+import uuid
+from collections import Iterator
+
+try:
+    import simplejson as json  # try external module
+except ImportError:
+    import json
+
+
+def _json_dumps(value, default, ensure_ascii):
+    return json.dumps(value, default=default, ensure_ascii=ensure_ascii)
+
+
+def _isoformat(obj):
+    return obj.isoformat()[:19].replace('T', ' ')
+
+
+def _call_json(obj):
+    return obj.__json__()
+
+
+_empty = {}
+
+
+def _not_serializable(obj):
+    raise TypeError(repr(obj) + " is not JSON serializable")
+
+
+class JsonSerializer(object):
+    """Json serializer with the type adapter registry
+
+    The adapter for a type is resolved by: the ``__json__`` method, then the registered
+    adapters in the type mro order, then the iterator adapter. The ``__json__`` method set on the instance
+    is used before the adapter.
+    """
+
+    def __init__(self):
+        #: the type adapters
+        self.adapters = {
+            datetime.date: _isoformat,
+            datetime.datetime: _isoformat,
+            datetime.time: _isoformat,
+            int: int,
+            long: int,
+            decimal.Decimal: str,
+            uuid.UUID: str,
+            set: list,
+            frozenset: list,
+        }
+        #: the resolved adapters cache by type
+        self._cache = {}
+
+    def register(self, kind, adapter):
+        """Registers a type adapter
+
+        :param kind: the type
+        :param adapter: the callable converts the object to the json serializable data
+        """
+        self.adapters[kind] = adapter
+        self._cache.clear()
+
+    def default(self, obj):
+        """Converts the object json can't encode, uses as the json encoder ``default`` function"""
+        kind = obj.__class__
+        try:
+            adapter = self._cache[kind]
+        except KeyError:
+            adapter = self._cache[kind] = self._resolve(kind)
+        if adapter is not _call_json:
+            json_method = getattr(obj, "__dict__", _empty).get("__json__")
+            if json_method is not None:
+                return json_method()
+        return adapter(obj)
+
+    def _resolve(self, kind):
+        """Resolves the adapter for the type"""
+        if callable(getattr(kind, '__json__', None)):
+            return _call_json
+        for base in inspect.getmro(kind):
+            adapter = self.adapters.get(base)
+            if adapter is not None:
+                return adapter
+        if issubclass(kind, Iterator):
+            return list
+        return _not_serializable
+
+    def dumps(self, value, ensure_ascii=True, default=None):
+        """Returns the json string"""
+        return _json_dumps(value, default or self.default, ensure_ascii)
+
+
+#: the default serializer
+_serializer = JsonSerializer()
+
+default = _serializer.default
+register = _serializer.register
+dumps = _serializer.dumps
+
+
+def get_serializer():
+    """Gets the default serializer"""
+    return _serializer
@@ -17,11 +17,17 @@
 
 """Console option  parser
 """
+import argparse
 import os
 import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from timeit import default_timer
 
 from medoly import options
 from medoly.config import SelectConfig, ConfigFactory
+from medoly.config.cache import ConfigCache
+from medoly.config.hocon import FileIncluder
 
 import logging
 
@@ -41,33 +47,78 @@ class Cmd(object):
     """Termial options parse and config util tool
     """
 
-    def __init__(self, config_path, opt=None):
+    def __init__(self, config_path, opt=None, env_prefix=None):
         """Init
 
         :param string config_path: hocon config file path
         :param Options opt: the default option config class instance
                 (default: {None}, use the global default options instance)
+        :param string env_prefix: the environment variable prefix of the env config layer, like ``MEDOLY_``
+                (default: {None}, disables the env config layer)
         """
         self.options = opt or options
         self.confing_path = config_path
+        self.env_prefix = env_prefix
+        #: the loaded config file path
+        self.config_file = None
+        #: the included file paths of the loaded config file
+        self.config_includes = ()
+        #: the seconds of the bootstrap phases, the phase name to seconds
+        self.timings = OrderedDict()
 
-    def get_file_opt(self):
+    @contextmanager
+    def phase(self, name):
+        """Records the seconds of the bootstrap phase in ``timings``"""
+        start = default_timer()
+        try:
+            yield
+        finally:
+            self.timings[name] = default_timer() - start
+
+    def get_file_opt(self, given=None):
         """Loading the hocon config for the file path
 
+        :param dict given: the given command options, defaults to None, parses the config options in sys.argv
+
         Returns:
             SelectDict -- the option select dict config
         """
         # parse terminal option get file path, then load the hocon from file path
-        opt = options.Options(None)
-        opt.define('-c', '--config', default=self.confing_path,
-                   help="config path (default %(default)r)", metavar="FILE")
-        o = opt.parse_args(sys.argv)
-        return config_from_file(o.config)
+        if given is None:
+            opt = options.Options(None)
+            self.define_config_options(opt)
+            given = opt.given_args(sys.argv)
+        self.config_file = given.get("config") or self.confing_path
+        cache_dir = given.get("config_cache")
+        config, self.config_includes = load_config_file(self.config_file, bool(cache_dir), cache_dir)
+        return config
+
+    def define_config_options(self, opt):
+        """Defines the config file options, skips the defined options
+
+        :param opt: the options instance or module
+        :returns: the destinations of the defined options
+        """
+        defined = set(s for action in opt.actions() for s in action.option_strings)
+        dests = []
+        flags = [s for s in ('-c', '--config') if s not in defined]
+        if '--config' in flags:
+            opt.define(*flags, dest='config', default=self.confing_path,
+                       help="config path (default %(default)r)", metavar="FILE")
+            dests.append('config')
+        if '--config-cache' not in defined:
+            opt.define('--config-cache', default=None,
+                       help="the parsed config cache directory, disables the cache if empty (default %(default)r)",
+                       metavar="DIR")
+            dests.append('config_cache')
+        return dests
 
     def parse_cmd(self, help_doc, boots):
         """Parse config and setting config for the terminal options
 
-        Try load config from configuration file path, then override the file config by the command options .
+        Try load config from configuration file path, then override the file config by the environment variables
+        and the command options. The boot options are defined once, the command line is parsed once,
+        the seconds of each phase are recorded in ``timings``.
 
         :param string help_doc: The OptionPaser help doc
         :param boots:  the boot  instances options
@@ -75,14 +126,38 @@ class Cmd(object):
         Returns:
             SelectConfig --  the dict like config
         """
-        self.options.setup_options(help_doc)
-        self.boot_options(self.options, boots)
-        file_config = self.get_file_opt()
-        self._set_defaults(file_config, boots)
-        opt = self.options.parse_args()
-        config = SelectConfig()
-        config.update(file_config)
-        config.update(vars(opt))
+        with self.phase("options"):
+            self.options.setup_options(help_doc)
+            self.boot_options(self.options, boots)
+            config_dests = self.define_config_options(self.options)
+        with self.phase("file"):
+            given = self.options.given_args()
+            file_config = self.get_file_opt(given)
+            #: the config loaded from the config file
+            self.file_config = file_config
+        with self.phase("env"):
+            env_config = SelectConfig()
+            if self.env_prefix:
+                env_config = EnvConfig(self.env_prefix, self.options.actions()).load(file_config)
+            #: the config loaded from the environment variables
+            self.env_config = env_config
+        with self.phase("parse"):
+            self._set_defaults(file_config, env_config)
+            opt = vars(self.options.namespace(given))
+            for dest in config_dests:
+                opt.pop(dest, None)
+                given.pop(dest, None)
+            cli_config = SelectConfig()
+            cli_config.update(given)
+            #: the config given in the command line, without the option defaults
+            self.cli_config = cli_config
+        with self.phase("merge"):
+            config = SelectConfig()
+            config.update(file_config)
+            config.update(env_config)
+            config.update(opt)
+        LOG.debug("Bootstrap phases: %s", ", ".join(
+            "%s %.2fms" % (name, cost * 1000) for name, cost in self.timings.iteritems()))
         return config
 
     def boot_options(self, opt, boots):
@@ -92,43 +167,164 @@ class Cmd(object):
             if hasattr(boot, 'config'):
                 boot.config(opt)
 
-    def _set_defaults(self, file_config, boots):
-        """Setting the default option config
+    def _set_defaults(self, *configs):
+        """Setting the default option config by the file and env configs, the later config wins
         """
-
-        opt = options.Options(None)
-        self.boot_options(opt, boots)
-
-        opt = opt.parse_args()
         d = {}
-        config = vars(opt)
-        for k in config:
-            v = file_config.get(k, _Null)
-            if v != _Null:
-                d[k] = v
+        for k in self.options.dests():
+            for config in configs:
+                v = config.get(k, _Null)
+                if v is not _Null:
+                    d[k] = v
         self.options.set_defaults(**d)
 
 
-def config_from_file(path):
+class EnvConfig(object):
+    """Environment variable config layer
+
+    Maps the ``PREFIX_SECTION__KEY`` variables to the ``section.key`` dotted keys, the double underscore
+    separates the keys. The values of the defined options are converted by the option ``type``, the bool flags
+    accept ``1/true/on/yes`` and ``0/false/off/no``, the others are converted by the type of the file config value.
+
+    Examples:
+
+    .. code-block:: python
+
+        # MEDOLY_SQLALCHEMY__POOL_SIZE=20
+        env = EnvConfig("MEDOLY_", options.actions())
+        env.load().get("sqlalchemy.pool_size")  # 20 if defined with type=int
+
+    :param prefix: the variable name prefix
+    :param actions: the defined option actions, the mapping table is built once from them
+    """
+
+    def __init__(self, prefix, actions=()):
+        self.prefix = prefix
+        #: the mapping table, the variable name to ``(dotted key, converter)``
+        self.table = {}
+        for action in actions:
+            if action.default == argparse.SUPPRESS:
+                continue
+            self.table[self.env_name(action.dest)] = (action.dest, _action_converter(action))
+
+    def env_name(self, key):
+        """Gets the variable name of the dotted key"""
+        return self.prefix + key.replace(".", "__").replace("-", "_").upper()
+
+    def key(self, name):
+        """Gets the dotted key of the variable name"""
+        return name[len(self.prefix):].lower().replace("__", ".")
+
+    def load(self, file_config=None, environ=None):
+        """Loads the config from the environment variables
+
+        :param file_config: the file config for converting the values of undefined options, defaults to None
+        :param environ: the environment variables, defaults to ``os.environ``
+        :returns: the env config
+        :rtype: SelectConfig
+        :raises: ValueError when the variable value is invalid for its option type
+        """
+        environ = os.environ if environ is None else environ
+        config = SelectConfig()
+        for name, value in environ.iteritems():
+            if not name.startswith(self.prefix):
+                continue
+            key, converter = self.table.get(name, (None, None))
+            if key is None:
+                key = self.key(name)
+                if file_config is not None:
+                    converter = _value_converter(file_config.get(key))
+            try:
+                config.set(key, converter(value) if converter else value)
+            except (TypeError, ValueError, argparse.ArgumentTypeError):
+                raise ValueError("Invalid value of the environment variable %s: %r" % (name, value))
+        return config
+
+
+def _to_bool(value):
+    """Converts the flag string to bool"""
+    v = value.strip().lower()
+    if v in ("1", "true", "on", "yes"):
+        return True
+    if v in ("", "0", "false", "off", "no"):
+        return False
+    raise ValueError("Unknown boolean format: " + value)
+
+
+def _action_converter(action):
+    """Gets the value converter of the option action"""
+    if action.type is None and isinstance(action.const, bool):
+        return _to_bool
+    converter = action.type
+    if action.nargs in ("*", "+") or isinstance(action.nargs, int):
+        return lambda v: [converter(e) if converter else e for e in v.split(",")]
+    return converter
+
+
+def _value_converter(value):
+    """Gets the converter by the type of the value"""
+    if isinstance(value, bool):
+        return _to_bool
+    if isinstance(value, (int, long, float)):
+        return type(value)
+    return None
+
+
+def config_from_file(path, cache=False, cache_dir=None):
+    """Load config form file, see ``load_config_file``"""
+    return load_config_file(path, cache, cache_dir)[0]
+
+
+def load_config_file(path, cache=False, cache_dir=None):
     """Load config form file
 
     If config path exist  try to load and parse the config the file, else returns a empty config.
     If the config path extension is ``yaml`` , will load the config by yaml parse module requires
     the yaml module, otherwise load hocon config
+
+    :param cache: If ``True`` loads the parsed config from the cache, it's stale when the config file or its
+        included files are changed, defaults to False
+    :param cache_dir: the cache directory, defaults to None, stores the cache file next to the config file
+    :returns: the config and the included file paths
     """
     if os.path.exists(path):
-        # try load yaml config
-        if path.endswith(".yaml"):
-            yaml_config = _get_yaml_config(path)
-            config = SelectConfig()
-            config.update(yaml_config)
-            return config
+        is_yaml = path.endswith(".yaml")
+        if cache:
+            config_cache = ConfigCache(cache_dir)
+            kind = "yaml" if is_yaml else "pyhocon.dict"
+            signature, data = config_cache.load_entry(path, kind)
+            if data is None:
+                signature = config_cache.signature([path])
+                data, included = _load_config_data(path, is_yaml)
+                signature += included
+                config_cache.store(path, kind, data, signature)
+            includes = tuple(p for p, _, _ in signature[1:])
         else:
-            config = ConfigFactory.parse_file(path, pystyle=True)
-            return config.to_select_config()
+            data, included = _load_config_data(path, is_yaml)
+            includes = tuple(p for p, _, _ in included)
+
+        if is_yaml:
+            config = SelectConfig()
+            config.update(data)
+            return config, includes
+        return SelectConfig(data), includes
 
     # Returns default empty config
-    return SelectConfig()
+    return SelectConfig(), ()
+
+
+def _load_config_data(path, is_yaml):
+    """Loads the config dict from the yaml or hocon file
+
+    :returns: the config dict and the ``ConfigCache.signature`` of the included files
+    """
+    # try load yaml config
+    if is_yaml:
+        return _get_yaml_config(path), ()
+    includer = FileIncluder(path, True)
+    with open(path) as f:
+        config = ConfigFactory.parse(f.read(), includer, pystyle=True)
+    return config.to_dict(), includer.signature
 
 
 def _get_yaml_config(path):
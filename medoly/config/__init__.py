@@ -18,7 +18,7 @@
 """Config  Utils"""
 
 from .hocon import ConfigFactory
-from .select_config import SelectConfig
+from .select_config import SelectConfig, ConfigSnapshot
 
 
-__all__ = ('ConfigFactory', 'SelectConfig')
+__all__ = ('ConfigFactory', 'SelectConfig', 'ConfigSnapshot')
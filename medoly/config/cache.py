@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Parsed config cache
+
+Stores the parsed config tree in a pickle file, keyed on the path, mtime and size of the config file
+and its included files. The pre-fork workers starting together parse the config file once, the others
+load the cached tree.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ConfigCache(object):
+    """Parsed config cache
+
+    :param cache_dir: the cache directory, defaults to None, stores the cache file next to the config file
+    """
+
+    #: the cache format version, changes it when the cached tree classes are changed
+    VERSION = 2
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+
+    def cache_path(self, path, kind):
+        """Gets the cache file path of the config file
+
+        :param path: the config file path
+        :param kind: the parsed tree kind, like ``hocon`` or ``yaml``
+        """
+        path = os.path.abspath(path)
+        if self.cache_dir is None:
+            dirname, basename = os.path.split(path)
+            return os.path.join(dirname, ".%s.%s.cache" % (basename, kind))
+        name = hashlib.sha1("%s:%s" % (path, kind)).hexdigest()
+        return os.path.join(self.cache_dir, name + ".cache")
+
+    @staticmethod
+    def signature(paths):
+        """Gets the ``(path, mtime, size)`` tuple of the files"""
+        stats = []
+        for path in paths:
+            st = os.stat(path)
+            stats.append((os.path.abspath(path), st.st_mtime, st.st_size))
+        return tuple(stats)
+
+    def load(self, path, kind):
+        """Loads the cached tree, returns ``None`` if not cached or stale"""
+        return self.load_entry(path, kind)[1]
+
+    def load_entry(self, path, kind):
+        """Loads the cached tree and its signature, returns ``(None, None)`` if not cached or stale"""
+        try:
+            with open(self.cache_path(path, kind), "rb") as f:
+                version, signature = pickle.load(f)
+                if version != self.VERSION:
+                    return None, None
+                if self.signature(p for p, _, _ in signature) != signature:
+                    return None, None
+                return signature, pickle.load(f)
+        except (IOError, OSError):
+            return None, None
+        except Exception:
+            LOG.warning("Can't load the config cache for %s", path, exc_info=True)
+            return None, None
+
+    def store(self, path, kind, tree, signature):
+        """Stores the parsed tree
+
+        :param path: the config file path
+        :param kind: the parsed tree kind
+        :param tree: the parsed tree
+        :param signature: the ``signature`` of the config file and its included files, gets it before parsing
+        """
+        cache_path = self.cache_path(path, kind)
+        try:
+            dirname = os.path.dirname(cache_path)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            fd, tmp = tempfile.mkstemp(dir=dirname)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((self.VERSION, signature), f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(tree, f, pickle.HIGHEST_PROTOCOL)
+            # the workers may store at the same time, the rename is atomic
+            os.rename(tmp, cache_path)
+        except (IOError, OSError):
+            LOG.warning("Can't store the config cache for %s", path, exc_info=True)
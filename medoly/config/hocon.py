@@ -17,8 +17,15 @@
 """Human-Optimized Config Object Notation"""
 
 
+import os.path
 import re
 
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from .cache import ConfigCache
 from .errors import HoconParserException, HoconTokenizerException
 from .select_config import SelectConfig
 
@@ -37,15 +44,23 @@ class BaseConfig(object):
             raise AttributeError(" error")
         self.root = root.value  # HoconValue
         self.substitutions = root.substitutions  # List<HoconSubstitution>
+        #: the found data nodes by path
+        self._nodes = {}
 
     def get_node(self, path):
         """Gets the path data node"""
+        try:
+            return self._nodes[path]
+        except KeyError:
+            pass
         keys = path.split(".")
         current_node = self.root
         if current_node is None:
             raise KeyError("Doesn't exist the key:" % (path))
         for key in keys:
             current_node = current_node.get_child_object(key)
+        if current_node is not None:
+            self._nodes[path] = current_node
         return current_node
 
     def __str__(self):
@@ -58,7 +73,11 @@ class BaseConfig(object):
         return self.root.get()
 
     def to_select_config(self):
-        """Converts to SelectConfig"""
+        """Converts to SelectConfig
+
+        The whole tree is converted at once, the ``SelectConfig`` updates and snapshots the plain dict.
+        Calls ``get`` to convert the accessed path only.
+        """
         return SelectConfig(self.root.get())
 
     def has_path(self, path):
@@ -135,14 +154,30 @@ class Config(BaseConfig):
 
 
 class PyConfig(BaseConfig):
-    """Python style ocnfig"""
+    """Python style ocnfig
+
+    The converted scalar value is memoized by the path, the dict and list value is converted on each call,
+    so the caller owns the returned copy.
+    """
+
+    def __init__(self, root):
+        super(PyConfig, self).__init__(root)
+        #: the converted values by path
+        self._values = {}
 
     def get(self, path, default=None):
         """Get real type value"""
+        try:
+            return self._values[path]
+        except KeyError:
+            pass
         value = self.get_node(path)
         if value is None:
             return default
-        return value.get()
+        value = value.get()
+        if not isinstance(value, (dict, list)):
+            self._values[path] = value
+        return value
 
 
 class ConfigFactory(object):
@@ -161,11 +196,29 @@ class ConfigFactory(object):
         return configCls(res)
 
     @classmethod
-    def parse_file(cls, path, pystyle=False):
-        """Parses and creates a hocon confi from  the file path"""
-        with open(path) as f:
-            content = f.read()
-            return cls.parse(content, pystyle=pystyle)
+    def parse_file(cls, path, pystyle=False, cache=False, cache_dir=None):
+        """Parses and creates a hocon confi from  the file path
+
+        :param cache: If ``True`` loads the parsed tree from the cache, it's stale when the config file is changed,
+            defaults to False
+        :param cache_dir: the cache directory, defaults to None, stores the cache file next to the config file
+        """
+        configCls = PyConfig if pystyle else Config
+        if not cache:
+            with open(path) as f:
+                content = f.read()
+                return cls.parse(content, FileIncluder(path, pystyle), pystyle)
+
+        config_cache = ConfigCache(cache_dir)
+        kind = "pyhocon" if pystyle else "hocon"
+        root = config_cache.load(path, kind)
+        if root is None:
+            signature = config_cache.signature([path])
+            includer = FileIncluder(path, pystyle)
+            with open(path) as f:
+                root = Parser.parse(f.read(), includer, pystyle)
+            config_cache.store(path, kind, root, signature + includer.signature)
+        return configCls(root)
 
     @classmethod
     def from_json(cls, jsonObj, pystyle=False):
@@ -175,9 +228,72 @@ class ConfigFactory(object):
         return cls.parse(text, pystyle)
 
 
+class FileIncluder(object):
+    """Resolves the ``include "file"`` directive
+
+    The included file path is relative to the including file. The parsed include files are cached in the
+    process, the file included by many configs is parsed once, it's stale when the file or its included
+    files are changed. The missing include file is ignored.
+
+    :param path: the including file path, defaults to None, resolves the path relative to the working directory
+    :param pystyle: If ``Ture`` converts the data node to real type data, defaults to False
+    :param stack: the including file paths for the cycle detection
+    :raises: HoconParserException when the files include each other
+    """
+
+    #: the parsed include files, the ``(path, pystyle)`` to ``(signature, pickled HoconRoot)``
+    _cache = {}
+
+    def __init__(self, path=None, pystyle=False, stack=()):
+        self.path = path and os.path.abspath(path)
+        self.pystyle = pystyle
+        self.stack = stack + (self.path,) if self.path else stack
+        #: the ``(path, mtime, size)`` of the included files and their included files
+        self.signature = ()
+
+    @classmethod
+    def clear_cache(cls):
+        """Clears the parsed include files cache"""
+        cls._cache.clear()
+
+    def __call__(self, name):
+        base = os.path.dirname(self.path) if self.path else os.getcwd()
+        path = os.path.normpath(os.path.join(base, name))
+        if not os.path.exists(path):
+            return HoconRoot()
+
+        key = (path, self.pystyle)
+        cached = self._cache.get(key)
+        if cached is not None and ConfigCache.signature(p for p, _, _ in cached[0]) == cached[0]:
+            signature, data = cached
+        else:
+            self.check_cycle(path, [path])
+            signature = ConfigCache.signature([path])
+            includer = FileIncluder(path, self.pystyle, self.stack)
+            with open(path) as f:
+                root = Parser().parse_text(f.read(), includer, self.pystyle, resolve=False)
+            signature += includer.signature
+            data = pickle.dumps(root, pickle.HIGHEST_PROTOCOL)
+            self._cache[key] = (signature, data)
+
+        # the cached file may include the current including files
+        self.check_cycle(path, [p for p, _, _ in signature])
+        self.signature += signature
+        # the including config changes the tree, returns a new copy
+        return pickle.loads(data)
+
+    def check_cycle(self, path, included):
+        for p in included:
+            if p in self.stack:
+                raise HoconParserException(
+                    "Include cycle: %s" % " -> ".join(self.stack + (path,)))
+
+
 class HoconRoot(object):
     """Hocon config object"""
 
+    __slots__ = ("value", "substitutions")
+
     def __init__(self, value=None, substitutions=None):
         self.value = value or HoconValue()
         self.substitutions = substitutions or []
@@ -185,19 +301,61 @@ class HoconRoot(object):
 
 class MightBeAHoconObject(object):
     """Hocon Maybe a hocon object"""
-    pass
+
+    __slots__ = ()
 
 
 class HoconValue(MightBeAHoconObject):
     """Hocon data value node object
 
+    The parser seals the value nodes when the substitutions are resolved, the sealed node caches its kind
+    and the converted string, list and typed values, the returned lists must not be changed.
+
     Extends
     :
         MightBeAHoconObject
     """
 
+    __slots__ = ("values", "_sealed", "_cache")
+
     def __init__(self, values=None):
         self.values = values or []
+        self._sealed = False
+        #: the cached values of the sealed node, created on the first access
+        self._cache = None
+
+    def seal(self):
+        """Seals the node and the sub nodes, the values are cached after sealed"""
+        self._sealed = True
+        self._cache = None
+        for v in self.values:
+            if isinstance(v, HoconObject):
+                for child in v.itervalues():
+                    child.seal()
+            elif isinstance(v, HoconArray):
+                for child in v:
+                    child.seal()
+
+    def _memo(self, name, compute):
+        """Gets the cached value by name, computes it if not cached or not sealed"""
+        if not self._sealed:
+            return compute()
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = compute()
+            return value
+
+    def _memo_list(self, name, compute):
+        """Gets the cached list by name, the cached tuple is copied to a new list for the caller"""
+        return list(self._memo(name, lambda: tuple(compute())))
+
+    def _invalidate(self):
+        self._sealed = False
+        self._cache = None
 
     def at_key(self, key):
         """Get data node by key"""
@@ -209,6 +367,9 @@ class HoconValue(MightBeAHoconObject):
 
     def get_object(self):
         """Get the real current object"""
+        return self._memo("object", self._get_object)
+
+    def _get_object(self):
         raw = self.values[0] if len(self.values) >= 1 else None
 
         if isinstance(raw, HoconObject):
@@ -227,11 +388,13 @@ class HoconValue(MightBeAHoconObject):
         """Append a value inf current node"""
         # if isinstance(value, HoconElement):
         self.values.append(value)
+        self._invalidate()
         return self
 
     def clear(self):
         """Clear the sub nodes"""
         self.values[:] = []
+        self._invalidate()
 
     def new_value(self, value):
         """Clear the sub values and reset by the new value"""
@@ -240,10 +403,13 @@ class HoconValue(MightBeAHoconObject):
 
     def is_string(self):
         """Check is string object"""
-        return all([v.is_string() for v in self.values])
+        return self._memo("is_string", lambda: all(v.is_string() for v in self.values))
 
     def get_array(self):
         """Get the datas value as node list"""
+        return self._memo_list("array", self._get_array)
+
+    def _get_array(self):
         x = []
         for arr in self.values:
             if arr.is_array():
@@ -252,11 +418,11 @@ class HoconValue(MightBeAHoconObject):
 
     def get_list(self):
         """Get the datas value as string list"""
-        return [e.get_string() for e in self.get_array()]
+        return self._memo_list("list", lambda: [e.get_string() for e in self.get_array()])
 
     def is_array(self):
         """Is array?"""
-        return self.get_list() is not None
+        return self._memo("is_array", lambda: any(v.is_array() for v in self.values))
 
     def get(self):
         """Get the the sub node"""
@@ -274,6 +440,9 @@ class HoconValue(MightBeAHoconObject):
 
     def get_bool(self):
         """Get the current object as bool value"""
+        return self._memo("bool", self._get_bool)
+
+    def _get_bool(self):
         v = self.get_string()
         if v == 'on':
             return True
@@ -288,6 +457,9 @@ class HoconValue(MightBeAHoconObject):
 
     def get_string(self):
         """Get the nodes as string"""
+        return self._memo("string", self._get_string)
+
+    def _get_string(self):
         if self.is_string():
             return self.contat()
 
@@ -305,19 +477,23 @@ class HoconValue(MightBeAHoconObject):
 
     def get_int(self):
         """Get the data value as int data"""
-        return self._get_by_type(int)
+        return self._memo("int", lambda: self._get_by_type(int))
 
     def get_float(self):
         """Get the data value as float data"""
-        return self._get_by_type(float)
+        return self._memo("float", lambda: self._get_by_type(float))
+
+    def get_bool_list(self):
+        """Get the data value as bool list"""
+        return self._memo_list("bool_list", lambda: [e.get_bool() for e in self.get_array()])
 
     def get_int_list(self):
         """Get the data value as int list"""
-        return [e.get_int() for e in self.get_array()]
+        return self._memo_list("int_list", lambda: [e.get_int() for e in self.get_array()])
 
     def get_float_list(self):
         """Get the data value as float list"""
-        return [e.get_float() for e in self.get_array()]
+        return self._memo_list("float_list", lambda: [e.get_float() for e in self.get_array()])
 
     def __str__(self):
         if self.is_string():
@@ -332,7 +508,8 @@ class HoconValue(MightBeAHoconObject):
 
 class HoconElement(object):
     """Base Hocon element"""
-    pass
+
+    __slots__ = ()
 
 
 class HoconArray(HoconElement, list):
@@ -345,6 +522,8 @@ class HoconArray(HoconElement, list):
         list
     """
 
+    __slots__ = ()
+
     def is_string(self):
         return False
 
@@ -369,6 +548,8 @@ class HoconLiteral(HoconElement):
         HoconElement
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, text=''):
         self.value = text
 
@@ -403,6 +584,8 @@ class HoconObject(HoconElement, dict):
         dict
     """
 
+    __slots__ = ()
+
     def is_string(self):
         return False
 
@@ -444,16 +627,19 @@ class HoconObject(HoconElement, dict):
         """Merge the node into current node"""
         for k, v in obj.iteritems():
             if k in self:
-                this_item = self[k]
-                if this_item.is_object() and v.value.is_object():
-                    this_item.get_object.merge(v.value.get_object())
-            else:
-                self[k] = v.value
+                # the literal value is an object too, only the hocon objects are merged
+                this_object, other_object = self[k].get_object(), v.get_object()
+                if isinstance(this_object, HoconObject) and isinstance(other_object, HoconObject):
+                    this_object.merge(other_object)
+                    continue
+            self[k] = v
 
 
 class HoconSubstitution(HoconElement, MightBeAHoconObject):
     """Hocon $ variable"""
 
+    __slots__ = ("path", "resolved_value")
+
     def __init__(self, path=None):
         self.path = path
         self.resolved_value = None
@@ -470,6 +656,9 @@ class HoconSubstitution(HoconElement, MightBeAHoconObject):
     def get_list(self):
         return self.resolved_value.get_list()
 
+    def get_array(self):
+        return self.resolved_value.get_array()
+
     def is_object(self):
         return self.resolved_value and self.resolved_value.is_object()
 
@@ -620,24 +809,29 @@ class Parser(object):
         """
         return Parser().parse_text(text, include_callback, pystyle)
 
-    def parse_text(self, text, include_callback, pystyle):
+    def parse_text(self, text, include_callback, pystyle, resolve=True):
         """Parse the text , returns a hocon config
 
         :param text: the hocon text
         :type text: string
-        :param include_callback: the included handle callback
+        :param include_callback: the included handle callback, defaults to the ``FileIncluder``
+            resolves the path relative to the working directory
         :type include_callback: types.Function
         :param pystyle: If ``Ture`` use the PyConfig and converts the data node to real type data, defaults to False
         :type pystyle: bool, optional
+        :param resolve: If ``False`` keeps the substitutions unresolved for the including config, defaults to True
         :returns: the hocon conguration
         :rtype: PyConfig | Config
         :raises: HoconParserException
         """
-        self._include_callback = include_callback
+        self._include_callback = include_callback or FileIncluder(None, pystyle)
         self._root = HoconValue()
         self._reader = HoconTokenizer(text, pystyle)
         self._reader.pull_whitespace_and_comments()
         self.parse_object(self._root, True, "")
+        if not resolve:
+            return HoconRoot(self._root, self._substitutions)
+
         c = Config(HoconRoot(self._root, []))
 
         for sub in self._substitutions:
@@ -648,6 +842,7 @@ class Parser(object):
                 raise HoconParserException(
                     "Unresolved substitution:" + sub.path)
             sub.resolved_value = res
+        self._root.seal()
         return HoconRoot(self._root, self._substitutions)
 
     def parse_object(self, current, root, current_path):
@@ -668,11 +863,13 @@ class Parser(object):
                 if t.token_type == TokenType.Include:
                     included = self._include_callback(t.value)
                     substitutions = included.substitutions
-                    for substitution in substitutions:
-                        substitution.path = current_path + "." + substitution.path
+                    if current_path:
+                        for substitution in substitutions:
+                            substitution.path = current_path + "." + substitution.path
                     self._substitutions.extend(substitutions)
                     other_obj = included.value.get_object()
-                    current.get_object().merge(other_obj)
+                    if other_obj is not None:
+                        current.get_object().merge(other_obj)
 
                 elif t.token_type == TokenType.EoF:
                     # not empty path
@@ -682,8 +879,9 @@ class Parser(object):
 
                 elif t.token_type == TokenType.Key:
                     value_ = current_object.get_or_create_key(t.value)
-
-                    value_.clear()
+                    # the duplicate object keys are merged
+                    if not isinstance(value_.get_object(), HoconObject):
+                        value_.clear()
                     next_path = t.value if current_path == "" else current_path + "." + t.value
                     self.parse_key_content(value_, next_path)
                     if not root:
@@ -731,8 +929,13 @@ class Parser(object):
         start = self._reader.index
 
         try:
+            first = True
             while self._reader.is_value():
                 t = self._reader.pull_value()
+                if first and t.token_type != TokenType.ObjectStart and isinstance(current.get_object(), HoconObject):
+                    # the non object value overrides the duplicate object key
+                    current.clear()
+                first = False
                 if t.token_type == TokenType.EoF:
                     pass
 
@@ -804,8 +1007,33 @@ class Parser(object):
             self._reader.pull_comma()
 
 
+class _Patterns(object):
+    """The compiled tokenizer regexes
+
+    :param flags: the regex flags, ``re.UNICODE`` for the unicode text
+    """
+
+    def __init__(self, flags):
+        not_in_key = re.escape(HoconTokenizer.NotInUnquotedKey)
+        not_in_text = re.escape(HoconTokenizer.NotInUnquotedText)
+        #: the comment starts with ``#`` or ``//``, a single ``/`` is a text char
+        ws_comments = r'(?:\s+|(?:#|//)[^\n]*\n?)*'
+        self.whitespace = re.compile(r'\s*', flags)
+        self.whitespace_and_comments = re.compile(ws_comments, flags)
+        self.rest_of_line = re.compile(r'[^\n]*')
+        self.unquoted_key = re.compile(r'(?:[^%s/]|/(?!/))*' % not_in_key, flags)
+        self.unquoted_text = re.compile(r'(?:[^\s%s/]|/(?!/))*' % not_in_text, flags)
+        self.space_or_tab = re.compile(r'[ \t\v]*')
+        self.quoted_text = re.compile(r'"([^"]*)"?')
+        self.trip_quoted_text = re.compile(r'"""(.*?"*)"""', re.DOTALL)
+        self.include = re.compile(r'include(?=\s|#|//)%s(?=")' % ws_comments, flags)
+
+
 class Tokenizer(object):
-    """The Base Hocon Tokenizer"""
+    """The Base Hocon Tokenizer
+
+    Scans the text by the compiled regexes from the current index, the token value is sliced by the matched span.
+    """
 
     def __init__(self, text, pystyle=False):
         #: the current node text
@@ -816,10 +1044,13 @@ class Tokenizer(object):
         self._index_stack = []
         #: the value covert style
         self.pystyle = pystyle
+        #: the text length
+        self._length = len(text)
+        self._patterns = _BYTES_PATTERNS if isinstance(text, bytes) else _UNICODE_PATTERNS
 
     @property
     def length(self):
-        return len(self._text)
+        return self._length
 
     @property
     def index(self):
@@ -829,33 +1060,30 @@ class Tokenizer(object):
         self._index_stack.append(self._index)
 
     def pop(self):
-        self._index_stack.pop()
+        self._index = self._index_stack.pop()
 
     @property
     def eof(self):
         """End of file"""
-        return self._index >= len(self._text)
+        return self._index >= self._length
 
     def match(self, pattern):
         """Match the pattern returns ``True``"""
-        if (len(pattern) + self._index) > len(self._text):
-            return False
-        end = self._index + len(pattern)
-        if self._text[self._index:end] == pattern:
-            return True
-        return False
+        return self._text.startswith(pattern, self._index)
 
     def matches(self, *patterns):
         """Match all patterns returns ``True``"""
-        for pattern in patterns:
-            m = self.match(pattern)
-            if m:
-                return True
-        return False
+        return self._text.startswith(patterns, self._index)
+
+    def scan(self, regex):
+        """Matches the regex at the current index, moves the index to the match end, returns the match object"""
+        m = regex.match(self._text, self._index)
+        self._index = m.end()
+        return m
 
     def take(self, length):
         """Get the head  length text """
-        if(self._index + length) > len(self._text):
+        if(self._index + length) > self._length:
             return None
         end = self._index + length
         s = self._text[self._index:end]
@@ -864,14 +1092,14 @@ class Tokenizer(object):
 
     def peek(self):
         """Peek the head char if not end"""
-        if self.eof:
+        if self._index >= self._length:
             return chr(0)
 
         return self._text[self._index]
 
     def take_one(self):
         """Take the head one length char string"""
-        if self.eof:
+        if self._index >= self._length:
             return chr(0)
         index = self._index
         self._index += 1
@@ -879,8 +1107,7 @@ class Tokenizer(object):
 
     def pull_whitespace(self):
         """Pull white space"""
-        while (not self.eof) and self.peek().isspace():
-            self.take_one()
+        self.scan(self._patterns.whitespace)
 
     def get_help_text_at_index(self, index, length=0):
         """Get the help text at index"""
@@ -903,24 +1130,15 @@ class HoconTokenizer(Tokenizer):
 
     def pull_whitespace_and_comments(self):
         """Pull whitespace and comments"""
-        while True:
-            self.pull_whitespace()
-            while self.is_start_of_comment():
-                self.pull_comment()
-            if not self.is_whitesplace():
-                break
+        self.scan(self._patterns.whitespace_and_comments)
 
     def pull_rest_of_line(self):
         """Pull the rest of the current line"""
-        sb = ""
-        while not self.eof:
-            c = self.take_one()
-            if c == '\n':
-                break
-            if c == '\r':
-                continue
-            sb += c
-        return sb.strip()
+        value = self.scan(self._patterns.rest_of_line).group()
+        if self._index < self._length:
+            # skips the line break
+            self._index += 1
+        return value.replace('\r', '').strip()
 
     def pull_next(self):
         """Pull the next token section"""
@@ -1053,10 +1271,8 @@ class HoconTokenizer(Tokenizer):
     def pull_unquoted_key(self):
         """Pull unquoted key"""
         start = self.index
-        sb = ""
-        while (not self.eof) and self.is_unquoted_key():
-            sb += self.take_one()
-        return Token.Key(sb.strip(), start, self.index - start)
+        key = self.scan(self._patterns.unquoted_key).group()
+        return Token.Key(key.strip(), start, self.index - start)
 
     def is_unquoted_key(self):
         """Check is the  unquoted key"""
@@ -1079,54 +1295,29 @@ class HoconTokenizer(Tokenizer):
     def pull_trip_quoted_text(self):
         """Pull the trip quoted text"""
         start = self.index
-        sb = ''
-        self.take(3)
-        while (not self.eof) and (not self.match("\"\"\"")):
-            if self.match("\\"):
-                sb += self.pull_escape_sequence()
-            else:
-                sb += self.take_one()
-
-        if self.match("\""):
+        m = self._patterns.trip_quoted_text.match(self._text, start)
+        if m is None:
             raise HoconTokenizerException(str.format(
-                "Expected end of tripple quoted string {0}", self.get_help_text_at_index(self.index)))
-
-        self.take(3)
-        return Token.LiteralValue(sb, start, self.index - start)
+                "Expected end of tripple quoted string {0}", self.get_help_text_at_index(start)))
+        self._index = m.end()
+        return Token.LiteralValue(m.group(1), start, self.index - start)
 
     def pull_quoted_text(self):
         """Pull the quoted text"""
         start = self.index
-        sb = ''
-        self.take_one()
-        while (not self.eof) and not self.match("\""):
-            if self.match("\\"):
-                sb += self.pull_escape_sequence()
-            else:
-                sb += self.take_one()
-
-        self.take_one()
-        return Token.LiteralValue(sb, start, self.index - start)
+        value = self.scan(self._patterns.quoted_text).group(1)
+        return Token.LiteralValue(value, start, self.index - start)
 
     def pull_quoted_key(self):
         """Pull the quoted key"""
         start = self.index
-        sb = ''
-        self.take(3)
-        while (not self.eof) and (not self.match("\"")):
-            if self.match("\\"):
-                sb += self.pull_escape_sequence()
-            else:
-                sb += self.take_one()
-
-        self.take_one()
-        return Token.Key(sb, start, self.index - start)
+        key = self.scan(self._patterns.quoted_text).group(1)
+        return Token.Key(key, start, self.index - start)
 
     def pull_include(self):
         """Pull the include token"""
         start = self.index
-        self.take(len("include"))
-        self.pull_whitespace_and_comments()
+        self.scan(self._patterns.include)
         rest = self.pull_quoted_text()
         unQuote = rest.value
         return Token.Include(unQuote, start, self.index - start)
@@ -1194,33 +1385,15 @@ class HoconTokenizer(Tokenizer):
 
     def is_include(self):
         """Check is include"""
-        self.push()
-        try:
-            if self.match("include"):
-                self.take(len("include"))
-
-                if self.is_whitesplace_or_comment():
-
-                    self.pull_whitespace_and_comments()
-
-                    if self.is_start_quoted_text():
-                        self.pull_quoted_text()
-                        return True
-            return False
-
-        finally:
-            self.pop()
+        return self.match("include") and self._patterns.include.match(self._text, self._index) is not None
 
     def pull_substitution(self):
         """Pull substitution token"""
         start = self.index
-        sb = ''
-        self.take(2)
-        while (not self.eof) and self.is_unquoted_text():
-            sb += self.take_one()
-
+        self._index += 2
+        path = self.scan(self._patterns.unquoted_text).group()
         self.take_one()
-        return Token.Substitution(sb.strip(), start, self.index - start)
+        return Token.Substitution(path, start, self.index - start)
 
     def is_space_or_tab(self):
         """Check is  blank context"""
@@ -1239,18 +1412,13 @@ class HoconTokenizer(Tokenizer):
     def pull_space_or_tab(self):
         """Pull black text"""
         start = self.index
-        sb = ''
-        while self.is_space_or_tab():
-            sb += self.take_one()
-
-        return Token.LiteralValue(sb, start, self.index - start)
+        value = self.scan(self._patterns.space_or_tab).group()
+        return Token.LiteralValue(value, start, self.index - start)
 
     def pull_unquoted_text(self):
         """Pull unquotes text"""
         start = self.index
-        value = ''
-        while (not self.eof) and self.is_unquoted_text():
-            value += self.take_one()
+        value = self.scan(self._patterns.unquoted_text).group()
 
         if self.pystyle:
             value = self.convert_to_pyvalue(value)
@@ -1309,3 +1477,7 @@ class HoconTokenizer(Tokenizer):
             return True
 
         return False
+
+
+_BYTES_PATTERNS = _Patterns(0)
+_UNICODE_PATTERNS = _Patterns(re.UNICODE)
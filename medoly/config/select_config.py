@@ -33,14 +33,65 @@ class SelectConfig(object):
     :type config: dict, optional
     """
 
+    #: the memoized split keys, shared by the configs
+    _split_keys = {}
+
+    #: the max memoized split keys
+    MAX_SPLIT_KEYS = 4096
+
     def __init__(self, config=None):
         self._config = config or dict()
+        #: the flat dotted key index in the compiled mode
+        self._index = None
+        self._compiled = False
 
     def __len__(self):
         return len(self._config)
 
     __nonzero__ = __len__
 
+    def compile(self):
+        """Compiles the config to the flat dotted key index, then ``get`` is a single dict lookup
+
+        The ``set``, ``update`` and ``delete`` invalidate the index, it will be rebuilt by the next reading.
+        Changes the nested dict value in place after compiled is not visible in the index,
+        uses ``set`` instead.
+        """
+        self._compiled = True
+        self._index = self._build_index()
+
+    @property
+    def compiled(self):
+        """Check the config is in the compiled mode"""
+        return self._compiled
+
+    def _build_index(self):
+        """Builds the flat dotted key index"""
+        index = {}
+        stack = [("", self._config)]
+        while stack:
+            prefix, config = stack.pop()
+            for k, v in config.iteritems():
+                # the key having dot is not accessable by the dotted key
+                if not isinstance(k, basestring) or '.' in k:
+                    continue
+                key = prefix + k
+                index[key] = v
+                if isinstance(v, dict):
+                    stack.append((key + ".", v))
+        return index
+
+    def _get_index(self):
+        """Gets the index in the compiled mode, returns ``None`` if not compiled"""
+        if not self._compiled:
+            return None
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index
+
+    def _invalidate(self):
+        self._index = None
+
     def set(self, key, value):
         """Set a chain key  value
 
@@ -48,6 +99,7 @@ class SelectConfig(object):
         :type key: string
         :param value: the value for key store
         """
+        self._invalidate()
         keys = self._keys(key)
         config = self._config
         i = 0
@@ -59,7 +111,7 @@ class SelectConfig(object):
                 config = config[k]
                 i += 1
 
-        keys = keys[i:]
+        keys = list(keys[i:])
         last_key = keys.pop()
         for k in keys:
             config[k] = {}
@@ -74,6 +126,14 @@ class SelectConfig(object):
         :param default: the default value when not found the key, defaults to None
         :returns: the value for the chain key
         """
+        if self._compiled:
+            index = self._index
+            if index is None:
+                index = self._get_index()
+            return index.get(key, default) if key is not None else self._config
+        if key is None:
+            return self._config
+
         keys = self._keys(key)
         config = self._config
         for k in keys:
@@ -94,14 +154,19 @@ class SelectConfig(object):
                 del v[keys[1]]
         else:
             del self._config[keys[0]]
+        self._invalidate()
 
     def update(self, config):
         """Update the settings in the current config"""
         if isinstance(config, SelectConfig):
-            config = config.config()
+            config = _thaw(config.config())
         for k, v in config.items():
             self.set(k, v)
 
+    def snapshot(self):
+        """Returns the immutable ``ConfigSnapshot`` of the current config"""
+        return ConfigSnapshot(self._config)
+
     def config(self):
         """Return real dict config """
         return self._config
@@ -111,6 +176,10 @@ class SelectConfig(object):
 
     def __contains__(self, key):
         """Check a key in the config"""
+        index = self._get_index()
+        if index is not None:
+            return key in index
+
         keys = self._keys(key)
         contains = True
         config = self._config
@@ -124,8 +193,150 @@ class SelectConfig(object):
         return contains
 
     def _keys(self, key):
-        """Split the dot chain key to list"""
-        return key.split('.')
+        """Split the dot chain key to tuple"""
+        keys = self._split_keys.get(key)
+        if keys is None:
+            if len(self._split_keys) >= self.MAX_SPLIT_KEYS:
+                self._split_keys.clear()
+            keys = self._split_keys[key] = tuple(key.split('.'))
+        return keys
 
     def __json__(self):
         return self._config
+
+
+class FrozenDict(dict):
+    """The immutable dict in the config snapshot
+
+    Extends:
+        dict
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("The config snapshot is immutable, uses the snapshot ``with_value`` or ``updated`` instead")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def _freeze(value):
+    """Converts the nested dicts to ``FrozenDict``, the frozen dicts are shared"""
+    if isinstance(value, dict) and not isinstance(value, FrozenDict):
+        return FrozenDict((k, _freeze(v)) for k, v in value.iteritems())
+    return value
+
+
+def _thaw(value):
+    """Converts the nested ``FrozenDict`` to dict"""
+    if isinstance(value, FrozenDict):
+        return {k: _thaw(v) for k, v in value.iteritems()}
+    return value
+
+
+_IMMUTABLE = ("The config snapshot is immutable, changes the application config by ``Application.update_config``, "
+              "or gets a new snapshot by ``with_value``, ``updated`` and ``without``")
+
+
+class ConfigSnapshot(SelectConfig):
+    """Immutable select dict configuration
+
+    The ``with_value``, ``updated`` and ``without`` return a new snapshot, only the dicts on the changed key paths
+    are copied, the others are shared with the current snapshot. The snapshot is always compiled.
+    The mutating ``set``, ``update`` and ``delete`` raise ``TypeError``, the application config is changed by
+    ``Application.update_config``.
+
+    Example:
+
+        >>> conf = SelectConfig({"db": {"host": "localhost"}}).snapshot()
+        >>> conf2 = conf.with_value("db.port", 3306)
+        >>> conf.get("db.port")
+        >>> ... None
+
+    Extends:
+        SelectConfig
+
+    :param config: the dict config, defaults to None
+    :type config: dict, optional
+    """
+
+    def __init__(self, config=None):
+        super(ConfigSnapshot, self).__init__()
+        self._config = _freeze(config or FrozenDict())
+        self._compiled = True
+
+    def compile(self):
+        """The snapshot is always compiled"""
+        pass
+
+    def set(self, key, value):
+        """The snapshot is immutable, see ``with_value``
+
+        :raises: TypeError
+        """
+        raise TypeError(_IMMUTABLE)
+
+    def update(self, config):
+        """The snapshot is immutable, see ``updated``
+
+        :raises: TypeError
+        """
+        raise TypeError(_IMMUTABLE)
+
+    def delete(self, key):
+        """The snapshot is immutable, see ``without``
+
+        :raises: TypeError
+        """
+        raise TypeError(_IMMUTABLE)
+
+    def with_value(self, key, value):
+        """Returns a new snapshot with the chain key value"""
+        return self.updated({key: value})
+
+    def updated(self, config):
+        """Returns a new snapshot updated by the settings"""
+        if isinstance(config, SelectConfig):
+            config = config.config()
+        root = dict(self._config)
+        for k, v in config.items():
+            keys = self._keys(k)
+            node = root
+            for key in keys[:-1]:
+                child = node.get(key)
+                if not isinstance(child, dict):
+                    child = node[key] = {}
+                elif isinstance(child, FrozenDict):
+                    # copies the shared dict on the changed path once
+                    child = node[key] = dict(child)
+                node = child
+            node[keys[-1]] = _freeze(v)
+        # the copied dicts are frozen, the unchanged ones are shared
+        return ConfigSnapshot(root)
+
+    def without(self, key):
+        """Returns a new snapshot without the chain key, returns the current snapshot if the key doesn't exist"""
+        keys = self._keys(key)
+        parents = [self._config]
+        for k in keys[:-1]:
+            child = parents[-1].get(k)
+            if not isinstance(child, dict):
+                return self
+            parents.append(child)
+        if keys[-1] not in parents[-1]:
+            return self
+
+        node = dict(parents.pop())
+        del node[keys[-1]]
+        for k in reversed(keys[:-1]):
+            parent = dict(parents.pop())
+            parent[k] = node
+            node = parent
+        return ConfigSnapshot(node)
+
+    def thaw(self):
+        """Returns the mutable ``SelectConfig`` copy"""
+        return SelectConfig(_thaw(self._config))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Config file watcher
+
+Polls the mtime and size of the config files and their included files, reloads the changed file only,
+then swaps the updated config snapshot in the application and calls the subscribers of the changed keys.
+
+Examples:
+
+.. code-block:: python
+
+    @kanon.watch("sqlalchemy.pool_size")
+    def resize_pool(pool_size, old_pool_size):
+        engine.pool.resize(pool_size)
+
+    # enables the reload in the config file
+    config_reload_interval = 2
+
+The later config files keep their precedence over the earlier files, and the override layers, like the
+environment variables and the command options, keep their precedence over the reloaded file values,
+see ``set_overrides``.
+"""
+
+import logging
+import os
+from collections import OrderedDict
+
+from tornado.ioloop import PeriodicCallback
+
+from .select_config import SelectConfig
+
+
+LOG = logging.getLogger(__name__)
+
+
+def flatten(config, prefix=""):
+    """Flattens the nested dict to the ``{dotted_key: leaf_value}`` dict"""
+    leaves = {}
+    for k, v in config.items():
+        key = prefix + k
+        if isinstance(v, dict) and v:
+            leaves.update(flatten(v, key + "."))
+        else:
+            leaves[key] = v
+    return leaves
+
+
+class ConfigWatcher(object):
+    """Config file watcher
+
+    :param loader: the callable loads the config file path, returns a ``SelectConfig`` or dict
+        and the included file paths
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        #: the watched files in the layer order, the path to ``(paths, signature, leaves)``,
+        #: the paths are the file and its included files
+        self.files = OrderedDict()
+        #: the subscribers, the list of ``(key, callback)``
+        self.subscribers = []
+        #: the dotted keys to the values override the file values
+        self.overrides = {}
+        self.app = None
+        #: the mutable config synchronized with the application config snapshot
+        self.config = None
+        self._periodic = None
+
+    @staticmethod
+    def signature(paths):
+        """Gets the ``(mtime, size)`` list of the files, ``None`` if any file is not found"""
+        stats = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            stats.append((st.st_mtime, st.st_size))
+        return stats
+
+    def add_file(self, path, config=None, includes=()):
+        """Watches the config file, the later added file wins
+
+        :param path: the config file path
+        :param config: the loaded config of the file, defaults to None, loads the file
+        :param includes: the included file paths of the loaded config
+        """
+        if config is None:
+            config, includes = self.loader(path)
+        paths = (path,) + tuple(includes)
+        self.files[path] = (paths, self.signature(paths), flatten(self._dict(config)))
+
+    def leaves(self):
+        """Merges the leaves of the files in the layer order"""
+        merged = {}
+        for _, _, leaves in self.files.itervalues():
+            merged.update(leaves)
+        return merged
+
+    def set_overrides(self, *configs):
+        """Sets the override layers, the later config wins, the reloaded file values don't change their keys
+
+        :param configs: the ``SelectConfig`` or dict configs
+        """
+        self.overrides = {}
+        for config in configs:
+            self.overrides.update(flatten(self._dict(config)))
+
+    def _overridden(self, key):
+        """Checks the dotted key or its parent key is overridden"""
+        if not self.overrides:
+            return False
+        keys = key.split(".")
+        for i in range(1, len(keys) + 1):
+            if ".".join(keys[:i]) in self.overrides:
+                return True
+        return False
+
+    def watch(self, key, callback):
+        """Subscribes the changes of the dotted key
+
+        :param key: the dotted key, the changes of the sub keys are published too
+        :param callback: the callable called with the new and old values
+        """
+        self.subscribers.append((key, callback))
+
+    def start(self, app, interval=1.0, config=None):
+        """Starts polling the config files
+
+        :param app: the application, its ``config`` snapshot is swapped when the files changed
+        :param interval: the poll interval seconds
+        :param config: the mutable config updated with the application config, defaults to None
+        """
+        self.app = app
+        self.config = config
+        self.stop()
+        self._periodic = PeriodicCallback(self.check, interval * 1000)
+        self._periodic.start()
+
+    def stop(self):
+        """Stops polling"""
+        if self._periodic is not None:
+            self._periodic.stop()
+            self._periodic = None
+
+    def check(self):
+        """Reloads the changed files, returns the changed keys"""
+        old, reloaded = None, False
+        for path, (paths, signature, leaves) in self.files.items():
+            current = self.signature(paths)
+            if current == signature or current is None:
+                continue
+            if old is None:
+                old = self.leaves()
+            try:
+                config, includes = self.loader(path)
+                new_leaves = flatten(self._dict(config))
+            except Exception:
+                LOG.exception("Can't reload the config file %s", path)
+                # retries after the next change
+                self.files[path] = (paths, current, leaves)
+                continue
+            LOG.info("Reloading the config file %s", path)
+            paths = (path,) + tuple(includes)
+            self.files[path] = (paths, self.signature(paths), new_leaves)
+            reloaded = True
+        if not reloaded:
+            return []
+
+        # the merged values, the keys of the later files are not changed by the earlier files
+        new = self.leaves()
+        changes = dict((k, v) for k, v in new.iteritems()
+                       if old.get(k, _missing) != v and not self._overridden(k))
+        removed = [k for k in old if k not in new and not self._overridden(k)]
+        if changes or removed:
+            self.publish(changes, removed)
+        return sorted(changes.keys() + removed)
+
+    def publish(self, changes, removed):
+        """Swaps the updated config snapshot, then calls the subscribers of the changed keys"""
+        old = self.app.config
+        new = old.updated(changes)
+        for key in removed:
+            new = new.without(key)
+        self.app.config = new
+        if self.config is not None:
+            self._sync(changes, removed)
+
+        for key, callback in self.subscribers:
+            old_value, new_value = old.get(key), new.get(key)
+            if old_value != new_value:
+                try:
+                    callback(new_value, old_value)
+                except Exception:
+                    LOG.exception("Config subscriber of ``%s`` failed", key)
+
+    def _sync(self, changes, removed):
+        """Applies the changes on the mutable config"""
+        for k, v in changes.iteritems():
+            self.config.set(k, v)
+        for key in removed:
+            parent_key, _, name = key.rpartition(".")
+            parent = self.config.get(parent_key) if parent_key else self.config.config()
+            if isinstance(parent, dict):
+                parent.pop(name, None)
+        self.config._invalidate()
+
+    @staticmethod
+    def _dict(config):
+        if isinstance(config, SelectConfig):
+            return config.config()
+        return config
+
+
+class _Missing(object):
+    pass
+
+_missing = _Missing()
@@ -18,20 +18,58 @@
 """Kanon is a composer, bule print a application.
 """
 
+import logging
 import os.path
+import sys
+import weakref
 
 from .manager import InventoryManager
 from . import composer
 from ._kanon import Melos
 
 
-def chant():
-    """Initialize the setting and application"""
-    return InventoryManager.instance().load()
+LOGGER = logging.getLogger("kanon")
+
+#: the composed packages, the package name to ``(package module, inventory manager weak reference)``
+_composed_packages = {}
+
+
+def chant(manifest=None):
+    """Initialize the setting and application
+
+    :param manifest: the inventory manifest file path, defaults to None. Exports the composed inventory
+        if it's not restored by ``restore``.
+    """
+    mgr = InventoryManager.instance()
+    app = mgr.load()
+    if manifest is not None and mgr.restored_manifest != manifest:
+        composer.InventoryManifest(manifest).export(mgr)
+    return app
+
+
+def restore(manifest):
+    """Restores the composed inventory from the manifest exported by ``chant``
+
+    Imports the composed modules required at the last compose without walking the packages, the decorators
+    of these modules register the handlers, hooks, error pages and other inventory again.
+    Returns ``False`` if the manifest is missing or stale, calls ``compose`` then.
+
+    :param manifest: the inventory manifest file path
+    """
+    inventory_manifest = composer.InventoryManifest(manifest)
+    if not inventory_manifest.is_valid():
+        return False
+    mgr = InventoryManager.instance()
+    inventory_manifest.restore(mgr)
+    mgr.restored_manifest = manifest
+    return True
 
 
 def hook(point, failsafe=None, priority=None, **kwargs):
-    """Add a hook point for application"""
+    """Add a hook point for application
+
+    The hook callback can be a coroutine function, the request handler awaits it.
+    """
 
     def _hook(func):
         InventoryManager.instance().attach(point, func, failsafe, priority, kwargs)
@@ -46,6 +84,19 @@ def error_page(status_code):
     return _error_page
 
 
+def watch(key):
+    """Subscribes the config changes of the dotted key
+
+    The callback is called with the new and old values when the config files are reloaded,
+    requires the ``config_reload_interval`` config.
+    """
+
+    def _watch(func):
+        InventoryManager.instance().watch(key, func)
+        return func
+    return _watch
+
+
 def boot():
     """Add a boot config or boot configs
 
@@ -79,24 +130,89 @@ def inventory_manager():
     return InventoryManager.instance()
 
 
-def compose(module, url_prefix="", template_path="template"):
+def use(mgr):
+    """Uses the inventory manager as the current one in the context
+
+    The kanon decorators of the modules composed in the context register into the manager, so the applications
+    chanted by each manager have their own routes, hooks and inventory. The modules are imported once, so
+    a package can't be composed for two managers, ``compose`` raises ``ValueError`` then.
+
+    Examples:
+
+    .. code-block:: python
+
+        admin = kanon.InventoryManager(enable_cmd_parse=False)
+        with kanon.use(admin):
+            kanon.compose("admin")
+            admin_app = kanon.chant()
+
+    :param InventoryManager mgr: the inventory manager
+    """
+    return InventoryManager.use(mgr)
+
+
+def compose(module, url_prefix="", template_path="template", manifest=None):
     """Scan the module including all sub modules.
 
     Checks the template path , if exists, will add it in the template engine paths.
+    The import seconds of each module are recorded in the ``compose_timings`` of the inventory manager.
 
     :param module: the python dot module string.
     :param string url_prefix: sets the current package url prefix for url route.
     :param template_path: if the module is a diretory and set the template path. it will add the template path,
             if exists the subdiretory  ``template_path`` in the current scan module directory. Defaults to "template".
+    :param manifest: the compose manifest file path, defaults to None. If the modules aren't changed since the
+            last compose, skips the modules without any import side effect, see ``composer.ComposeManifest``.
+    :raises: ValueError if the package or its sub or parent package is composed by another inventory manager
     """
+    mgr = InventoryManager.instance()
+    _check_composed(module if isinstance(module, basestring) else module.__name__, mgr)
     # settings to current url prefix
-    InventoryManager.instance().compose_url_prefix = url_prefix
-    module_infso, is_path, package = composer.scan_submodules(module)
+    mgr.compose_url_prefix = url_prefix
+    if manifest is not None:
+        manifest = composer.ComposeManifest(manifest)
+    timings = mgr.compose_timings
+    required, walked = [], []
+    module_infso, is_path, package = composer.scan_submodules(
+        module, timings=timings, manifest=manifest, required=required, walked=walked)
+    _composed_packages[package.__name__] = (package, weakref.ref(mgr))
+    # the composed module itself may register the inventory
+    mgr.composed_modules[package.__name__] = url_prefix
+    for name in required:
+        mgr.composed_modules[name] = url_prefix
+    # the sources and package directories for the inventory manifest
+    source = os.path.splitext(package.__file__)[0] + ".py"
+    if os.path.isfile(source):
+        mgr.compose_sources.append(source)
+    if is_path:
+        mgr.compose_packages.extend(package.__path__)
+    for name, is_pkg, source in walked:
+        if source is not None:
+            mgr.compose_sources.append(source)
+            if is_pkg:
+                mgr.compose_packages.append(os.path.dirname(source))
+    if timings:
+        LOGGER.debug("The slowest composed modules: %s", ", ".join(
+            "%s %.2fms" % (name, cost * 1000) for name, cost in sorted(
+                timings.iteritems(), key=lambda item: item[1], reverse=True)[:10]))
     if is_path and template_path:
         path = os.path.dirname(package.__file__)
         full_template_path = os.path.join(path, template_path)
         if os.path.isdir(full_template_path):
-            InventoryManager.instance().add_template_path(full_template_path)
+            mgr.add_template_path(full_template_path)
+
+
+def _check_composed(name, mgr):
+    """Checks the package isn't composed by another manager, its decorators don't run again when imported"""
+    for composed, (package, ref) in _composed_packages.items():
+        if sys.modules.get(composed) is not package:
+            # reloaded or removed, the decorators run again when imported
+            del _composed_packages[composed]
+            continue
+        if ref() is not mgr and (name == composed or name.startswith(composed + ".") or
+                                 composed.startswith(name + ".")):
+            raise ValueError("The package ``%s`` is composed by another inventory manager as ``%s``, "
+                             "the imported modules can't register into the current manager" % (name, composed))
 
 
 def ui(template_name, name=None):
@@ -124,10 +240,13 @@ def ui(template_name, name=None):
     return _ui
 
 
-def menu(url_spec, settings=None, name=None):
-    """Adds a url route in manager"""
+def menu(url_spec, settings=None, name=None, cache=None):
+    """Adds a url route in manager
+
+    The ``cache`` option caches the ``GET`` responses, see ``medoly.anthem.cache``.
+    """
     def __menu(handler):
-        InventoryManager.instance().add_route(url_spec, handler, settings, name)
+        InventoryManager.instance().add_route(url_spec, handler, settings, name, cache=cache)
         return handler
     return __menu
 
@@ -142,12 +261,19 @@ def route(url_prefix=''):
     return __route
 
 
-def bloom(inventory_name, access_name=None):
-    """Binds the inventory"""
+def bloom(inventory_name, access_name=None, scope="singleton", pool_size=8):
+    """Binds the inventory
+
+    :param scope: the scope of the thing and mapper, ``singleton``, ``request``, ``thread`` or ``pooled``,
+        see ``medoly.kanon.scope``. Defaults to ``singleton``.
+    :param pool_size: the max idle instances of the ``pooled`` scope, defaults to 8
+    """
 
     # check the inventory name validation
     if inventory_name not in ['model', 'thing', 'mapper']:
         raise KeyError("Kanon doesn't have the inventory stragery for ``{}``".format(inventory_name))
+    if inventory_name == "model" and scope != "singleton":
+        raise ValueError("The model is a class, can't be scoped")
 
     def _bloom(inventory):
         kclass_name = inventory.__name__
@@ -161,7 +287,7 @@ def bloom(inventory_name, access_name=None):
                 else:
                     name = kclass_name
 
-            InventoryManager.instance().put_thing(name, inventory)
+            InventoryManager.instance().put_thing(name, inventory, scope, pool_size)
 
         elif inventory_name == "model":
             name = None
@@ -182,7 +308,7 @@ def bloom(inventory_name, access_name=None):
                 else:
                     name = kclass_name
 
-            InventoryManager.instance().put_mapper(name, inventory)
+            InventoryManager.instance().put_mapper(name, inventory, scope, pool_size)
 
         return inventory
     return _bloom
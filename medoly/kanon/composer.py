@@ -14,19 +14,63 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import ast
 import importlib
+import json
+import os
 import pkgutil
+import sys
+import tempfile
+from timeit import default_timer
 
 import logging
 
 LOGGER = logging.getLogger("kanon.composer")
 
 
-def scan_submodules(package, recursive=True):
+def walk_modules(package, recursive=True):
+    """Walks the submodules of the package without importing them
+
+    Each module is yielded once, the sub packages are walked by their paths.
+
+    :param package: the package module
+    :param recursive: If ``True`` walks the sub packages, defaults to True
+    :returns: the generator of ``(full name, is package, source path)``, the source path is ``None``
+        if it's not a python source file
+    """
+    for importer, name, is_pkg in pkgutil.iter_modules(package.__path__):
+        full_name = package.__name__ + "." + name
+        base = os.path.join(getattr(importer, "path", ""), name)
+        source = os.path.join(base, "__init__.py") if is_pkg else base + ".py"
+        yield full_name, is_pkg, source if os.path.isfile(source) else None
+        if recursive and is_pkg:
+            sub = _PackagePath(full_name, [base])
+            for info in walk_modules(sub, recursive):
+                yield info
+
+
+class _PackagePath(object):
+    """The package name and path for walking the not imported package"""
+
+    def __init__(self, name, path):
+        self.__name__ = name
+        self.__path__ = path
+
+
+def scan_submodules(package, recursive=True, timings=None, manifest=None, required=None, walked=None):
     """Import and scan all submodules of a module, recursively, including sub packages,
 
+    If the ``manifest`` is valid, skips the modules not required at the last scan, otherwise imports all modules
+    and records the modules loaded by each import in the manifest, see ``ComposeManifest``.
+
     :param package: package (name or actual module)
     :type package: str | module
+    :param recursive: If ``True`` scans the sub packages, defaults to True
+    :param timings: the dict records the import seconds of each module, defaults to None
+    :param manifest: the compose manifest, defaults to None
+    :type manifest: ComposeManifest
+    :param required: the list records the modules required to compose the package again, defaults to None
+    :param walked: the list records the walked ``(full name, is package, source)`` modules, defaults to None
     :returns: the  package infos, is a path module info, and the current package module instance
     :rtype: (dict[str, types.ModuleType], bool, top level module)
     """
@@ -36,15 +80,237 @@ def scan_submodules(package, recursive=True):
     is_path = False
     if hasattr(package, "__path__"):
         is_path = True
-        for loader, name, is_pkg in pkgutil.walk_packages(package.__path__):
-            full_name = package.__name__ + '.' + name
+        modules = list(walk_modules(package, recursive))
+        if walked is not None:
+            walked.extend(modules)
+        valid = manifest is not None and manifest.is_valid(modules)
+        record = manifest is not None and not valid
+        track = record or required is not None
+        if record:
+            manifest.modules.clear()
+        for full_name, is_pkg, source in modules:
+            if valid and not manifest.requires(full_name):
+                LOGGER.debug("Skipping module: %s", full_name)
+                continue
+            before = set(sys.modules) if track else None
+            start = default_timer()
             package_infos[full_name] = importlib.import_module(full_name)
-            if recursive and is_pkg:
-                LOGGER.debug("Scaning package: %s", full_name)
-                package_infos.update(scan_submodules(full_name)[0])
+            if timings is not None:
+                timings[full_name] = default_timer() - start
+            if not track:
+                continue
+            # python 2 caches the missed implicit relative imports as ``None``
+            imports = sorted(name for name in set(sys.modules) - before
+                             if name != full_name and sys.modules[name] is not None)
+            needed = valid or bool(imports) or not is_inert(source)
+            if record:
+                manifest.record(full_name, source, imports, needed)
+            if required is not None and needed:
+                required.append(full_name)
+        if record:
+            manifest.save()
     return package_infos, is_path, package
 
 
+def is_inert(source):
+    """Checks the module source has no side effect but its imports
+
+    The inert module only has the docstring, the imports, the functions without decorators and the literal
+    assignments at the top level, the classes aren't inert for their decorators and metaclasses.
+
+    :param source: the module source path, the ``None`` is not inert
+    """
+    if source is None:
+        return False
+    try:
+        with open(source) as f:
+            tree = ast.parse(f.read(), source)
+    except (IOError, OSError, SyntaxError, TypeError):
+        return False
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.Pass)):
+            continue
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Str):
+            continue
+        if isinstance(node, ast.FunctionDef) and not node.decorator_list:
+            continue
+        if isinstance(node, ast.Assign) and all(isinstance(target, ast.Name) for target in node.targets):
+            try:
+                ast.literal_eval(node.value)
+            except ValueError:
+                return False
+            continue
+        return False
+    return True
+
+
+class ComposeManifest(object):
+    """The compose manifest, records the modules loaded by importing each module
+
+    The manifest is a json file, it's valid when the scanned modules are the same and their source files
+    aren't changed. The module is skipped at the next compose if it's inert (see ``is_inert``) and its import
+    loaded no other module, it can't register any inventory or change any state then. The other modules are
+    imported, including the modules re-registering the existing inventory and the modules only run the import
+    side effects. The modules registering the inventory are always imported, the manifest only saves the imports
+    of the inert modules.
+
+    :param path: the manifest file path
+    """
+
+    #: the manifest format version
+    VERSION = 2
+
+    def __init__(self, path):
+        self.path = path
+        #: the module name to ``{"signature": [mtime, size], "imports": [module name], "required": bool}``
+        self.modules = {}
+        self.load()
+
+    def load(self):
+        """Loads the manifest file, it's empty if the file is not found or invalid"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+        if data.get("version") == self.VERSION:
+            self.modules = data.get("modules", {})
+
+    def save(self):
+        """Saves the manifest file"""
+        try:
+            dirname = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(dir=dirname)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": self.VERSION, "modules": self.modules}, f, indent=1, sort_keys=True)
+            os.rename(tmp, self.path)
+        except (IOError, OSError):
+            LOGGER.warning("Can't save the compose manifest %s", self.path, exc_info=True)
+
+    @staticmethod
+    def signature(source):
+        """Gets the ``[mtime, size]`` of the module source, ``None`` if it's not a source file"""
+        if source is None:
+            return None
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        return [st.st_mtime, st.st_size]
+
+    def is_valid(self, modules):
+        """Checks the manifest matches the walked ``(full name, is package, source)`` modules"""
+        if len(modules) != len(self.modules):
+            return False
+        for full_name, _, source in modules:
+            entry = self.modules.get(full_name)
+            signature = self.signature(source)
+            if entry is None or signature is None or entry["signature"] != signature:
+                return False
+        return True
+
+    def requires(self, full_name):
+        """Checks the module is required to import"""
+        return self.modules[full_name]["required"]
+
+    def record(self, full_name, source, imports, required):
+        """Records the modules loaded by importing the module
+
+        :param full_name: the module name
+        :param source: the module source path
+        :param imports: the names of the other modules loaded by the import
+        :param required: If ``True`` the module is imported at the next compose
+        """
+        self.modules[full_name] = {"signature": self.signature(source), "imports": imports, "required": required}
+
+
+def list_modules(path):
+    """Lists the ``[name, is package]`` of the modules in the package directory, sorted by the name"""
+    return sorted([name, is_pkg] for _, name, is_pkg in pkgutil.iter_modules([path]))
+
+
+class InventoryManifest(object):
+    """The inventory manifest, restores the composed packages without walking them
+
+    The manifest only caches the composed modules required to import with their url prefixes, the template
+    paths and the compiled url rules. The handlers, ``Melos`` bindings, hooks, error pages and the other
+    inventory aren't stored, they are registered again by importing the modules.
+    It's valid when the source files aren't changed and the package directories list the same modules.
+
+    Examples:
+
+    .. code-block:: python
+
+        if not kanon.restore("var/app.inventory.json"):
+            kanon.compose("app")
+            kanon.compose("admin", url_prefix="/admin")
+        app = kanon.chant(manifest="var/app.inventory.json")
+
+    :param path: the manifest file path
+    """
+
+    #: the manifest format version
+    VERSION = 2
+
+    def __init__(self, path):
+        self.path = path
+        self.data = None
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+        if data.get("version") == self.VERSION:
+            self.data = data
+
+    def is_valid(self):
+        """Checks the manifest is loaded and the sources aren't changed"""
+        if not self.data:
+            return False
+        for path, signature in self.data["sources"]:
+            if ComposeManifest.signature(path) != signature:
+                return False
+        for path, modules in self.data["packages"]:
+            if list_modules(path) != modules:
+                return False
+        return True
+
+    def restore(self, mgr):
+        """Imports the composed modules and restores the template paths and the compiled url rules"""
+        for name, url_prefix in self.data["modules"]:
+            mgr.compose_url_prefix = url_prefix
+            importlib.import_module(name)
+            mgr.composed_modules[name] = url_prefix
+        mgr.compose_url_prefix = ""
+        # the template path is inserted at head
+        for path in reversed(self.data["template_paths"]):
+            mgr.add_template_path(path)
+        if self.data["patterns"] == mgr.url_pattern_manager.patterns:
+            mgr.route_patterns.update(self.data["routes"])
+        mgr.compose_sources = [path for path, _ in self.data["sources"]]
+        mgr.compose_packages = [path for path, _ in self.data["packages"]]
+
+    def export(self, mgr):
+        """Saves the composed inventory of the manager"""
+        self.data = {
+            "version": self.VERSION,
+            "sources": [[path, ComposeManifest.signature(path)] for path in mgr.compose_sources],
+            "packages": [[path, list_modules(path)] for path in mgr.compose_packages],
+            "modules": list(mgr.composed_modules.items()),
+            "template_paths": mgr.template_manager.template_paths,
+            "patterns": mgr.url_pattern_manager.patterns,
+            "routes": mgr.route_patterns,
+        }
+        try:
+            dirname = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(dir=dirname)
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.data, f)
+            os.rename(tmp, self.path)
+        except (IOError, OSError):
+            LOGGER.warning("Can't save the inventory manifest %s", self.path, exc_info=True)
+
+
 class Connector(object):
     """Route menu processor
 
@@ -62,7 +328,7 @@ class Connector(object):
     def __enter__(self):
         return self
 
-    def connect(self, url_spec, handler=None, setting=None, name=None, render=None):
+    def connect(self, url_spec, handler=None, setting=None, name=None, render=None, cache=None):
         """Added a url route handler
 
         If  ``render`` is not ``None``, it will use the template render hanlder, else use the ``handler`` as request handler class.
@@ -77,8 +343,9 @@ class Connector(object):
         :type name: string, optional
         :param render: the temaplate path for tempalte render handler, defaults to None
         :type render: string, optional
+        :param cache: the response cache options, see ``medoly.anthem.cache.create_cache``, defaults to None
         """
-        self.mgr.add_route(self.url_prefix + url_spec, handler, setting, name, render)
+        self.mgr.add_route(self.url_prefix + url_spec, handler, setting, name, render, cache)
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.mgr = None
@@ -20,16 +20,25 @@ import os.path
 import logging
 import re
 import types
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from multiprocessing.pool import ThreadPool
 
 from tornado.web import RequestHandler
 
 from medoly import anthem
+from medoly.anthem.router import Converter, TypedArgumentsMixin, TypedPathMatches
+from medoly.anthem.cache import create_cache
 from medoly import muses
 from medoly.config import SelectConfig
+from medoly.config.watcher import ConfigWatcher
 from medoly import cmd
 from medoly.template.engine import TemplateEngine
-from medoly.util import get_class_bases
+from medoly.util import synthesize_class
 from ._kanon import Melos
+from . import scope as scopes
 from .ctx import AppContext
 
 
@@ -71,6 +80,23 @@ class InventoryManager(object):
         else:
             raise TypeError("The mgr must be an instance of InventoryManager")
 
+    @staticmethod
+    @contextmanager
+    def use(mgr):
+        """Sets the current singleton inventory manager in the context, restores the previous one on exit
+
+        :param InventoryManager mgr: inventoy manager
+        """
+        previous = getattr(InventoryManager, "_current", None)
+        InventoryManager.set_instance(mgr)
+        try:
+            yield mgr
+        finally:
+            if previous is None:
+                del InventoryManager._current
+            else:
+                InventoryManager._current = previous
+
     def __init__(self, handlercls=None, config=None, template_manager=None, enable_cmd_parse=True,
                  url_pattern_manager=None):
 
@@ -88,13 +114,16 @@ class InventoryManager(object):
         #: the config
         self.config = config or SelectConfig()
 
+        #: the config file watcher
+        self.watcher = ConfigWatcher(cmd.load_config_file)
+
         #: the model class container
         self.models = {}
 
-        #: the data-mapping layer singletion  instance container
+        #: the data-mapping layer container, the class is replaced by its provider when mounted
         self.mappers = {}
 
-        #: the thing singleton instance container
+        #: the thing container, the class is replaced by its provider when mounted
         self.things = {}
 
         #: the url route container list
@@ -103,6 +132,9 @@ class InventoryManager(object):
         #: the application name
         self.app_name = "Medoly"
 
+        #: the environment variable prefix of the env config layer, like ``MEDOLY_``, disabled by default
+        self.env_prefix = None
+
         if handlercls and not issubclass(handlercls, RequestHandler):
             raise TypeError("Must be a subclass of RequestHandler: {0}".format(handlercls.__name__))
         self.defalut_handler = handlercls or anthem.Handler
@@ -116,6 +148,36 @@ class InventoryManager(object):
         #: the custom chords
         self.chords = {}
 
+        #: the not singleton inventory scopes, the ``(genre, name)`` to ``(scope, pool size)``
+        self.scopes = {}
+
+        #: the import seconds of the composed modules
+        self.compose_timings = OrderedDict()
+
+        #: the composed modules required to import again, the module name to the url prefix
+        self.composed_modules = OrderedDict()
+
+        #: the source files of the composed packages
+        self.compose_sources = []
+
+        #: the directories of the composed packages
+        self.compose_packages = []
+
+        #: the compiled url rules, the url rule to the ``URLPatternManager.compile`` result
+        self.route_patterns = {}
+
+        #: the inventory manifest path restored from
+        self.restored_manifest = None
+
+        #: the handler and ui classes synthesized with the default base, the ``(class, base)`` to the class
+        self.synthesized_classes = {}
+
+        #: the muses registry of the mounted inventory
+        self.registry = muses.Registry()
+
+        #: the dependency graph of the things and mappers, the ``(genre, name)`` to the required keys
+        self.inventory_graph = {}
+
     def set_app_name(self, name):
         """Set application name"""
         self.app_name = name
@@ -133,13 +195,17 @@ class InventoryManager(object):
         self.app_ctx.error_page(status_code, callback)
 
     def load(self):
-        """Loads all inventory settings and create the anthem application"""
+        """Loads all inventory settings, activates the muses registry and create the anthem application"""
         self.load_boot()
+        muses.activate(self.registry)
         self.mount_model()
         self.mount_mapper()
         self.mount_thing()
         self.mount_chord()
         self.mount_menu()
+        workers = self.config.get("inventory_warmup")
+        if workers:
+            self.warmup(int(workers))
         return self.create_app()
 
     def load_boot(self):
@@ -147,12 +213,17 @@ class InventoryManager(object):
         # intialize console option parser
         if self.enable_cmd_parse:
             LOGGER.debug("Parsing console options")
-            console = cmd.Cmd('/etc/%s/app.conf' % (self.app_name))
+            console = cmd.Cmd('/etc/%s/app.conf' % (self.app_name), env_prefix=self.env_prefix)
             self.boots = [boot() for boot in self.boots]
             config = console.parse_cmd(self.app_name, self.boots)
             self.config.update(config)
+            self.watcher.add_file(console.config_file, console.file_config, console.config_includes)
+            # the reloaded file values don't override the environment variables and the command options
+            self.watcher.set_overrides(console.env_config, console.cli_config)
 
         self.boot_config()
+        # the config is read by the dotted keys on the hot path
+        self.config.compile()
         LOGGER.info("The application config: %s", self.config)
 
     def boot_config(self):
@@ -164,7 +235,8 @@ class InventoryManager(object):
 
     def config_from_file(self, path):
         """Loads config from file"""
-        config = cmd.config_from_file(path)
+        config, includes = cmd.load_config_file(path)
+        self.watcher.add_file(path, config, includes)
         self.config.update(config)
 
     def create_app(self):
@@ -172,7 +244,23 @@ class InventoryManager(object):
         LOGGER.debug("Creating app!")
         settings = self.initialize_app_settings()
         self.app_ctx.settings.update(settings)
-        return anthem.Application(self.app_ctx.routes, self.initilaize_app, **self.app_ctx.settings)
+        app = anthem.Application(self.app_ctx.routes, self.initilaize_app, **self.app_ctx.settings)
+        app.registry = self.registry
+
+        # reloads the changed config files, the interval is in seconds
+        interval = self.config.get("config_reload_interval")
+        if interval:
+            LOGGER.info("Watching the config files: %s", ", ".join(self.watcher.files))
+            self.watcher.start(app, interval, self.config)
+        return app
+
+    def watch(self, key, callback):
+        """Subscribes the config changes of the dotted key
+
+        The callback is called with the new and old values when the config files are reloaded,
+        see ``medoly.config.watcher``.
+        """
+        self.watcher.watch(key, callback)
 
     def initilaize_app(self, app):
         """Initilalze and setting application
@@ -193,7 +281,8 @@ class InventoryManager(object):
         for (code, func) in self.app_ctx.error_pages.items():
             app.error_page(code, func)
 
-        app.config = self.config
+        # the application reads the immutable snapshot, the boots have finished changing the config
+        app.config = self.config.snapshot()
 
     def initialize_app_settings(self):
         """Initialize the application settings
@@ -264,28 +353,156 @@ class InventoryManager(object):
 
         self.models[name] = model
 
-    def put_mapper(self, name, mapper):
-        """Adds a mapper"""
+    def put_mapper(self, name, mapper, scope=scopes.SINGLETON, pool_size=8):
+        """Adds a mapper
+
+        :param scope: the inventory scope, see ``medoly.kanon.scope``, defaults to ``singleton``
+        :param pool_size: the max idle instances of the ``pooled`` scope, defaults to 8
+        """
         LOGGER.debug("Puting mapper:{%s -> %r}", name, mapper)
         if name in self.mappers:
             raise InventoryExistError("Backend for ```{}`` exists.".format(name))
 
+        self._put_scope("mapper", name, scope, pool_size)
         self.mappers[name] = mapper
 
-    def put_thing(self, name, thing):
-        """Adds a thing"""
+    def put_thing(self, name, thing, scope=scopes.SINGLETON, pool_size=8):
+        """Adds a thing
+
+        :param scope: the inventory scope, see ``medoly.kanon.scope``, defaults to ``singleton``
+        :param pool_size: the max idle instances of the ``pooled`` scope, defaults to 8
+        """
         LOGGER.debug("Puting thing:{%s -> %r}", name, thing)
         if name in self.things:
             raise InventoryExistError("Thing for ```{}`` exists.".format(name))
 
+        self._put_scope("thing", name, scope, pool_size)
         self.things[name] = thing
 
+    def _put_scope(self, genre, name, scope, pool_size):
+        if scope not in scopes.SCOPES:
+            raise ValueError("Unknown inventory scope ``%s``" % (scope))
+        if scope != scopes.SINGLETON:
+            self.scopes[(genre, name)] = (scope, pool_size)
+
+    def create_inventory(self, genre, name, kclass):
+        """Creates the provider of the inventory class, the instances are created lazily
+
+        The melos declared by the class are recorded in the ``inventory_graph``.
+        """
+        key = (genre, name)
+        requires = self.inventory_graph.setdefault(key, set())
+        scope, pool_size = self.scopes.get(key, (scopes.SINGLETON, None))
+        for v in kclass.__dict__.itervalues():
+            if isinstance(v, Melos) and v.genre in ("thing", "mapper"):
+                requires.add((v.genre, v.name))
+                self.check_scope(key, scope, v)
+        return scopes.create_provider(scope, self.inventory_factory(key, kclass), pool_size)
+
+    def check_scope(self, key, scope, melos):
+        """Checks the inventory of the scope can inject the melos
+
+        Only the request and pooled scoped inventory releases the injected request or pooled scoped instances,
+        the singleton and thread scoped inventory, the chords and the ui modules can't hold them.
+
+        :param key: the inventory key, the ``(genre, name)`` tuple
+        :param scope: the inventory scope, ``None`` if the owner is not scoped inventory, like the ui modules
+        :param melos: the injected melos
+        :raises: ValueError
+        """
+        if scope in (scopes.REQUEST, scopes.POOLED):
+            return
+        required = self.scopes.get((melos.genre, melos.name), (scopes.SINGLETON, None))[0]
+        if required in (scopes.REQUEST, scopes.POOLED):
+            owner = "%s scoped " % scope if scope else ""
+            raise ValueError("The %s``%s:%s`` can't inject the %s scoped ``%s``" % (
+                owner, key[0], key[1], required, melos.inventory_name))
+
+    def check_melos(self, key, scope, kclass):
+        """Checks the class of the scope can inject its melos and the melos of its base classes
+
+        :param key: the owner key, the ``(genre, name)`` tuple
+        :param scope: the owner scope, see ``check_scope``
+        :param kclass: the owner class
+        :raises: ValueError
+        """
+        for cls in kclass.__mro__:
+            for v in cls.__dict__.itervalues():
+                if isinstance(v, Melos):
+                    self.check_scope(key, scope, v)
+
+    def inventory_factory(self, key, kclass):
+        """Returns the factory of the inventory class
+
+        The factory injects the melos of the class before the first instance is created, so the dependencies
+        are created firstly. The muses lookups in the constructor are recorded in the ``inventory_graph``.
+
+        :param key: the inventory key, the ``(genre, name)`` tuple
+        :param kclass: the inventory class
+        :raises: InventoryCycleError
+        """
+        prepared = []
+
+        def factory():
+            with scopes.resolving(key, self.inventory_graph), muses.use(self.registry):
+                if not prepared:
+                    self.load_melos(kclass)
+                    prepared.append(True)
+                return kclass()
+        return factory
+
+    def inventory_levels(self):
+        """Returns the inventory keys in the dependency order, the keys of a level only require the previous levels
+
+        :raises: InventoryCycleError
+        """
+        graph = dict((key, set(requires) & set(self.inventory_graph))
+                     for key, requires in self.inventory_graph.iteritems())
+        levels = []
+        while graph:
+            level = sorted(key for key, requires in graph.iteritems() if not requires)
+            if not level:
+                raise scopes.InventoryCycleError("Inventory dependency cycle in: %s" % (
+                    ", ".join("%s:%s" % key for key in sorted(graph))))
+            levels.append(level)
+            for key in level:
+                del graph[key]
+            for requires in graph.itervalues():
+                requires.difference_update(level)
+        return levels
+
+    def warmup(self, workers=1):
+        """Creates the singleton things and mappers before serving, level by level in the dependency order
+
+        The config ``inventory_warmup`` sets the workers when the manager is loaded, disables the warmup if empty.
+
+        :param workers: the threads creating the instances of a level in parallel, defaults to 1
+        :raises: InventoryCycleError
+        """
+        pool = ThreadPool(workers) if workers > 1 else None
+        try:
+            for level in self.inventory_levels():
+                providers = []
+                for genre, name in level:
+                    provider = (self.things if genre == "thing" else self.mappers).get(name)
+                    if isinstance(provider, scopes.SingletonProvider) and not provider.created:
+                        providers.append(provider)
+                if pool is not None and len(providers) > 1:
+                    pool.map(_provide, providers)
+                else:
+                    for provider in providers:
+                        provider.provide()
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
     def add_template_path(self, template_path):
         """Adds a template path in template manager"""
         LOGGER.debug("Adding template path: '%s'", template_path)
         self.template_manager.add_template_path(template_path)
 
-    def add_route(self, url_spec, handler=None, settings=None, name=None, render=None):
+    def add_route(self, url_spec, handler=None, settings=None, name=None, render=None, cache=None):
         """Adds a url route
 
         If  ``render`` is not ``None``, it will use the template render hanlder, else use the ``handler`` as request handler class.
@@ -300,55 +517,58 @@ class InventoryManager(object):
         :type name: string, optional
         :param render: the temaplate path for tempalte render handler, defaults to None
         :type render: string, optional
+        :param cache: the response cache options, see ``medoly.anthem.cache.create_cache``, defaults to None
         """
 
-        self.menus.append(Menu(self.compose_url_prefix + url_spec, handler, settings, name, render))
+        self.menus.append(Menu(self.compose_url_prefix + url_spec, handler, settings, name, render, cache))
 
     def mount_chord(self):
         """Register the melos for  the  chord class"""
 
         for chord_name in self.chords:
             chord, settings = self.chords.get(chord_name)
-            self.load_melos(chord)
             bean = settings.get('bean')
+            # the bean is a singleton, the chord class is never released
+            self.check_melos(("chord", chord_name), scopes.SINGLETON if bean else None, chord)
+            self.load_melos(chord)
             if bean:
                 self.chords[chord_name] = chord()
             else:
                 self.chords[chord_name] = chord
 
-        setattr(muses, "__chord", self.chords)
+        self.registry.chords._mount(self.chords)
 
     def mount_model(self):
         """Sets Model"""
-        setattr(muses, '__model', self.models)
+        self.registry.models._mount(self.models)
 
     def mount_mapper(self):
-        """Initialize and register the backend"""
+        """Registers the backend providers, the instances are created on the first resolution"""
         mappers = {}
         for mapper_name in self.mappers:
             mapper = self.mappers.get(mapper_name)
-            mappers[mapper_name] = mapper()
+            mappers[mapper_name] = self.create_inventory("mapper", mapper_name, mapper)
 
         self.mappers = mappers
-        setattr(muses, '__backend', mappers)
+        self.registry.mappers._mount(mappers)
 
     def mount_thing(self):
-        """Initialize and register  the thing"""
+        """Registers the thing providers, the instances are created on the first resolution"""
         things = {}
         for thing_name in self.things:
             thing = self.things.get(thing_name)
-            things[thing_name] = thing()
+            things[thing_name] = self.create_inventory("thing", thing_name, thing)
 
         self.things = things
-        setattr(muses, '__thing', things)
+        self.registry.things._mount(things)
 
     def mount_menu(self):
         """Initialize the url routes and handlers"""
         for menu in self.menus:
             self.connect(menu.url_spec, menu.handler,
-                         menu.settings, menu.name, menu.render)
+                         menu.settings, menu.name, menu.render, menu.cache)
 
-    def connect(self, url_spec, handler=None, settings=None, name=None, render=None):
+    def connect(self, url_spec, handler=None, settings=None, name=None, render=None, cache=None):
         """Adds a route
 
         If  ``render`` is not ``None``, it will use the template render hanlder, else use the ``handler`` as request handler class.
@@ -359,28 +579,55 @@ class InventoryManager(object):
         :param settings: the default intailize setting for handler, Optional.
         :param render: the render template path
         :type render: string, optional
+        :param cache: the response cache options, defaults to None
         :raises: ValueError
         """
-        # Preprocess url rule
-        url_spec = self.url_pattern_manager.url(url_spec)
+        # Preprocess url rule, the compiled rules may be restored from the inventory manifest
+        compiled = self.route_patterns.get(url_spec)
+        if compiled is None:
+            compiled = self.route_patterns[url_spec] = self.url_pattern_manager.compile(url_spec)
+        url_spec, segments, converters = self.url_pattern_manager.resolve(compiled)
         #: if render is ``true``,  it is a simple template request handler
         if render:
-            self.app_ctx.routes.append(anthem.url(url_spec, anthem.RenderHandler, dict(template=render), name))
+            handler = self.cached_handler(anthem.RenderHandler, cache)
+            self.add_url(url_spec, segments, converters, handler, dict(template=render), name)
             return
 
         if handler is None:
             raise ValueError("Handler is required, can't be empty")
 
-        # DI: mapper and thing
+        # DI: mapper and thing, injected in the plain handler class, shared by its synthesized classes
         self.load_melos(handler)
 
         #: check inhert handler class, if not, inject the default handler class
         if not issubclass(handler, RequestHandler):
-            classes = [self.defalut_handler] + get_class_bases(handler)
-            handler = type(handler.__name__, tuple(
-                classes), dict(handler.__dict__))
+            handler = synthesize_class(handler, self.defalut_handler, self.synthesized_classes)
+
+        handler = self.cached_handler(handler, cache)
+        self.add_url(url_spec, segments, converters, handler, settings, name)
 
-        self.app_ctx.routes.append(anthem.url(url_spec, handler, settings, name))
+    def cached_handler(self, handler, cache):
+        """Returns the handler subclass with the response cache, the shared handler class is not changed"""
+        if cache is None:
+            return handler
+        return type(handler.__name__, (handler,), dict(response_cache=create_cache(cache)))
+
+    def add_url(self, url_spec, segments, converters, handler, settings=None, name=None):
+        """Appends the url spec in the application context routes
+
+        :param url_spec: the url regex expression
+        :param segments: the path segments for the segment trie router, ``None`` if  only supports regex matching
+        :param converters: the ``(name, to_python)`` tuple of the typed path arguments
+        """
+        if converters and not issubclass(handler, TypedArgumentsMixin):
+            # keeps the converted path arguments in the plain tornado request handler
+            handler = type(handler.__name__, (TypedArgumentsMixin, handler), {})
+        spec = anthem.url(url_spec, handler, settings, name)
+        if converters:
+            spec.matcher = TypedPathMatches(spec.regex, converters)
+        if segments is not None:
+            spec.segments = segments
+        self.app_ctx.routes.append(spec)
 
     def load_melos(self, kclass):
         """Loads the inventory for the kclasss
@@ -395,16 +642,23 @@ class InventoryManager(object):
                 post_thing = Melos("Post")
 
         The  dependecy injection, it will load the relational inventory instacne by the  melos of class ,
-        and assign to the named class variable.
+        and assign to the named class variable. The melos of the base classes are assigned to the ``kclass``,
+        the base classes are not changed.
 
         """
-
-        attrs = kclass.__dict__
+        attrs = {}
+        for cls in reversed(kclass.__mro__):
+            attrs.update(cls.__dict__)
         for k, v in attrs.iteritems():
             if isinstance(v, Melos):
                 inventory = self._load_melos(v)
                 if not inventory:
                     raise ValueError("Can't found inventory for ``%s``." % (v.inventory_name))
+                if isinstance(inventory, scopes.SingletonProvider):
+                    inventory = inventory.provide()
+                elif isinstance(inventory, scopes.Provider):
+                    # resolves the scoped instance on access
+                    inventory = scopes.ScopedInventory(inventory)
                 setattr(kclass, k, inventory)
 
     def _load_melos(self, melos):
@@ -419,6 +673,10 @@ class InventoryManager(object):
             return self.chords.get(melos.name)
 
 
+def _provide(provider):
+    return provider.provide()
+
+
 class InventoryExistError(Exception):
     """Inventory not exist exception"""
     pass
@@ -437,15 +695,17 @@ class Menu(object):
     :type name: string, optional
     :param render: the temaplate path for tempalte render handler, defaults to None
     :type render: string, optional
+    :param cache: the response cache options, defaults to None
     """
 
-    def __init__(self, url_spec, handler=None, settings=None, name=None, render=None):
+    def __init__(self, url_spec, handler=None, settings=None, name=None, render=None, cache=None):
 
         self.url_spec = url_spec
         self.handler = handler
         self.settings = settings
         self.name = name
         self.render = render
+        self.cache = cache
 
 
 class URLPatternManager(object):
@@ -457,27 +717,46 @@ class URLPatternManager(object):
         class PostView(anthem.Handler):
 
             def get(self, post_id):
-                post_id = int(post_id)
+                # post_id is converted to int
                 self.jsonify({"post_id": post_id})
 
 
+    The typed rules ``int``, ``float``, ``uuid`` and ``date`` convert the path argument to
+    ``int``, ``float``, ``uuid.UUID`` and ``datetime.date`` value, the request with invalid value is not matched.
     """
 
     RULE_RE = re.compile(
         r"""\{([a-zA-Z_][a-zA-Z0-9_]*)(?::([a-zA-Z_][a-zA-Z0-9_]*|\(.*\)))?\}""")
     """The defaults url regex expresion rule"""
 
+    REGEX_CHARS_RE = re.compile(r"[.^$*+?()\[\]{}|\\]")
+    """The regex special chars, the segment contains them can't be matched as a static segment"""
+
     DEFAULT_PATTERNS = {
         'int': r'-?\d+',
         'any': r'[^/]+',
         'float': r'-?\d+\.\d+',
+        'uuid': r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}',
+        'date': r'\d{4}-\d{2}-\d{2}',
     }
     """The defaults url patterns"""
 
+    DEFAULT_CONVERTERS = {
+        'int': int,
+        'float': float,
+        'uuid': uuid.UUID,
+        'date': lambda v: datetime.strptime(v, "%Y-%m-%d").date(),
+    }
+    """The defaults path argument converters"""
+
     def __init__(self):
         self.patterns = self.DEFAULT_PATTERNS.copy()
+        #: the path argument converters
+        self.converters = {}
+        for name, pattern in self.patterns.items():
+            self.converters[name] = Converter(pattern, self.DEFAULT_CONVERTERS.get(name))
 
-    def add_pattern(self, name, pattern):
+    def add_pattern(self, name, pattern, to_python=None):
         """Adds a url pattern rule
 
         Example:
@@ -488,14 +767,18 @@ class URLPatternManager(object):
             >>> pattern_mgr.add_pattern("yymm", r"\d\d\d\d")
             >>> pattern_mgr.url("/{date:yyymm}")
             >>> ... "/(?P<date>\d\d\d\d)"
+            >>> pattern_mgr.add_pattern("yy", r"\d\d", int)
 
 
         :param name: the rule pattern name
         :type name: string
         :param pattern: the regex expression is used to converted.
         :type pattern: string
+        :param to_python: the callable converts the path argument to python value, raises ``ValueError``
+            if the value is invalid. Defaults to None, keeps the string value.
         """
         self.patterns[name] = pattern
+        self.converters[name] = Converter(pattern, to_python)
 
     def url(self, rule):
         """Converts to url regex express rule"""
@@ -523,6 +806,69 @@ class URLPatternManager(object):
 
         return pattern
 
+    def segments(self, rule):
+        """Splits the url rule to the path segments for the segment trie router
+
+        Example:
+
+        .. code-block:: python
+
+            >>> pattern_mgr  = URLPatternManager()
+            >>> pattern_mgr.segments("/post/{post_id:int}")
+            >>> ... ['', 'post', ('post_id', Converter('-?\\d+', int))]
+
+        The static segment is a string, the ``{name:type}`` segment is a ``(name, converter)`` tuple.
+        Returns ``None`` when the rule must be matched by regex,
+        such as the custom ``(...)`` pattern, raw regex expression or the rule in part of a segment.
+        """
+        return self.resolve(self.compile(rule))[1]
+
+    def url_converters(self, rule):
+        """Returns the ``(name, to_python)`` tuple of the typed path arguments in the url rule"""
+        return self.resolve(self.compile(rule))[2]
+
+    def compile(self, rule):
+        """Compiles the url rule to the json serializable ``[regex, segment rules, converter rules]``
+
+        The segment rule is the static segment string or the ``[name, rule name]`` list, the segment rules
+        are ``None`` if the rule must be matched by regex. The converter rule is the ``[name, rule name]`` list.
+        The compiled rule is resolved by ``resolve``.
+        """
+        segments = []
+        for part in rule.split('/'):
+            m = self.RULE_RE.match(part)
+            if m and m.end() == len(part):
+                label, rule_name = m.group(1), m.group(2) or 'any'
+                if rule_name not in self.converters:
+                    segments = None
+                    break
+                segments.append([label, rule_name])
+            elif self.REGEX_CHARS_RE.search(part):
+                segments = None
+                break
+            else:
+                segments.append(part)
+
+        converters = []
+        for m in self.RULE_RE.finditer(rule):
+            rule_name = m.group(2) or 'any'
+            converter = self.converters.get(rule_name)
+            if converter is not None and converter.to_python is not None:
+                converters.append([m.group(1), rule_name])
+        return [self.url(rule), segments, converters]
+
+    def resolve(self, compiled):
+        """Resolves the compiled url rule to the ``(regex, segments, converters)``
+
+        :raises: KeyError when the rule name isn't found
+        """
+        url, segments, converters = compiled
+        if segments is not None:
+            segments = [part if isinstance(part, basestring) else (part[0], self.converters[part[1]])
+                        for part in segments]
+        converters = tuple((label, self.converters[rule_name].to_python) for label, rule_name in converters)
+        return url, segments, converters
+
 
 class TempateMananger(object):
     """Template Mannager
@@ -593,8 +939,9 @@ class TempateMananger(object):
         ui_module_cls = self.template_engine.ui_module_cls
         for name, uicls in self.uis.items():
             if not issubclass(uicls, ui_module_cls):
-                classes = [ui_module_cls] + get_class_bases(uicls)
-                uicls = type(uicls.__name__, tuple(classes), dict(uicls.__dict__))
+                uicls = synthesize_class(uicls, ui_module_cls, mgr.synthesized_classes)
+            # the ui modules don't release the scoped instances
+            mgr.check_melos(("ui", name), None, uicls)
             mgr.load_melos(uicls)
             ui_container.put_ui(name, uicls)
         return ui_container
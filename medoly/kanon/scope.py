@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Inventory scopes
+--------------------
+
+The thing and mapper inventory is a singleton by default, the other scopes create the instances by the
+scope provider:
+
+* ``request``: a new instance for each request handler, closed when the request is finished.
+* ``thread``: an instance for each thread.
+* ``pooled``: an instance acquired from the pool for each request handler, returned to the pool when
+  the request is finished.
+
+The melos of the scoped inventory is injected as a ``ScopedInventory`` descriptor, the instance is created
+on the first access of the attribute. The instance closed or dropped from the pool is closed by its
+``close`` method if it has.
+
+Examples:
+
+.. code-block:: python
+
+    @kanon.bloom("mapper", scope="request")
+    class EntryMapper(object):
+
+        def __init__(self):
+            self.session = Session()
+
+        def close(self):
+            self.session.close()
+
+    @kanon.menu("/entry")
+    class EntryView(object):
+        entry_mapper = Melos("mapper:Entry")
+
+In the muses, the thread scoped inventory returns the instance of the current thread, the request and
+pooled scoped inventory returns a new instance, it's not closed.
+
+The singleton and thread scoped inventory outlives the requests, so its melos can't inject the request and
+pooled scoped inventory, the manager raises ``ValueError`` when mounting it. The request and pooled scoped
+inventory may inject them, they are released with the owner instance.
+
+The singleton inventory is provided by the ``SingletonProvider``, the instance is created on the first resolution
+by the melos or the muses, the inventory never used is not created. The inventory creation is tracked by
+``resolving``, the dependency cycle raises ``InventoryCycleError`` instead of a recursion error.
+"""
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from medoly.muses import InventoryProvider
+
+
+SINGLETON = "singleton"
+REQUEST = "request"
+THREAD = "thread"
+POOLED = "pooled"
+
+#: the inventory scopes
+SCOPES = (SINGLETON, REQUEST, THREAD, POOLED)
+
+
+_missing = object()
+
+#: the inventory keys resolving in the current thread
+_resolving = threading.local()
+
+
+class InventoryCycleError(Exception):
+    """The inventory dependency cycle exception"""
+    pass
+
+
+@contextmanager
+def resolving(key, graph=None):
+    """Tracks the inventory creation in the current thread
+
+    :param key: the inventory key, the ``(genre, name)`` tuple
+    :param graph: the dependency graph records the inventory as a dependency of the resolving one,
+        the inventory key to the required keys, defaults to None
+    :raises: InventoryCycleError if the inventory is resolving in the current thread
+    """
+    stack = getattr(_resolving, "stack", None)
+    if stack is None:
+        stack = _resolving.stack = []
+    if stack and graph is not None:
+        graph.setdefault(stack[-1], set()).add(key)
+    if key in stack:
+        chain = stack[stack.index(key):] + [key]
+        raise InventoryCycleError("Inventory dependency cycle: %s" % (" -> ".join("%s:%s" % k for k in chain)))
+    stack.append(key)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+def _close(instance):
+    close = getattr(instance, "close", None)
+    if close is not None:
+        close()
+
+
+def release_scoped(owner):
+    """Releases the request and pooled scoped instances injected in the owner instance"""
+    scoped = getattr(owner, "_scoped_instances", None)
+    if scoped:
+        owner._scoped_instances = None
+        for provider, instance in scoped.itervalues():
+            provider.release(instance)
+
+
+class Provider(InventoryProvider):
+    """Base scoped inventory provider
+
+    :param factory: the inventory class
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    def provide(self):
+        """Returns an instance for the muses"""
+        return self.factory()
+
+    def get(self, owner):
+        """Returns the instance for the owner injected the inventory"""
+        raise NotImplementedError
+
+    def release(self, instance):
+        """Releases the instance when the request is finished"""
+        release_scoped(instance)
+        _close(instance)
+
+
+class SingletonProvider(Provider):
+    """Lazy singleton inventory provider, the instance is created once on the first resolution"""
+
+    cacheable = True
+
+    def __init__(self, factory):
+        super(SingletonProvider, self).__init__(factory)
+        self._instance = _missing
+        self._lock = threading.RLock()
+
+    @property
+    def created(self):
+        """Returns ``True`` if the instance is created"""
+        return self._instance is not _missing
+
+    def provide(self):
+        instance = self._instance
+        if instance is _missing:
+            with self._lock:
+                if self._instance is _missing:
+                    self._instance = self.factory()
+                instance = self._instance
+        return instance
+
+    def get(self, owner):
+        return self.provide()
+
+    def release(self, instance):
+        """The singleton instance is never released"""
+        pass
+
+
+class ThreadProvider(Provider):
+    """Thread scoped inventory provider"""
+
+    def __init__(self, factory):
+        super(ThreadProvider, self).__init__(factory)
+        self._local = threading.local()
+
+    def provide(self):
+        try:
+            return self._local.instance
+        except AttributeError:
+            instance = self._local.instance = self.factory()
+            return instance
+
+    def get(self, owner):
+        return self.provide()
+
+
+class RequestProvider(Provider):
+    """Request scoped inventory provider, the instance is stored in the ``_scoped_instances`` of the owner"""
+
+    def get(self, owner):
+        scoped = getattr(owner, "_scoped_instances", None)
+        if scoped is None:
+            scoped = owner._scoped_instances = {}
+        try:
+            return scoped[self][1]
+        except KeyError:
+            instance = self.acquire()
+            scoped[self] = (self, instance)
+            return instance
+
+    def acquire(self):
+        """Creates the instance"""
+        return self.factory()
+
+
+class PooledProvider(RequestProvider):
+    """Pooled inventory provider
+
+    :param factory: the inventory class
+    :param size: the max idle instances in the pool, defaults to 8
+    """
+
+    def __init__(self, factory, size=8):
+        super(PooledProvider, self).__init__(factory)
+        self.size = size
+        self.pool = deque()
+
+    def acquire(self):
+        """Acquires an idle instance from the pool, creates a new instance if the pool is empty"""
+        try:
+            return self.pool.pop()
+        except IndexError:
+            return self.factory()
+
+    def release(self, instance):
+        release_scoped(instance)
+        if len(self.pool) < self.size:
+            self.pool.append(instance)
+        else:
+            _close(instance)
+
+
+def create_provider(scope, factory, pool_size=8):
+    """Creates the inventory provider of the scope
+
+    :param scope: the scope name
+    :param factory: the inventory class
+    :param pool_size: the max idle instances of the ``pooled`` scope, defaults to 8
+    :raises: ValueError
+    """
+    if scope == SINGLETON:
+        return SingletonProvider(factory)
+    if scope == REQUEST:
+        return RequestProvider(factory)
+    if scope == THREAD:
+        return ThreadProvider(factory)
+    if scope == POOLED:
+        return PooledProvider(factory, pool_size)
+    raise ValueError("Unknown inventory scope ``%s``" % (scope))
+
+
+class ScopedInventory(object):
+    """The descriptor injects the scoped inventory instance
+
+    :param provider: the scoped inventory provider
+    """
+
+    __slots__ = ("provider",)
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def __get__(self, owner, owner_class=None):
+        if owner is None:
+            return self
+        return self.provider.get(owner)
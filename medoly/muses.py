@@ -14,7 +14,217 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-"""Muses is the medoly global namespace contains all the dependecy injection objects"""
+
+"""Muses is the medoly global namespace contains all the dependecy injection objects
+
+Each inventory manager mounts its inventory in its own ``Registry``, the loaded manager activates its registry
+as the default one. The ``things``, ``mappers``, ``models`` and ``chords`` namespaces get the inventory by attribute,
+the resolved singleton is cached in the registry namespace until the inventory is mounted again. The namespaces and
+the ``Thing``, ``Backend``, ``Model`` and ``Chord`` functions resolve the registry used in the current thread,
+the inventory constructors use the registry of their manager and the anthem application handles its requests
+under the registry of its manager.
+
+Examples:
+
+.. code-block:: python
+
+    from medoly import muses
+
+    muses.things.Entry
+    muses.Thing("Entry")
+
+    # resolves the inventory of another manager in the current thread
+    with muses.use(admin_manager.registry):
+        muses.Backend("User")
+"""
+
+import threading
+from contextlib import contextmanager
+
+_missing = object()
+
+
+class InventoryProvider(object):
+    """The provider of the scoped inventory, see ``medoly.kanon.scope``"""
+
+    #: ``True`` if the provided instance is never changed, it's cached by the ``Inventories``
+    cacheable = False
+
+    def provide(self):
+        """Returns the inventory instance"""
+        raise NotImplementedError
+
+
+def _resolve(inventory):
+    if isinstance(inventory, InventoryProvider):
+        return inventory.provide()
+    return inventory
+
+
+class Inventories(object):
+    """The inventory namespace of a genre, gets the inventory by attribute or item
+
+    The resolved cacheable inventory is stored as an attribute, the next lookup is a plain attribute access.
+
+    :param genre: the inventory genre, eg: ``thing``, ``mapper``
+    """
+
+    #: the instance dict only contains the cached inventory
+    __slots__ = ("_genre", "_inventories", "__dict__")
+
+    def __init__(self, genre):
+        self._genre = genre
+        self._inventories = {}
+
+    def _mount(self, inventories):
+        """Replaces the inventory, the cached inventory is invalidated"""
+        self._invalidate()
+        self._inventories = inventories
+
+    def _invalidate(self, key=None):
+        """Drops the cached inventory of the key, drops all if the key is ``None``"""
+        if key is None:
+            self.__dict__.clear()
+        else:
+            self.__dict__.pop(key, None)
+
+    def _get(self, key, default=None):
+        """Gets the resolved inventory, returns the default if not found"""
+        value = self.__dict__.get(key, _missing)
+        if value is not _missing:
+            return value
+        inventory = self._inventories.get(key, _missing)
+        if inventory is _missing:
+            return default
+        value = _resolve(inventory)
+        if not isinstance(inventory, InventoryProvider) or inventory.cacheable:
+            self.__dict__[key] = value
+        return value
+
+    def __getattr__(self, key):
+        if key.startswith("_"):
+            raise AttributeError(key)
+        value = self._get(key, _missing)
+        if value is _missing:
+            raise AttributeError("Can't found the %s inventory ``%s``" % (self._genre, key))
+        return value
+
+    def __getitem__(self, key):
+        value = self._get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, inventory):
+        self._inventories[key] = inventory
+        self._invalidate(key)
+
+    def __delitem__(self, key):
+        del self._inventories[key]
+        self._invalidate(key)
+
+    def __contains__(self, key):
+        return key in self._inventories
+
+    def __iter__(self):
+        return iter(self._inventories)
+
+    def __len__(self):
+        return len(self._inventories)
+
+
+class Registry(object):
+    """The inventory registry of an inventory manager"""
+
+    def __init__(self):
+        #: the things
+        self.things = Inventories("thing")
+        #: the data-mapping layer backends
+        self.mappers = Inventories("mapper")
+        #: the model classes
+        self.models = Inventories("model")
+        #: the chords
+        self.chords = Inventories("chord")
+
+
+class _CurrentInventories(object):
+    """The inventory namespace of a genre in the registry used in the current thread, see ``current``
+
+    :param genre: the registry namespace name, eg: ``things``, ``mappers``
+    """
+
+    __slots__ = ("_genre",)
+
+    def __init__(self, genre):
+        self._genre = genre
+
+    def _get(self, key, default=None):
+        return getattr(current(), self._genre)._get(key, default)
+
+    def __getattr__(self, key):
+        return getattr(getattr(current(), self._genre), key)
+
+    def __getitem__(self, key):
+        return getattr(current(), self._genre)[key]
+
+    def __contains__(self, key):
+        return key in getattr(current(), self._genre)
+
+    def __iter__(self):
+        return iter(getattr(current(), self._genre))
+
+    def __len__(self):
+        return len(getattr(current(), self._genre))
+
+
+class _Local(threading.local):
+    registry = None
+
+_local = _Local()
+
+#: the count of the ``use`` contexts, the thread local registry is only looked up when it's not zero
+_using = 0
+
+#: the lock of the ``_using`` count
+_using_lock = threading.Lock()
+
+#: the default registry, activated by the loaded inventory manager
+registry = Registry()
+
+#: the inventory namespaces of the registry used in the current thread
+things = _CurrentInventories("things")
+mappers = _CurrentInventories("mappers")
+models = _CurrentInventories("models")
+chords = _CurrentInventories("chords")
+
+
+def activate(default_registry):
+    """Sets the default registry, it's used out of the ``use`` contexts"""
+    global registry
+    registry = default_registry
+
+
+def current():
+    """Returns the registry of the current thread, defaults to the default registry"""
+    if _using:
+        return _local.registry or registry
+    return registry
+
+
+@contextmanager
+def use(thread_registry):
+    """Uses the registry in the current thread in the context"""
+    global _using
+    previous = _local.registry
+    _local.registry = thread_registry
+    with _using_lock:
+        _using += 1
+    try:
+        yield thread_registry
+    finally:
+        with _using_lock:
+            _using -= 1
+        _local.registry = previous
 
 
 def Backend(key):
@@ -26,7 +236,7 @@ def Backend(key):
     Returns:
             backend  instacne
     """
-    return __backend.get(key)
+    return (_local.registry or registry if _using else registry).mappers._get(key)
 
 
 def Thing(key):
@@ -38,7 +248,7 @@ def Thing(key):
     Returns:
             thing instacne
      """
-    return __thing.get(key)
+    return (_local.registry or registry if _using else registry).things._get(key)
 
 
 def Model(key):
@@ -50,7 +260,7 @@ def Model(key):
     Returns:
             model instacne
     """
-    return __model.get(key)
+    return (_local.registry or registry if _using else registry).models._get(key)
 
 
 def Chord(key):
@@ -62,4 +272,4 @@ def Chord(key):
     Returns:
             chord instacne
     """
-    return __chord.get(key)
+    return (_local.registry or registry if _using else registry).chords._get(key)
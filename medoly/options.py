@@ -36,10 +36,14 @@ system comand-line options.
     config = argsopt.parse_args()
 
 """
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace, SUPPRESS
 import sys
 
 
+#: the placeholder of the options not given in the command line
+_NOT_GIVEN = object()
+
+
 class Options(object):
     """Command-line options parser
 
@@ -78,6 +82,14 @@ class Options(object):
         """Returns the add_argument"""
         return self.argparser.add_argument
 
+    def actions(self):
+        """Returns the defined option actions"""
+        return list(self.argparser._actions)
+
+    def dests(self):
+        """Returns the destination names of the defined options"""
+        return [action.dest for action in self.argparser._actions]
+
     def parse_args(self, args=None):
         """Pareses know command options, and returns the options result
 
@@ -89,6 +101,42 @@ class Options(object):
         opt, _ = self.argparser.parse_known_args(args)
         return opt
 
+    def given_args(self, args=None):
+        """Returns the options given in the command line without the defaults, the destination to value dict
+
+        :param list args: the comannd option list conifg.
+            Defaults to handle the sytem comand options in sys.argv.
+        """
+        args = args if args is not None else self.args
+        # the parser doesn't set the default when the namespace has the destination
+        namespace = Namespace(**dict((dest, _NOT_GIVEN) for dest in self.dests()))
+        opt, _ = self.argparser.parse_known_args(args, namespace)
+        return dict((k, v) for k, v in vars(opt).iteritems() if v is not _NOT_GIVEN)
+
+    def namespace(self, given=None):
+        """Returns the options result of the given options, the others are set to their defaults
+
+        Builds the ``parse_args`` result from the ``given_args`` without parsing the command line again.
+
+        :param dict given: the given options, the destination to value dict, defaults to None
+        """
+        given = given or {}
+        opt = Namespace()
+        for action in self.argparser._actions:
+            dest = action.dest
+            if dest in given:
+                setattr(opt, dest, given[dest])
+            elif not hasattr(opt, dest) and action.default is not SUPPRESS:
+                value = action.default
+                # the parser converts the string defaults by the option type
+                if isinstance(value, basestring):
+                    value = self.argparser._get_value(action, value)
+                setattr(opt, dest, value)
+        for dest, value in self.argparser._defaults.iteritems():
+            if not hasattr(opt, dest):
+                setattr(opt, dest, value)
+        return opt
+
 
 class GroupOptions(object):
     """Command-line group config options"""
@@ -133,9 +181,29 @@ def set_defaults(**c):
     __options.set_defaults(**c)
 
 
+def actions():
+    """Returns the defined option actions in module options instnace"""
+    return __options.actions()
+
+
+def dests():
+    """Returns the destination names of the defined options in module options instnace"""
+    return __options.dests()
+
+
 def parse_args(args=None):
     """Pareses command options in module options instnace
 
     Returns the options result.
     """
     return __options.parse_args(args)
+
+
+def given_args(args=None):
+    """Returns the options given in the command line in module options instnace"""
+    return __options.given_args(args)
+
+
+def namespace(given=None):
+    """Returns the options result of the given options in module options instnace"""
+    return __options.namespace(given)
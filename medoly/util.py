@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import types
 
 class lazy_attr(object):
     """Lazy property
@@ -50,6 +51,34 @@ def get_class_bases(klass):
         return list(bases)
 
 
+def synthesize_class(kclass, base, cache=None):
+    """Returns the subclass of the ``kclass`` and the ``base`` class
+
+    The MRO is ``(kclass, base)``: the ``kclass`` and its own bases come before the ``base``, so a mixin base
+    of the ``kclass`` overrides the ``base`` methods too. This function doesn't change the ``kclass``, the
+    attributes set on the synthesized class don't leak to the other synthesized classes. But the attributes
+    set on the ``kclass``, like the inventory injected by ``InventoryManager.connect`` before synthesizing the
+    handler, are shared by all its synthesized classes. Falls back to copying the ``kclass`` attributes on the
+    ``(base, kclass bases)`` class if the MRO can't be created.
+
+    :param kclass: the plain class
+    :param base: the base class
+    :param cache: the dict caches the synthesized class by the ``(kclass, base)``, defaults to None
+    """
+    key = (kclass, base)
+    if cache is not None and key in cache:
+        return cache[key]
+    try:
+        cls = type(kclass.__name__, (kclass, base), {"__module__": kclass.__module__, "__doc__": kclass.__doc__})
+    except TypeError:
+        attrs = dict((k, v) for k, v in kclass.__dict__.iteritems()
+                     if k not in ("__dict__", "__weakref__") and not isinstance(v, types.MemberDescriptorType))
+        cls = type(kclass.__name__, tuple([base] + get_class_bases(kclass)), attrs)
+    if cache is not None:
+        cache[key] = cls
+    return cls
+
+
 def with_metaclass(meta, bases=(object,)):
     """Mete class"""
     return meta("NewBase", bases, {})
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from tornado.testing import AsyncHTTPTestCase
+
+from medoly import anthem
+from medoly.anthem.cache import MemoryStore, DiskStore, CachedResponse, ResponseCache, create_cache
+
+
+class MemoryStoreTest(unittest.TestCase):
+
+    def response(self, body, ttl=60):
+        return CachedResponse([], body, None, time.time() + ttl)
+
+    def test_lru(self):
+        store = MemoryStore(2)
+        store.put("a", self.response(b"a"))
+        store.put("b", self.response(b"b"))
+        store.get("a")
+        store.put("c", self.response(b"c"))
+        self.assertEqual(store.get("a").body, b"a")
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(len(store), 2)
+
+    def test_expired(self):
+        store = MemoryStore()
+        store.put("a", self.response(b"a", ttl=-1))
+        self.assertIsNone(store.get("a"))
+        self.assertEqual(len(store), 0)
+
+
+class DiskStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_put_get(self):
+        store = DiskStore(self.path)
+        headers = [("Content-Type", "text/plain")]
+        store.put(("/", ""), CachedResponse(headers, b"hello\nworld", '"etag"', time.time() + 60))
+        response = store.get(("/", ""))
+        self.assertEqual(response.body, b"hello\nworld")
+        self.assertEqual(response.headers, headers)
+        self.assertEqual(response.etag, '"etag"')
+        self.assertIsNone(store.get(("/", "a=1")))
+
+        store.put(("/", ""), CachedResponse(headers, b"", None, time.time() - 1))
+        self.assertIsNone(store.get(("/", "")))
+        # the expired file is removed
+        self.assertEqual(os.listdir(self.path), [])
+        store.clear()
+        self.assertIsNone(store.get(("/", "")))
+
+    def test_evict(self):
+        store = DiskStore(self.path, 400)
+        now = time.time()
+        store.put("expired", CachedResponse([], b"", None, now - 1))
+        for i, ttl in enumerate((30, 10, 20)):
+            store.put(i, CachedResponse([], b"x" * 100, None, now + ttl))
+        # the expired file and the file expiring first are evicted
+        self.assertIsNone(store.get(1))
+        self.assertEqual(store.get(0).body, b"x" * 100)
+        self.assertEqual(store.get(2).body, b"x" * 100)
+        self.assertEqual(len(os.listdir(self.path)), 2)
+        self.assertTrue(store.size <= 400)
+        # counts the files of the other processes
+        self.assertEqual(DiskStore(self.path, 400).size, store.size)
+
+    def test_corrupt(self):
+        store = DiskStore(self.path)
+        for data in (b"no newline", b"{not json\nbody", b"{}\nbody"):
+            with open(store._file("k"), "wb") as f:
+                f.write(data)
+            self.assertIsNone(store.get("k"))
+
+    def test_cache_tier(self):
+        cache = ResponseCache(disk_path=self.path)
+        cache.put("k", [], b"body", None)
+        cache.memory.clear()
+        self.assertEqual(cache.get("k").body, b"body")
+        self.assertEqual(len(cache.memory), 1)
+
+    def test_create_cache(self):
+        cache = ResponseCache()
+        self.assertIs(create_cache(cache), cache)
+        self.assertEqual(create_cache(dict(ttl=10, vary=["Accept"])).vary, ("Accept",))
+        self.assertEqual(create_cache(30).ttl, 30)
+
+
+class CachedHandlerTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.calls = []
+        calls = self.calls
+
+        @anthem.cached(ttl=60, vary=["Accept-Language"])
+        class Index(anthem.Handler):
+
+            def get(self):
+                calls.append(self.request.uri)
+                self.set_header("X-Entry", "1")
+                self.write("entry %d" % len(calls))
+
+        @anthem.cached(ttl=60)
+        class Missing(anthem.Handler):
+
+            def get(self):
+                calls.append(self.request.uri)
+                self.set_status(404)
+                self.write("missing")
+
+        @anthem.cached(ttl=60)
+        class Api(anthem.Handler):
+
+            def get(self):
+                calls.append(self.request.uri)
+                self.jsonify({"entry": len(calls)})
+
+            def head(self):
+                calls.append(self.request.uri)
+
+        @anthem.cached(ttl=60)
+        class Profile(anthem.Handler):
+
+            def get_current_user(self):
+                return self.get_argument("user", None)
+
+            def get(self):
+                calls.append(self.request.uri)
+                self.write("user %s" % self.current_user)
+
+        @anthem.cached(ttl=60)
+        class Theme(anthem.Handler):
+
+            def get(self):
+                calls.append(self.request.uri)
+                self.write("theme %s" % self.get_cookie("theme"))
+
+        return anthem.Application([("/", Index), ("/missing", Missing), ("/api", Api), ("/profile", Profile),
+                                   ("/theme", Theme)], lambda app: None)
+
+    def test_cache_hit(self):
+        first = self.fetch("/")
+        second = self.fetch("/")
+        self.assertEqual(second.body, first.body)
+        self.assertEqual(second.headers["X-Entry"], "1")
+        self.assertEqual(second.headers["Etag"], first.headers["Etag"])
+        self.assertEqual(self.calls, ["/"])
+
+        self.fetch("/?page=2")
+        self.fetch("/", headers={"Accept-Language": "zh-CN"})
+        self.assertEqual(len(self.calls), 3)
+        self.fetch("/", headers={"Host": "example.com"})
+        self.assertEqual(len(self.calls), 4)
+
+    def test_not_modified(self):
+        etag = self.fetch("/").headers["Etag"]
+        response = self.fetch("/", headers={"If-None-Match": etag})
+        self.assertEqual(response.code, 304)
+        self.assertEqual(self.calls, ["/"])
+
+    def test_not_cached(self):
+        self.fetch("/missing")
+        self.fetch("/missing")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_head(self):
+        self.fetch("/api", method="HEAD")
+        response = self.fetch("/api")
+        self.assertEqual(response.body, b'{"entry": 2}')
+        # the HEAD request is served by the cached GET response
+        self.fetch("/api", method="HEAD")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_content_type(self):
+        first = self.fetch("/api")
+        second = self.fetch("/api")
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(second.headers["Content-Type"], first.headers["Content-Type"])
+        self.assertTrue(second.headers["Content-Type"].startswith("application/json"))
+
+    def test_user_dependent(self):
+        self.fetch("/profile?user=a")
+        self.fetch("/profile?user=a")
+        self.fetch("/theme", headers={"Cookie": "theme=dark"})
+        self.assertEqual(self.fetch("/theme").body, b"theme None")
+        self.assertEqual(len(self.calls), 4)
@@ -14,12 +14,48 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-from medoly import cmd
+from medoly import cmd, options
+import argparse
+from medoly.config import SelectConfig
+import os
+import shutil
+import sys
+import tempfile
 import unittest
 
 from util import conf_path, yaml_conf
 
 
+class EnvConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        opt = options.Options(None)
+        opt.define('--sqlalchemy.pool_size', type=int, default=5)
+        opt.define('--debug', action='store_true', default=False)
+        opt.define('--hosts', nargs='+')
+        self.env = cmd.EnvConfig("APP_", opt.actions())
+
+    def test_load(self):
+        environ = {"APP_SQLALCHEMY__POOL_SIZE": "20", "APP_DEBUG": "yes", "APP_HOSTS": "a,b",
+                   "APP_CACHE__TTL": "1.5", "APP_NAME": "demo", "OTHER": "1"}
+        config = self.env.load(SelectConfig({"cache": {"ttl": 1.0}}), environ)
+        self.assertEqual(config.get("sqlalchemy.pool_size"), 20)
+        self.assertIs(config.get("debug"), True)
+        self.assertEqual(config.get("hosts"), ["a", "b"])
+        self.assertEqual(config.get("cache.ttl"), 1.5)
+        self.assertEqual(config.get("name"), "demo")
+        self.assertNotIn("other", config)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, self.env.load, None, {"APP_SQLALCHEMY__POOL_SIZE": "many"})
+
+
+class Debug(object):
+
+    def config(self, opt):
+        opt.define('--debug', action='store_true', default=False)
+
+
 class CmdTest(unittest.TestCase):
 
     def test_get_file_opt(self):
@@ -42,7 +78,107 @@ class CmdTest(unittest.TestCase):
         config = c.parse_cmd("test", [])
         self.assertEqual(config.get("server.port"), 8880)
 
+    def test_parse_cmd_once(self):
+        calls = []
+
+        class Boot(object):
+
+            def config(self, opt):
+                calls.append(opt)
+                opt.define('--server.port', type=int, default=80)
+                opt.define('--server.host', default='localhost')
+
+        argv = sys.argv
+        sys.argv = ["app", "--server.host", "example.com"]
+        try:
+            c = cmd.Cmd(conf_path)
+            config = c.parse_cmd("test", [Boot()])
+        finally:
+            sys.argv = argv
+        self.assertEqual(len(calls), 1)
+        # the file config overrides the defaults, the command options override the file config
+        self.assertEqual(config.get("server.port"), 8880)
+        self.assertEqual(config.get("server.host"), "example.com")
+        self.assertEqual(list(c.timings), ["options", "file", "env", "parse", "merge"])
+
+    def test_parse_cmd_env(self):
+
+        class Boot(object):
+
+            def config(self, opt):
+                opt.define('--server.port', type=int, default=80)
+                opt.define('--debug', action='store_true', default=False)
+
+        argv, environ = sys.argv, dict(os.environ)
+        sys.argv = ["app", "--server.port", "9000"]
+        os.environ.update(MEDOLY_SERVER__PORT="8000", MEDOLY_DEBUG="on", MEDOLY_SERVER__HOST="example.com")
+        try:
+            c = cmd.Cmd(conf_path, env_prefix="MEDOLY_")
+            config = c.parse_cmd("test", [Boot()])
+        finally:
+            sys.argv = argv
+            os.environ.clear()
+            os.environ.update(environ)
+        self.assertEqual(config.get("server.port"), 9000)
+        self.assertEqual(config.get("server.host"), "example.com")
+        self.assertIs(config.get("debug"), True)
+        # only the given command options without the defaults
+        self.assertEqual(c.cli_config.config(), {"server": {"port": 9000}})
+
+    def test_parse_cmd_argv_once(self):
+        calls = []
+        parse_known_args = argparse.ArgumentParser.parse_known_args
+
+        def parse(parser, *args, **kw):
+            calls.append(args)
+            return parse_known_args(parser, *args, **kw)
+
+        argv = sys.argv
+        sys.argv = ["app", "-c", yaml_conf, "--debug"]
+        argparse.ArgumentParser.parse_known_args = parse
+        try:
+            c = cmd.Cmd("not_found")
+            config = c.parse_cmd("test", [Debug()])
+        finally:
+            sys.argv = argv
+            argparse.ArgumentParser.parse_known_args = parse_known_args
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(c.config_file, yaml_conf)
+        self.assertEqual(config.get("server.port"), 8880)
+        self.assertIs(config.get("debug"), True)
+        self.assertNotIn("config", config)
+        self.assertEqual(c.cli_config.config(), {"debug": True})
+
     def test_yaml_parse_cmd(self):
         c = cmd.Cmd(yaml_conf)
         config = c.parse_cmd("test", [])
         self.assertEqual(config.get("server.port"), 8880)
+
+    def test_config_from_file_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            for path in (conf_path, yaml_conf):
+                config = cmd.config_from_file(path, True, cache_dir)
+                self.assertEqual(config.get("server.port"), 8880)
+                config = cmd.config_from_file(path, True, cache_dir)
+                self.assertEqual(config.get("server.port"), 8880)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_config_from_file_cache_include(self):
+        path = tempfile.mkdtemp()
+        try:
+            conf, base = os.path.join(path, "app.conf"), os.path.join(path, "base.conf")
+            with open(conf, "w") as f:
+                f.write('include "base.conf"\nserver.port = 80\n')
+            with open(base, "w") as f:
+                f.write("db.pool = 5\n")
+            self.assertEqual(cmd.config_from_file(conf, True).get("db.pool"), 5)
+            # the changed include file makes the cache stale
+            with open(base, "w") as f:
+                f.write("db.pool = 50\n")
+            config = cmd.config_from_file(conf, True)
+            self.assertEqual(config.get(), {"db": {"pool": 50}, "server": {"port": 80}})
+        finally:
+            shutil.rmtree(path)
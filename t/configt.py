@@ -15,10 +15,16 @@
 # under the License.
 
 
-from medoly.config import ConfigFactory, SelectConfig
+from medoly.config import ConfigFactory, SelectConfig, ConfigSnapshot
+from medoly.config.cache import ConfigCache
+from medoly.config.hocon import FileIncluder, HoconLiteral
+from medoly.config.errors import HoconParserException
 from util import conf_path
 
 
+import os
+import shutil
+import tempfile
 import unittest
 
 
@@ -32,6 +38,13 @@ class ConfigTest(unittest.TestCase):
                          "port": 8880, "host": "localhost"})
         self.assertEqual(config.get("server.port1"), None)
 
+    def test_pystyle_get(self):
+        config = ConfigFactory.parse("server { port = 80, hosts = [a, b] }", pystyle=True)
+        self.assertEqual(config.get("server.port"), 80)
+        config.get("server")["port"] = 81
+        config.get("server.hosts").append("c")
+        self.assertEqual(config.get("server"), {"port": 80, "hosts": ["a", "b"]})
+
     def test_get_list(self):
         conf = """list = [1,66]"""
         config = ConfigFactory.parse(conf)
@@ -53,6 +66,147 @@ class ConfigTest(unittest.TestCase):
         self.assertEqual(config.get_float("f"), 1.25)
 
 
+class HoconTokenizerTest(unittest.TestCase):
+
+    def parse(self, text):
+        return ConfigFactory.parse(text, pystyle=True).to_dict()
+
+    def test_comments(self):
+        self.assertEqual(self.parse("# head\r\na = 1 // tail\nb = a/b // c"), {"a": 1, "b": "a/b"})
+
+    def test_unquoted_key(self):
+        self.assertEqual(self.parse("include_dir = 1\nserver name = 2"), {"include_dir": 1, "server name": 2})
+
+    def test_quoted_text(self):
+        self.assertEqual(self.parse('"key" = "a b"\nc = """x\n"y""""'), {"key": "a b", "c": 'x\n"y"'})
+
+    def test_unicode(self):
+        self.assertEqual(self.parse(u"a = \u00e9\u00e8"), {u"a": u"\u00e9\u00e8"})
+
+    def test_override_object(self):
+        self.assertEqual(self.parse("a { x = 1 }\na = [1, 2]"), {"a": [1, 2]})
+        self.assertEqual(self.parse("a { x = 1 }\na = 3"), {"a": 3})
+        self.assertEqual(self.parse("a { x = 1 }\na = { y = 2 }"), {"a": {"x": 1, "y": 2}})
+
+
+class HoconValueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.config = ConfigFactory.parse("a { ports = [1, 2], flags = [on, false], ratio = 0.5 }\nb = ${a.ports}")
+
+    def test_typed_getters(self):
+        self.assertEqual(self.config.get_int_list("a.ports"), [1, 2])
+        self.assertEqual(self.config.get_bool_list("a.flags"), [True, False])
+        self.assertEqual(self.config.get_float("a.ratio"), 0.5)
+        self.assertEqual(self.config.get_int_list("b"), [1, 2])
+        self.assertTrue(self.config.get_value("a.ports").is_array())
+        self.assertFalse(self.config.get_value("a.ratio").is_array())
+
+    def test_sealed_cache(self):
+        value = self.config.get_value("a.ports")
+        ports = value.get_int_list()
+        ports.append(3)
+        # the cached list is not shared
+        self.assertEqual(value.get_int_list(), [1, 2])
+        value.get_array().pop()
+        self.assertEqual(len(value.get_array()), 2)
+        value.append_value(HoconLiteral("3"))
+        self.assertEqual(value.get_int_list(), [1, 2])
+        self.assertFalse(value.is_string())
+
+
+class ConfigCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.conf = os.path.join(self.path, "app.conf")
+        self.write("port = 8880")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write(self, content):
+        with open(self.conf, "w") as f:
+            f.write(content)
+
+    def test_parse_file_cache(self):
+        config = ConfigFactory.parse_file(self.conf, True, cache=True)
+        self.assertEqual(config.get("port"), 8880)
+        cache = ConfigCache()
+        self.assertTrue(os.path.exists(cache.cache_path(self.conf, "pyhocon")))
+        self.assertEqual(cache.load(self.conf, "pyhocon").value.get(), {"port": 8880})
+        self.assertEqual(ConfigFactory.parse_file(self.conf, True, cache=True).get("port"), 8880)
+        self.assertEqual(ConfigFactory.parse_file(self.conf, cache=True).get_int("port"), 8880)
+
+    def test_stale_cache(self):
+        cache = ConfigCache(os.path.join(self.path, "cache"))
+        cache.store(self.conf, "hocon", {"port": 1}, cache.signature([self.conf]))
+        self.assertEqual(cache.load(self.conf, "hocon"), {"port": 1})
+        self.assertIsNone(cache.load(self.conf, "yaml"))
+
+        self.write("port = 18880")
+        self.assertIsNone(cache.load(self.conf, "hocon"))
+
+
+class IncludeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.path, "region"))
+        self.write("base.conf", "server { host = base, port = 80 }\nname = base")
+        self.write("region/region.conf", 'include "../base.conf"\nregion = east\nserver.host = ${name}')
+        self.write("app.conf", 'include "region/region.conf"\nserver.port = 8080\ndb { include "db.conf" }')
+        self.write("db.conf", "pool = 5")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        FileIncluder.clear_cache()
+
+    def write(self, name, content):
+        with open(os.path.join(self.path, name), "w") as f:
+            f.write(content)
+
+    def parse(self, name="app.conf", **kwargs):
+        return ConfigFactory.parse_file(os.path.join(self.path, name), True, **kwargs)
+
+    def test_include(self):
+        config = self.parse()
+        self.assertEqual(config.get("server.port"), 8080)
+        self.assertEqual(config.get("region"), "east")
+        self.assertEqual(config.get("db.pool"), 5)
+        self.assertEqual(config.get("server.host").get_string(), "base")
+
+    def test_include_cache(self):
+        self.parse()
+        self.assertEqual(len(FileIncluder._cache), 3)
+        self.write("base.conf", "server { host = base, port = 80 }\nname = base\ndebug = on")
+        config = self.parse(cache=True)
+        self.assertEqual(config.get("debug"), True)
+        self.assertEqual(self.parse(cache=True).get("debug"), True)
+
+        # the cached file signature contains the included files
+        self.write("base.conf", "name = changed")
+        self.assertIsNone(self.parse(cache=True).get("debug"))
+
+    def test_diamond_include(self):
+        self.write("region.conf", 'include "base.conf"\nregion = east')
+        self.write("host.conf", 'include "base.conf"\nhost = web1\nserver.port = 8000')
+        self.write("app.conf", 'include "region.conf"\ninclude "host.conf"\ninclude "host.conf"')
+        config = self.parse()
+        self.assertEqual(config.get("server.port"), 8000)
+        self.assertEqual(config.get("server.host"), "base")
+        self.assertEqual((config.get("region"), config.get("host"), config.get("name")), ("east", "web1", "base"))
+
+    def test_include_cycle(self):
+        self.write("base.conf", 'include "app.conf"')
+        self.assertRaises(HoconParserException, self.parse)
+        self.assertRaises(HoconParserException, lambda: self.parse("base.conf"))
+
+    def test_missing_include(self):
+        self.write("app.conf", 'include "missing.conf"\nport = 1')
+        self.assertEqual(self.parse().get("port"), 1)
+
+
 class SelectConfigTest(unittest.TestCase):
 
     def setUp(self):
@@ -88,3 +242,74 @@ class SelectConfigTest(unittest.TestCase):
     def test_delete(self):
         self.config.delete("server.port")
         self.assertIsNone(self.config.get("server.port"))
+
+
+class CompiledSelectConfigTest(SelectConfigTest):
+
+    def setUp(self):
+        super(CompiledSelectConfigTest, self).setUp()
+        self.config.compile()
+
+    def test_compiled_invalidate(self):
+        self.assertTrue(self.config.compiled)
+        self.assertEqual(self.config.get("server.port"), 80)
+        self.config.set("server.port", 81)
+        self.config.update({"db": {"host": "db"}})
+        self.assertEqual(self.config.get("server.port"), 81)
+        self.assertEqual(self.config.get("db.host"), "db")
+        self.assertTrue("db.host" in self.config)
+        self.config.delete("db")
+        self.assertFalse("db.host" in self.config)
+        self.assertEqual(self.config.get(), {"server": {"host": "localhost", "port": 81}})
+
+
+class ConfigSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        config = SelectConfig()
+        config.set("server.host", "localhost")
+        config.set("server.port", 80)
+        config.set("db.pool.size", 5)
+        self.config = config.snapshot()
+
+    def test_get(self):
+        self.assertEqual(self.config.get("server.port"), 80)
+        self.assertEqual(self.config.get("db.pool"), {"size": 5})
+        self.assertTrue("db.pool.size" in self.config)
+        self.assertEqual(self.config.get("debug", True), True)
+
+    def test_immutable(self):
+        self.assertRaises(TypeError, lambda: self.config.get("server").update(port=81))
+        self.assertRaises(TypeError, lambda: self.config.config().pop("server"))
+        self.assertEqual(self.config.get("db").copy(), {"pool": {"size": 5}})
+        self.assertRaises(TypeError, self.config.set, "server.port", 81)
+        self.assertRaises(TypeError, self.config.update, {"server.port": 81})
+        self.assertRaises(TypeError, self.config.delete, "server.port")
+        self.assertEqual(self.config.get("server.port"), 80)
+
+    def test_set(self):
+        config = self.config.with_value("server.port", 81)
+        self.assertEqual(config.get("server.port"), 81)
+        self.assertEqual(self.config.get("server.port"), 80)
+        # the unchanged sub dicts are shared
+        self.assertIs(config.get("db"), self.config.get("db"))
+
+    def test_update(self):
+        config = self.config.updated({"server.port": 81, "server.debug": True, "web": {"theme": "dark"}})
+        self.assertEqual(config.get("server"), {"host": "localhost", "port": 81, "debug": True})
+        self.assertEqual(config.get("web.theme"), "dark")
+        self.assertRaises(TypeError, lambda: config.get("web").clear())
+        self.assertFalse("web" in self.config)
+
+    def test_delete(self):
+        config = self.config.without("db.pool.size")
+        self.assertEqual(config.get("db"), {"pool": {}})
+        self.assertEqual(self.config.get("db.pool.size"), 5)
+        self.assertIs(config.without("not.found"), config)
+
+    def test_thaw(self):
+        config = self.config.thaw()
+        config.set("server.port", 81)
+        config.update(self.config)
+        self.assertEqual(config.get("server.port"), 80)
+        self.assertIsInstance(ConfigSnapshot().config(), dict)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import decimal
+import json
+import unittest
+
+from tornado import gen
+from tornado.testing import AsyncHTTPTestCase
+
+from medoly import anthem
+from medoly.anthem.patch import json_iterencode
+
+
+class Greeting(object):
+
+    def __init__(self, sid):
+        self.sid = sid
+
+    def __json__(self):
+        return {"id": self.sid}
+
+
+def greetings(count):
+    for i in range(count):
+        yield Greeting(i)
+
+
+class JsonIterencodeTest(unittest.TestCase):
+
+    def encode(self, value):
+        return json.loads("".join(json_iterencode(value)))
+
+    def test_iterencode(self):
+        self.assertEqual(self.encode([1, "a", None]), [1, "a", None])
+        self.assertEqual(self.encode({"a": [1, 2], 1: True}), {"a": [1, 2], "1": True})
+        self.assertEqual(self.encode(greetings(2)), [{"id": 0}, {"id": 1}])
+        self.assertEqual(self.encode({"entries": greetings(1), "count": 1}),
+                         {"entries": [{"id": 0}], "count": 1})
+
+    def test_iterencode_nested(self):
+        rows = [[i, {"tags": ["a", "b"], "items": greetings(2)}] for i in range(3000)]
+        chunks = list(json_iterencode({"data": {"rows": rows}}))
+        # the nested list is streamed item by item
+        self.assertTrue(max(len(chunk) for chunk in chunks) < 16)
+        value = json.loads("".join(chunks))
+        self.assertEqual(len(value["data"]["rows"]), 3000)
+        self.assertEqual(value["data"]["rows"][-1], [2999, {"tags": ["a", "b"], "items": [{"id": 0}, {"id": 1}]}])
+        # the shared containers are not circular
+        shared = [1]
+        self.assertEqual(self.encode([shared, shared]), [[1], [1]])
+        circular = []
+        circular.append(circular)
+        self.assertRaises(ValueError, self.encode, circular)
+
+    def test_iterencode_as_json(self):
+        value = {"date": datetime.date(2016, 1, 2), "price": decimal.Decimal("1.50"),
+                 "nested": {"items": iter([1, 2])}}
+        self.assertEqual(self.encode(value),
+                         {"date": "2016-01-02", "price": "1.50", "nested": {"items": [1, 2]}})
+
+
+class JsonifyHandlerTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        class Index(anthem.Handler):
+
+            def get(self):
+                self.jsonify({"entries": [Greeting(1)]})
+
+        class Stream(anthem.Handler):
+
+            @gen.coroutine
+            def get(self):
+                yield self.jsonify_stream({"entries": greetings(1000)}, chunk_size=1024)
+
+        return anthem.Application([("/", Index), ("/stream", Stream)], lambda app: None)
+
+    def test_jsonify(self):
+        response = self.fetch("/")
+        self.assertEqual(json.loads(response.body), {"entries": [{"id": 1}]})
+        self.assertTrue(response.headers["Content-Type"].startswith("application/json"))
+
+    def test_jsonify_stream(self):
+        response = self.fetch("/stream")
+        self.assertEqual(json.loads(response.body), {"entries": [{"id": i} for i in range(1000)]})
+        self.assertTrue(response.headers["Content-Type"].startswith("application/json"))
+        self.assertEqual(response.headers.get("Transfer-Encoding"), "chunked")
+
+
+class ConditionalHandlerTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.calls = []
+        self.versions = {"updated": datetime.datetime(2016, 1, 2, 3, 4, 5), "version": "1"}
+        calls, versions = self.calls, self.versions
+
+        class Feed(anthem.Handler):
+
+            def get_validator(self):
+                return versions["updated"]
+
+            def get(self):
+                calls.append(self.request.uri)
+                self.write("feed")
+
+        @anthem.cached(ttl=60)
+        class Entry(anthem.Handler):
+
+            def get_validator(self, slug):
+                return versions["version"] + slug
+
+            def get(self, slug):
+                calls.append(self.request.uri)
+                self.write("%s %s" % (slug, versions["version"]))
+
+        return anthem.Application([("/feed", Feed), ("/entry/(.*)", Entry)], lambda app: None)
+
+    def test_if_modified_since(self):
+        response = self.fetch("/feed")
+        self.assertEqual(response.headers["Last-Modified"], "Sat, 02 Jan 2016 03:04:05 GMT")
+        response = self.fetch("/feed", headers={"If-Modified-Since": response.headers["Last-Modified"]})
+        self.assertEqual(response.code, 304)
+        self.assertEqual(self.calls, ["/feed"])
+
+        self.versions["updated"] = datetime.datetime(2016, 1, 3)
+        response = self.fetch("/feed", headers={"If-Modified-Since": "Sat, 02 Jan 2016 03:04:05 GMT"})
+        self.assertEqual(response.code, 200)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_if_none_match(self):
+        etag = self.fetch("/feed").headers["Etag"]
+        self.assertTrue(etag.startswith('W/"'))
+        response = self.fetch("/feed", headers={"If-None-Match": etag,
+                                                "If-Modified-Since": "Fri, 01 Jan 2016 00:00:00 GMT"})
+        self.assertEqual(response.code, 304)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_validator_with_cache(self):
+        first = self.fetch("/entry/a")
+        self.assertEqual(self.fetch("/entry/a", headers={"If-None-Match": first.headers["Etag"]}).code, 304)
+        self.assertEqual(self.fetch("/entry/a").body, b"a 1")
+        self.assertEqual(len(self.calls), 1)
+
+        self.versions["version"] = "2"
+        self.assertEqual(self.fetch("/entry/a").body, b"a 2")
+        self.assertEqual(self.fetch("/entry/a").body, b"a 2")
+        self.assertEqual(len(self.calls), 2)
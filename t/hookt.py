@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import logging
+import unittest
+
+from tornado import gen
+from tornado.ioloop import IOLoop
+from tornado.testing import AsyncHTTPTestCase
+
+from medoly import anthem
+from medoly.anthem.hook import HookMap
+
+
+logging.getLogger('anthem.hook').disabled = True
+
+
+class HookMapTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.hooks = HookMap()
+
+    def callback(self, name, fail=False):
+        def _callback(arg):
+            self.calls.append((name, arg))
+            if fail:
+                raise ValueError(name)
+        return _callback
+
+    def test_run_priority(self):
+        for frozen in (False, True):
+            hooks = HookMap()
+            hooks.attach("point", self.callback("b"), priority=60)
+            hooks.attach("point", self.callback("a"), priority=10)
+            if frozen:
+                hooks.freeze()
+            self.calls = []
+            hooks.run("point", 1)
+            self.assertEqual(self.calls, [("a", 1), ("b", 1)])
+
+    def test_run_failsafe(self):
+        for frozen in (False, True):
+            hooks = HookMap()
+            hooks.attach("point", self.callback("a", fail=True), priority=10)
+            hooks.attach("point", self.callback("b"), priority=20)
+            hooks.attach("point", self.callback("c"), failsafe=True, priority=30)
+            if frozen:
+                hooks.freeze()
+            self.calls = []
+            self.assertRaises(ValueError, lambda: hooks.run("point", 1))
+            self.assertEqual(self.calls, [("a", 1), ("c", 1)])
+
+    def test_run_simple_plan_error(self):
+        self.hooks.attach("point", self.callback("a", fail=True), priority=10)
+        self.hooks.attach("point", self.callback("b"), priority=20)
+        self.hooks.freeze()
+        self.assertRaises(ValueError, lambda: self.hooks.run("point", 1))
+        self.assertEqual(self.calls, [("a", 1)])
+
+    def test_freeze(self):
+        self.hooks.freeze()
+        self.assertTrue(self.hooks.frozen)
+        # empty point
+        self.hooks.run("point", 1)
+
+        # attach after freezing
+        self.hooks.attach("point", self.callback("a"))
+        self.hooks.run("point", 1)
+        self.assertEqual(self.calls, [("a", 1)])
+
+        self.hooks.thaw()
+        self.assertFalse(self.hooks.frozen)
+        self.hooks.run("point", 2)
+        self.assertEqual(self.calls, [("a", 1), ("a", 2)])
+
+    def async_callback(self, name, fail=False):
+        @gen.coroutine
+        def _callback(arg):
+            self.calls.append((name, "start"))
+            yield gen.moment
+            self.calls.append((name, "end"))
+            if fail:
+                raise ValueError(name)
+        return _callback
+
+    def test_run_coroutine(self):
+        for frozen in (False, True):
+            hooks = HookMap()
+            hooks.attach("point", self.async_callback("a", fail=True), priority=10)
+            hooks.attach("point", self.callback("b"), priority=20)
+            hooks.attach("point", self.async_callback("c"), failsafe=True, priority=30)
+            if frozen:
+                hooks.freeze()
+            self.calls = []
+            future = hooks.run("point", 1)
+            self.assertRaises(ValueError, lambda: IOLoop.current().run_sync(lambda: future))
+            self.assertEqual(self.calls, [("a", "start"), ("a", "end"), ("c", "start"), ("c", "end")])
+
+    def test_run_concurrent(self):
+        hooks = HookMap(concurrent=True)
+        hooks.attach("point", self.async_callback("a"), priority=10)
+        hooks.attach("point", self.async_callback("b"), priority=10)
+        hooks.attach("point", self.async_callback("c"), priority=20)
+        hooks.freeze()
+        IOLoop.current().run_sync(lambda: hooks.run("point", 1))
+        self.assertEqual(self.calls, [("a", "start"), ("b", "start"), ("a", "end"), ("b", "end"),
+                                      ("c", "start"), ("c", "end")])
+
+
+class AsyncHookHandlerTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        class Index(anthem.Handler):
+
+            def get(self):
+                self.write(self.user)
+
+        class Error(anthem.Handler):
+
+            def get(self):
+                raise ValueError("error")
+
+        @gen.coroutine
+        def load_user(req_handler):
+            yield gen.moment
+            req_handler.user = "medoly"
+
+        @gen.coroutine
+        def before_error(req_handler, status_code, **kw):
+            yield gen.moment
+            req_handler.set_header("X-Error", str(status_code))
+
+        def on_error(req_handler, status_code, **kw):
+            req_handler.finish("error page")
+
+        def initialize(app):
+            app.attach("on_start_request", load_user)
+            app.attach("before_error_response", before_error)
+            app.error_page(500, on_error)
+
+        return anthem.Application([("/", Index), ("/error", Error)], initialize)
+
+    def test_start_request_hook(self):
+        response = self.fetch("/")
+        self.assertEqual(response.body, b"medoly")
+
+    def test_error_response_hook(self):
+        logging.getLogger("tornado.application").disabled = True
+        logging.getLogger("tornado.access").disabled = True
+        response = self.fetch("/error")
+        self.assertEqual(response.code, 500)
+        self.assertEqual(response.headers["X-Error"], "500")
+        self.assertEqual(response.body, b"error page")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from tornado import gen
+from tornado.testing import AsyncHTTPTestCase, gen_test
+
+from medoly import kanon, muses
+from medoly.anthem import Host
+from medoly.kanon import Melos
+
+
+def create_app(name, hooked):
+    mgr = kanon.InventoryManager(enable_cmd_parse=False)
+    with kanon.use(mgr):
+
+        @kanon.bloom("thing", "Site")
+        class SiteThing(object):
+            site = name
+
+        @kanon.hook("on_start_request")
+        def on_start(req_handler):
+            hooked.append(name)
+
+        @kanon.menu("/")
+        class Index(object):
+            thing = Melos("Site")
+
+            def get(self):
+                self.write(self.thing.site)
+
+        @kanon.menu("/" + name)
+        class Page(object):
+
+            @gen.coroutine
+            def get(self):
+                site = muses.Thing("Site").site
+                yield gen.moment
+                self.write(site + ":" + muses.things.Site.site)
+
+        return kanon.chant()
+
+
+class HostTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.previous = kanon.inventory_manager()
+        self.hooked = []
+        self.api = create_app("api", self.hooked)
+        self.admin = create_app("admin", self.hooked)
+        self.host = Host()
+        self.host.add(self.api, 8888)
+        self.host.add(self.admin, 8888, host=r"admin\.example\.com")
+        return self.host.router(8888)
+
+    def fetch_host(self, path, host):
+        return self.fetch(path, headers={"Host": host})
+
+    def test_dispatch(self):
+        self.assertEqual(self.fetch_host("/", "admin.example.com").body, b"admin")
+        self.assertEqual(self.fetch_host("/", "api.example.com").body, b"api")
+        self.assertEqual(self.fetch("/").body, b"api")
+        self.assertEqual(self.hooked, ["admin", "api", "api"])
+
+    def test_isolated(self):
+        self.assertEqual(self.fetch_host("/admin", "admin.example.com").body, b"admin:admin")
+        self.assertEqual(self.fetch_host("/admin", "api.example.com").code, 404)
+        # the muses resolve the inventory of the application handling the request
+        self.assertEqual(self.fetch_host("/api", "api.example.com").body, b"api:api")
+        self.assertIs(kanon.inventory_manager(), self.previous)
+
+    @gen_test
+    def test_concurrent(self):
+        responses = yield [self.http_client.fetch(self.get_url(path), headers={"Host": host})
+                           for path, host in (("/api", "api.example.com"), ("/admin", "admin.example.com")) * 2]
+        self.assertEqual([response.body for response in responses], [b"api:api", b"admin:admin"] * 2)
+
+    def test_add(self):
+        self.assertRaises(ValueError, self.host.add, self.admin, 8888, r"admin\.example\.com")
+        self.host.add(self.admin, 8889)
+        self.assertIs(self.host.router(8889), self.admin)
@@ -16,7 +16,10 @@
 
 import unittest
 
+from medoly import anthem, muses
+from medoly.kanon import Melos
 from medoly.kanon.manager import InventoryManager, InventoryExistError
+from medoly.kanon.scope import InventoryCycleError
 
 
 class InvertoryMockObj(object):
@@ -54,3 +57,105 @@ class InventoryManagerTest(unittest.TestCase):
         self.mgr.put_mapper("mapper", InvertoryMockObj)
         self.assertRaises(InventoryExistError, lambda: self.mgr.put_mapper("mapper", InvertoryMockObj))
         self.assertEqual(self.mgr.mappers['mapper'], InvertoryMockObj)
+
+    def test_connect_cache(self):
+        self.mgr.connect("/about", render="about.html", cache=dict(ttl=30))
+        self.mgr.connect("/contact", render="contact.html")
+        about, contact = self.mgr.app_ctx.routes
+        self.assertEqual(about.handler_class.response_cache.ttl, 30)
+        self.assertTrue(issubclass(about.handler_class, anthem.RenderHandler))
+        self.assertIs(contact.handler_class, anthem.RenderHandler)
+        self.assertIsNone(anthem.RenderHandler.response_cache)
+
+
+class LazyInventoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.mgr = InventoryManager(enable_cmd_parse=False)
+        self.created = created = []
+
+        class EntryMapper(object):
+
+            def __init__(self):
+                created.append("EntryMapper")
+
+        class EntryThing(object):
+            cache = Melos("Cache")
+
+            def __init__(self):
+                created.append("EntryThing")
+                self.mapper = muses.Backend("Entry")
+
+        class CacheThing(object):
+
+            def __init__(self):
+                created.append("CacheThing")
+
+        self.mgr.put_thing("Entry", EntryThing)
+        self.mgr.put_thing("Cache", CacheThing)
+        self.mgr.put_mapper("Entry", EntryMapper)
+
+    def mount(self):
+        muses.activate(self.mgr.registry)
+        self.mgr.mount_mapper()
+        self.mgr.mount_thing()
+
+    def test_lazy(self):
+        self.mount()
+        self.assertEqual(self.created, [])
+
+        entry = muses.Thing("Entry")
+        self.assertEqual(self.created, ["CacheThing", "EntryThing", "EntryMapper"])
+        self.assertIs(muses.Thing("Entry"), entry)
+        self.assertIs(entry.mapper, muses.Backend("Entry"))
+        self.assertIs(entry.cache, muses.Thing("Cache"))
+        self.assertEqual(self.mgr.inventory_graph[("thing", "Entry")],
+                         set([("thing", "Cache"), ("mapper", "Entry")]))
+
+    def test_cycle(self):
+
+        class UserThing(object):
+            role = Melos("Role")
+
+        class RoleThing(object):
+
+            def __init__(self):
+                muses.Thing("User")
+
+        self.mgr.put_thing("User", UserThing)
+        self.mgr.put_thing("Role", RoleThing)
+        self.mount()
+        self.assertRaises(InventoryCycleError, muses.Thing, "User")
+        self.assertRaises(InventoryCycleError, self.mgr.inventory_levels)
+
+    def test_warmup(self):
+        self.mount()
+        self.assertEqual(self.mgr.inventory_levels(),
+                         [[("mapper", "Entry"), ("thing", "Cache")], [("thing", "Entry")]])
+        self.mgr.warmup(workers=2)
+        self.assertEqual(sorted(self.created), ["CacheThing", "EntryMapper", "EntryThing"])
+        self.assertEqual(self.created[-1], "EntryThing")
+        self.mgr.warmup()
+        self.assertEqual(len(self.created), 3)
+
+    def test_registry(self):
+        other = InventoryManager(enable_cmd_parse=False)
+
+        class OtherEntryMapper(object):
+            pass
+
+        class OtherEntryThing(object):
+
+            def __init__(self):
+                self.mapper = muses.Backend("Entry")
+
+        other.put_mapper("Entry", OtherEntryMapper)
+        other.put_thing("Entry", OtherEntryThing)
+        other.mount_mapper()
+        other.mount_thing()
+        self.mount()
+
+        # the constructor resolves the inventory of its manager
+        self.assertIsInstance(other.registry.things.Entry.mapper, OtherEntryMapper)
+        self.assertIsNot(muses.things.Entry, other.registry.things.Entry)
+        self.assertIsInstance(muses.things.Entry.mapper, muses.mappers.Entry.__class__)
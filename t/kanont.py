@@ -14,9 +14,15 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+import os
+import shutil
+import sys
+import tempfile
 import unittest
 from medoly import kanon
 from medoly import anthem, muses
+from medoly.util import synthesize_class
 from tornado.web import RequestHandler
 
 
@@ -126,6 +132,35 @@ class InventoryMgrTest(unittest.TestCase):
         self.assertTrue(issubclass(handler_class, anthem.Handler))
         self.assertTrue(issubclass(self.mgr.app_ctx.routes[0].handler_class, RequestHandler))
 
+    def test_synthesized_class(self):
+
+        @kanon.bloom("thing")
+        class BlablaService(object):
+            pass
+
+        class Box(object):
+            thing = kanon.Melos("BlablaService")
+
+        kanon.chant()
+        cls = synthesize_class(Box, anthem.Handler, self.mgr.synthesized_classes)
+        self.mgr.load_melos(cls)
+        self.assertTrue(isinstance(cls.thing, BlablaService))
+        # the plain class is not changed and each manager has its own synthesized classes
+        self.assertTrue(isinstance(Box.__dict__["thing"], kanon.Melos))
+        self.assertIs(synthesize_class(Box, anthem.Handler, self.mgr.synthesized_classes), cls)
+        self.assertIsNot(synthesize_class(Box, anthem.Handler, kanon.InventoryManager().synthesized_classes), cls)
+
+    def test_app_config(self):
+        self.mgr.config.set("theme", "default")
+        app = kanon.chant()
+        config = app.config
+        self.assertEqual(config.get("theme"), "default")
+        self.assertRaises(TypeError, lambda: config.config().pop("theme"))
+
+        app.update_config({"theme": "dark"})
+        self.assertEqual(app.config.get("theme"), "dark")
+        self.assertEqual(config.get("theme"), "default")
+
     def test_add_chrod(self):
 
         @kanon.bloom("thing")
@@ -201,3 +236,104 @@ class InventoryMgrTest(unittest.TestCase):
         self.assertEqual(len(template_mgr.template_paths), 1)
 
         self.assertEqual(template_mgr.ui_support, False)
+
+
+class ComposeManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        package = os.path.join(self.path, "manifest_app")
+        os.makedirs(os.path.join(package, "sub"))
+        for name, source in (("__init__.py", ""), ("util.py", "VALUE = 1\n"),
+                             ("loader.py", "import manifest_ext\n"),
+                             ("side.py", "from medoly import kanon\n\n"
+                                         "kanon.inventory_manager().config.set('side', True)\n"),
+                             ("sub/__init__.py", ""),
+                             ("sub/view.py", "from medoly import kanon\n\n\n"
+                                             "@kanon.menu('/')\nclass Index(object):\n    pass\n"),
+                             ("../manifest_ext.py", "from medoly import kanon\n\n\n"
+                                                    "@kanon.bloom('model')\nclass Ext(object):\n    pass\n")):
+            with open(os.path.join(package, name), "w") as f:
+                f.write(source)
+        self.manifest = os.path.join(self.path, "manifest.json")
+        sys.path.insert(0, self.path)
+
+    def tearDown(self):
+        sys.path.remove(self.path)
+        self.unload()
+        shutil.rmtree(self.path)
+
+    def unload(self):
+        for name in list(sys.modules):
+            if name.startswith(("manifest_app", "manifest_ext")):
+                del sys.modules[name]
+
+    def compose(self):
+        mgr = kanon.InventoryManager()
+        kanon.InventoryManager.set_instance(mgr)
+        kanon.compose("manifest_app", manifest=self.manifest)
+        return mgr
+
+    def test_manifest(self):
+        mgr = self.compose()
+        self.assertEqual(sorted(mgr.compose_timings),
+                         ["manifest_app.loader", "manifest_app.side", "manifest_app.sub",
+                          "manifest_app.sub.view", "manifest_app.util"])
+        with open(self.manifest) as f:
+            modules = json.load(f)["modules"]
+        self.assertEqual(modules["manifest_app.loader"]["imports"], ["manifest_ext"])
+        self.assertEqual([name for name in sorted(modules) if modules[name]["required"]],
+                         ["manifest_app.loader", "manifest_app.side", "manifest_app.sub.view"])
+
+        self.unload()
+        mgr = self.compose()
+        self.assertEqual(len(mgr.menus), 1)
+        # the transitive import and the import side effect
+        self.assertIn("Ext", mgr.models)
+        self.assertIs(mgr.config.get("side"), True)
+        self.assertNotIn("manifest_app.util", sys.modules)
+        self.assertEqual(sorted(mgr.compose_timings),
+                         ["manifest_app.loader", "manifest_app.side", "manifest_app.sub.view"])
+
+
+    def test_compose_twice(self):
+        self.compose()
+        with kanon.use(kanon.InventoryManager()):
+            # the imported modules don't register again
+            self.assertRaises(ValueError, kanon.compose, "manifest_app.sub")
+        self.unload()
+        self.assertEqual(len(self.compose().menus), 1)
+
+
+class InventoryManifestTest(ComposeManifestTest):
+
+    def chant(self):
+        mgr = kanon.InventoryManager(enable_cmd_parse=False)
+        kanon.InventoryManager.set_instance(mgr)
+        restored = kanon.restore(self.manifest)
+        if not restored:
+            kanon.compose("manifest_app", url_prefix="/app")
+        kanon.chant(manifest=self.manifest)
+        return mgr, restored
+
+    def test_manifest(self):
+        mgr, restored = self.chant()
+        self.assertFalse(restored)
+        self.assertEqual(list(mgr.composed_modules), ["manifest_app", "manifest_app.loader", "manifest_app.side",
+                                                      "manifest_app.sub.view"])
+        pattern = mgr.app_ctx.routes[0].regex.pattern
+
+        self.unload()
+        mgr, restored = self.chant()
+        self.assertTrue(restored)
+        self.assertNotIn("manifest_app.util", sys.modules)
+        self.assertEqual(mgr.app_ctx.routes[0].regex.pattern, pattern)
+        self.assertEqual(mgr.menus[0].url_spec, "/app/")
+
+        # the added module changes the package listing, even if the directory mtime isn't changed
+        stat = os.stat(os.path.join(self.path, "manifest_app", "sub"))
+        with open(os.path.join(self.path, "manifest_app", "sub", "admin.py"), "w") as f:
+            f.write("")
+        os.utime(os.path.join(self.path, "manifest_app", "sub"), (stat.st_atime, stat.st_mtime))
+        self.unload()
+        self.assertFalse(self.chant()[1])
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+import unittest
+
+from medoly import muses
+from medoly.kanon.scope import SingletonProvider, ThreadProvider
+
+
+class Entry(object):
+    pass
+
+
+class RegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.default = muses.registry
+        self.registry = muses.Registry()
+        muses.activate(self.registry)
+
+    def tearDown(self):
+        muses.activate(self.default)
+
+    def test_attribute(self):
+        provider = SingletonProvider(Entry)
+        self.registry.things._mount({"Entry": provider})
+        entry = muses.things.Entry
+        self.assertIsInstance(entry, Entry)
+        self.assertIs(muses.Thing("Entry"), entry)
+        self.assertIs(muses.things["Entry"], entry)
+        self.assertIn("Entry", muses.things)
+        self.assertIsNone(muses.Thing("Missing"))
+        self.assertRaises(AttributeError, lambda: muses.things.Missing)
+        self.assertRaises(KeyError, lambda: muses.things["Missing"])
+
+    def test_invalidate(self):
+        self.registry.models._mount({"Entry": Entry})
+        self.assertIs(muses.models.Entry, Entry)
+        self.registry.models["Entry"] = Registry = muses.Registry
+        self.assertIs(muses.Model("Entry"), Registry)
+        self.registry.models._mount({})
+        self.assertIsNone(muses.Model("Entry"))
+
+    def test_not_cached(self):
+        self.registry.mappers._mount({"Entry": ThreadProvider(Entry)})
+        entries = []
+        thread = threading.Thread(target=lambda: entries.append(muses.mappers.Entry))
+        thread.start()
+        thread.join()
+        self.assertIs(muses.mappers.Entry, muses.Backend("Entry"))
+        self.assertIsNot(entries[0], muses.mappers.Entry)
+
+    def test_use(self):
+        other = muses.Registry()
+        other.things._mount({"Entry": Entry})
+        self.registry.things._mount({})
+        with muses.use(other) as registry:
+            self.assertIs(registry, other)
+            self.assertIs(muses.Thing("Entry"), Entry)
+            self.assertIs(muses.things.Entry, Entry)
+            self.assertIn("Entry", muses.things)
+            self.assertIs(muses.current(), other)
+        self.assertIsNone(muses.Thing("Entry"))
+        self.assertNotIn("Entry", muses.things)
+        self.assertIs(muses.current(), self.registry)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import unittest
+from datetime import date
+
+from tornado.httputil import HTTPServerRequest
+from tornado.testing import AsyncHTTPTestCase
+from tornado.web import RequestHandler
+
+from medoly import anthem
+from medoly.anthem.router import SegmentTrie, TrieRouter, Converter
+from medoly.kanon.manager import InventoryManager
+
+
+class SegmentTrieTest(unittest.TestCase):
+
+    def setUp(self):
+        int_converter = Converter(r'-?\d+', int)
+        self.trie = SegmentTrie()
+        self.trie.add(['', 'post', ('post_id', int_converter)], "post")
+        self.trie.add(['', 'post', ('name', Converter(r'[^/]+'))], "post_name")
+        self.trie.add(['', 'post', 'render'], "render")
+        self.trie.add(['', 'post', ('post_id', int_converter), 'edit'], "edit")
+        self.trie.add(['', ''], "index")
+
+    def test_match(self):
+        self.assertEqual(self.trie.match("/"), ("index", {}))
+        self.assertEqual(self.trie.match("/post/12"), ("post", {"post_id": 12}))
+        self.assertEqual(self.trie.match("/post/abc"), ("post_name", {"name": "abc"}))
+        self.assertEqual(self.trie.match("/post/12/edit"), ("edit", {"post_id": 12}))
+
+    def test_static_first(self):
+        self.assertEqual(self.trie.match("/post/render"), ("render", {}))
+
+    def test_not_match(self):
+        self.assertIsNone(self.trie.match("/post"))
+        self.assertIsNone(self.trie.match("/post/12/"))
+        self.assertIsNone(self.trie.match("/post/abc/edit"))
+
+
+class Index(anthem.Handler):
+    pass
+
+
+class PostView(anthem.Handler):
+    pass
+
+
+class Archive(anthem.Handler):
+    pass
+
+
+class TrieRouterTest(unittest.TestCase):
+
+    def setUp(self):
+        mgr = InventoryManager()
+        mgr.connect("/", Index)
+        mgr.connect("/archive/([0-9]{4})", Archive)
+        mgr.connect("/post/{post_id:int}", PostView)
+        self.app = anthem.Application(mgr.app_ctx.routes, lambda app: None, route_engine="trie")
+
+    def find(self, path):
+        delegate = self.app.find_handler(HTTPServerRequest(uri=path))
+        return delegate.handler_class, delegate.path_args, delegate.path_kwargs
+
+    def test_router(self):
+        self.assertTrue(isinstance(self.app.wildcard_router, TrieRouter))
+
+        self.assertEqual(self.find("/"), (Index, [], {}))
+        self.assertEqual(self.find("/post/12?q=1"), (PostView, [], {"post_id": 12}))
+        self.assertEqual(self.find("/archive/2016"), (Archive, ["2016"], {}))
+        self.assertEqual(self.find("/post/a")[0].__name__, "ErrorHandler")
+
+    def test_converter(self):
+        mgr = InventoryManager()
+        mgr.connect("/archive/{day:date}", Archive)
+        for engine in (None, "trie"):
+            app = anthem.Application(mgr.app_ctx.routes, lambda app: None, route_engine=engine)
+            delegate = app.find_handler(HTTPServerRequest(uri="/archive/2016-02-01"))
+            self.assertEqual(delegate.path_kwargs, {"day": date(2016, 2, 1)})
+            delegate = app.find_handler(HTTPServerRequest(uri="/archive/2016-02-31"))
+            self.assertEqual(delegate.handler_class.__name__, "ErrorHandler")
+
+    def test_reverse_url(self):
+        mgr = InventoryManager()
+        mgr.connect("/post/{post_id:int}", PostView, name="post")
+        app = anthem.Application(mgr.app_ctx.routes, lambda app: None, route_engine="trie")
+        self.assertEqual(app.reverse_url("post", 12), "/post/12")
+
+
+class TypedPostView(anthem.Handler):
+
+    def get(self, post_id):
+        self.write("%r" % (post_id,))
+
+
+class TypedArchive(RequestHandler):
+
+    def get(self, day):
+        self.write("%r" % (day,))
+
+
+class TypedPathTest(AsyncHTTPTestCase):
+
+    route_engine = None
+
+    def get_app(self):
+        mgr = InventoryManager()
+        mgr.connect("/post/{post_id:int}", TypedPostView)
+        mgr.connect("/archive/{day:date}", TypedArchive)
+        mgr.url_pattern_manager.add_pattern("date", r"\d{8}")
+        mgr.connect("/day/{day:date}", TypedArchive)
+        return anthem.Application(mgr.app_ctx.routes, lambda app: None, route_engine=self.route_engine)
+
+    def test_fetch(self):
+        self.assertEqual(self.fetch("/post/12").body, b"12")
+        self.assertEqual(self.fetch("/archive/2016-02-01").body, b"datetime.date(2016, 2, 1)")
+        self.assertEqual(self.fetch("/post/abc").code, 404)
+
+    def test_add_pattern(self):
+        # the user pattern overrides the default one
+        self.assertEqual(self.fetch("/day/20160201").body, b"u'20160201'")
+        self.assertEqual(self.fetch("/day/2016-02-01").code, 404)
+
+
+class TrieTypedPathTest(TypedPathTest):
+
+    route_engine = "trie"
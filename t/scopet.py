@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+import unittest
+
+from tornado import gen
+from tornado.testing import AsyncHTTPTestCase
+
+from medoly import kanon, muses
+from medoly.kanon import Melos
+from medoly.kanon.scope import PooledProvider, RequestProvider, ThreadProvider, ScopedInventory
+
+
+class Session(object):
+    created = 0
+
+    def __init__(self):
+        Session.created += 1
+        self.id = Session.created
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Owner(object):
+    _scoped_instances = None
+
+
+class ProviderTest(unittest.TestCase):
+
+    def test_request(self):
+        provider = RequestProvider(Session)
+        owner = Owner()
+        session = provider.get(owner)
+        self.assertIs(provider.get(owner), session)
+        self.assertIsNot(provider.get(Owner()), session)
+        provider.release(session)
+        self.assertTrue(session.closed)
+
+    def test_pooled(self):
+        provider = PooledProvider(Session, size=1)
+        first, second = provider.get(Owner()), provider.get(Owner())
+        provider.release(first)
+        provider.release(second)
+        self.assertFalse(first.closed)
+        self.assertTrue(second.closed)
+        self.assertIs(provider.get(Owner()), first)
+
+    def test_thread(self):
+        provider = ThreadProvider(Session)
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(provider.get(Owner())))
+        thread.start()
+        thread.join()
+        self.assertIs(provider.get(Owner()), provider.provide())
+        self.assertIsNot(sessions[0], provider.provide())
+
+    def test_release_owner(self):
+        provider = RequestProvider(Session)
+
+        class Mapper(Owner):
+            session = ScopedInventory(provider)
+
+        owner_provider = PooledProvider(Mapper)
+        mapper = owner_provider.get(Owner())
+        session = mapper.session
+        owner_provider.release(mapper)
+        # the instances injected in the owner are released with it
+        self.assertTrue(session.closed)
+        self.assertIsNot(mapper.session, session)
+
+    def test_descriptor(self):
+        provider = RequestProvider(Session)
+
+        class View(Owner):
+            session = ScopedInventory(provider)
+
+        view = View()
+        self.assertIs(view.session, view.session)
+        self.assertIsInstance(View.session, ScopedInventory)
+
+
+class ScopedHandlerTest(AsyncHTTPTestCase):
+
+    def get_app(self):
+        mgr = kanon.InventoryManager(enable_cmd_parse=False)
+        kanon.InventoryManager.set_instance(mgr)
+        self.sessions = sessions = []
+
+        @kanon.bloom("mapper", "Session", scope="request")
+        class SessionMapper(Session):
+
+            def __init__(self):
+                super(SessionMapper, self).__init__()
+                sessions.append(self)
+
+        @kanon.bloom("thing", "Pooled", scope="pooled", pool_size=2)
+        class PooledThing(Session):
+            pass
+
+        @kanon.menu("/")
+        class Index(object):
+            session = Melos("mapper:Session")
+            pooled = Melos("Pooled")
+
+            def get(self):
+                self.write("%d" % self.pooled.id)
+                assert self.session is self.session
+
+        @kanon.menu("/static")
+        class Static(object):
+            session = Melos("mapper:Session")
+
+            def get(self):
+                self.write("static")
+
+        @kanon.menu("/wait")
+        class Wait(object):
+            session = Melos("mapper:Session")
+
+            @gen.coroutine
+            def get(self):
+                session = self.session
+                yield gen.sleep(0.2)
+                self.write("%d" % session.id)
+
+        return kanon.chant()
+
+    def test_request_scope(self):
+        first = self.fetch("/").body
+        second = self.fetch("/").body
+        # the pooled instance is reused
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.sessions), 2)
+        self.assertTrue(all(session.closed for session in self.sessions))
+
+        # the scoped instance is created on access
+        self.fetch("/static")
+        self.assertEqual(len(self.sessions), 2)
+        self.assertIsInstance(muses.Backend("Session"), Session)
+
+    def test_connection_close(self):
+        self.http_client.fetch(self.get_url("/wait"), self.stop, request_timeout=0.1)
+        self.wait()
+        # the running coroutine still uses the instance after the client closed the connection
+        self.io_loop.call_later(0.02, self.stop)
+        self.wait()
+        self.assertEqual(len(self.sessions), 1)
+        self.assertFalse(self.sessions[0].closed)
+        # released when the request is finished
+        self.io_loop.call_later(0.2, self.stop)
+        self.wait()
+        self.assertTrue(self.sessions[0].closed)
+
+    def test_singleton_owner(self):
+        for scope in ("singleton", "thread"):
+            mgr = kanon.InventoryManager(enable_cmd_parse=False)
+            kanon.InventoryManager.set_instance(mgr)
+
+            @kanon.bloom("mapper", "Session", scope="request")
+            class SessionMapper(Session):
+                pass
+
+            @kanon.bloom("thing", "Entry", scope=scope)
+            class EntryThing(object):
+                session = Melos("mapper:Session")
+
+            self.assertRaises(ValueError, kanon.chant)
+
+    def test_chord_owner(self):
+        for settings in ({}, {"bean": True}):
+            mgr = kanon.InventoryManager(enable_cmd_parse=False)
+            kanon.InventoryManager.set_instance(mgr)
+
+            @kanon.bloom("mapper", "Session", scope="request")
+            class SessionMapper(Session):
+                pass
+
+            @kanon.chord("Entry", **settings)
+            class Entry(object):
+                session = Melos("mapper:Session")
+
+            self.assertRaises(ValueError, kanon.chant)
+
+    def test_model_scope(self):
+        self.assertRaises(ValueError, kanon.bloom, "model", scope="request")
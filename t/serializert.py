@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import decimal
+import json
+import unittest
+import uuid
+
+from medoly.anthem import serializer
+from medoly.anthem.serializer import JsonSerializer
+
+
+class Point(object):
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class Point3D(Point):
+    pass
+
+
+class Greeting(object):
+
+    def __json__(self):
+        return {"content": "hello"}
+
+
+class JsonSerializerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.serializer = JsonSerializer()
+
+    def dumps(self, value):
+        return json.loads(self.serializer.dumps(value))
+
+    def test_default_adapters(self):
+        sid = uuid.uuid4()
+        value = {
+            "date": datetime.datetime(2016, 1, 2, 3, 4, 5, 6),
+            "price": decimal.Decimal("1.50"),
+            "id": sid,
+            "tags": set(["a"]),
+            "items": iter([1, 2]),
+            "greeting": Greeting(),
+        }
+        self.assertEqual(self.dumps(value), {
+            "date": "2016-01-02 03:04:05",
+            "price": "1.50",
+            "id": str(sid),
+            "tags": ["a"],
+            "items": [1, 2],
+            "greeting": {"content": "hello"},
+        })
+
+    def test_register(self):
+        self.assertRaises(TypeError, lambda: self.serializer.dumps(Point(1, 2)))
+        self.serializer.register(Point, lambda p: [p.x, p.y])
+        # resolves the adapter by the base class
+        self.assertEqual(self.dumps([Point(1, 2), Point3D(3, 4)]), [[1, 2], [3, 4]])
+
+    def test_instance_json(self):
+        point = Point(1, 2)
+        point.__json__ = lambda: "1,2"
+        self.assertEqual(self.dumps([point]), ["1,2"])
+        self.serializer.register(Point, lambda p: [p.x, p.y])
+        self.assertEqual(self.dumps([Point(3, 4), point]), [[3, 4], "1,2"])
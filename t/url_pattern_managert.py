@@ -15,6 +15,8 @@
 # under the License.
 
 import unittest
+import uuid
+from datetime import date
 
 from medoly.kanon.manager import URLPatternManager
 
@@ -58,3 +60,34 @@ class URLPatternManagerTest(unittest.TestCase):
     def test_add_pattern(self):
         self.mgr.add_pattern("date", r'\d{4}')
         self.assertEqual(self.mgr.url("/{d:date}"), '/(?P<d>\d{4})')
+
+    def test_segments(self):
+        int_converter = self.mgr.converters['int']
+        any_converter = self.mgr.converters['any']
+        self.assertEqual(self.mgr.segments("/post/{post_id:int}"), ['', 'post', ('post_id', int_converter)])
+        self.assertEqual(self.mgr.segments("/post/{post_id}/"), ['', 'post', ('post_id', any_converter), ''])
+
+        # regex matching rules
+        self.assertIsNone(self.mgr.segments("/post/{post_id:([0-9]+)}"))
+        self.assertIsNone(self.mgr.segments("/post/([^/]+)"))
+        self.assertIsNone(self.mgr.segments("/post/p{post_id:int}"))
+        self.assertIsNone(self.mgr.segments("/post/{post_id:unknown}"))
+
+    def test_url_converters(self):
+        self.assertEqual(self.mgr.url_converters("/post/{post_id:int}/{name}"), (("post_id", int),))
+        self.assertEqual(self.mgr.url_converters("/post/{post_id}"), ())
+
+    def test_converter(self):
+        converters = URLPatternManager().converters
+        self.assertEqual(converters['int']("-12"), -12)
+        self.assertEqual(converters['float']("1.5"), 1.5)
+        self.assertEqual(converters['date']("2016-02-01"), date(2016, 2, 1))
+        self.assertEqual(converters['uuid']("c2a1b0c6-3f4e-4f8e-9a51-0a1b2c3d4e5f"),
+                         uuid.UUID("c2a1b0c6-3f4e-4f8e-9a51-0a1b2c3d4e5f"))
+        self.assertEqual(converters['any']("a%20b"), "a b")
+        self.assertRaises(ValueError, lambda: converters['date']("2016-13-01"))
+
+    def test_add_pattern_converter(self):
+        mgr = URLPatternManager()
+        mgr.add_pattern("yy", r"\d\d", int)
+        self.assertEqual(mgr.url_converters("/{year:yy}"), (("year", int),))
@@ -16,7 +16,7 @@
 
 
 import unittest
-from medoly.util import lazy_attr, get_class_bases
+from medoly.util import lazy_attr, get_class_bases, synthesize_class
 
 
 class Dummy(object):
@@ -67,3 +67,51 @@ class UtilTest(unittest.TestCase):
     def test_get_class_bases_has_bases(self):
         bases = get_class_bases(Sub)
         self.assertEquals(bases, [Base, Dummy])
+
+    def test_synthesize_class(self):
+
+        class Handler(object):
+
+            def get(self):
+                return "handler"
+
+        class Mixin(object):
+
+            def post(self):
+                return "mixin"
+
+        class View(Mixin):
+
+            def get(self):
+                return "view"
+
+        cache = {}
+        cls = synthesize_class(View, Handler, cache)
+        self.assertIs(synthesize_class(View, Handler, cache), cls)
+        self.assertIsNot(synthesize_class(View, Handler), cls)
+        self.assertEqual(cls.__mro__[1:], (View, Mixin, Handler, object))
+        view = cls()
+        self.assertEqual(view.get(), "view")
+        self.assertEqual(view.post(), "mixin")
+        self.assertTrue(isinstance(view, View))
+        # the class attributes set later are inherited
+        View.thing = "thing"
+        self.assertEqual(cls.thing, "thing")
+        # the view class is not changed by the synthesized class
+        cls.thing = "other"
+        self.assertEqual(View.thing, "thing")
+
+    def test_synthesize_class_fallback(self):
+
+        class View(object):
+
+            def get(self):
+                return "view"
+
+        class Handler(View):
+            pass
+
+        # the MRO can't be created, copies the view attributes
+        cls = synthesize_class(View, Handler)
+        self.assertEqual(cls.__mro__, (cls, Handler, View, object))
+        self.assertEqual(cls().get(), "view")
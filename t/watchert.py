@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Medoly
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from medoly import cmd
+from medoly.config import SelectConfig
+from medoly.config.watcher import ConfigWatcher, flatten
+
+
+class App(object):
+    pass
+
+
+class ConfigWatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.conf = os.path.join(self.path, "app.conf")
+        self.write("sqlalchemy { pool_size = 5, url = db }\ndebug = off")
+        self.watcher = ConfigWatcher(cmd.load_config_file)
+        self.watcher.add_file(self.conf)
+        self.app = App()
+        self.app.config = SelectConfig({"theme": "dark"})
+        self.app.config.update(cmd.config_from_file(self.conf))
+        self.app.config = self.app.config.snapshot()
+        self.watcher.app = self.app
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write(self, content, path=None):
+        with open(path or self.conf, "w") as f:
+            f.write(content)
+        # the size or mtime changes in the same second
+        os.utime(path or self.conf, (0, os.path.getmtime(path or self.conf) + len(content)))
+
+    def test_flatten(self):
+        self.assertEqual(flatten({"a": {"b": 1, "c": {}}, "d": [1]}), {"a.b": 1, "a.c": {}, "d": [1]})
+
+    def test_check(self):
+        calls = []
+        self.watcher.watch("sqlalchemy", lambda new, old: calls.append(("sqlalchemy", new, old)))
+        self.watcher.watch("sqlalchemy.pool_size", lambda new, old: calls.append(("pool_size", new, old)))
+        self.watcher.watch("debug", lambda new, old: calls.append(("debug", new, old)))
+        self.assertEqual(self.watcher.check(), [])
+
+        config = self.app.config
+        self.write("sqlalchemy { pool_size = 10, url = db }\n")
+        self.assertEqual(self.watcher.check(), ["debug", "sqlalchemy.pool_size"])
+        self.assertEqual(self.app.config.get("sqlalchemy.pool_size"), 10)
+        self.assertFalse("debug" in self.app.config)
+        self.assertEqual(self.app.config.get("theme"), "dark")
+        self.assertEqual(config.get("sqlalchemy.pool_size"), 5)
+        self.assertEqual(calls, [("sqlalchemy", {"pool_size": 10, "url": "db"}, {"pool_size": 5, "url": "db"}),
+                                 ("pool_size", 10, 5),
+                                 ("debug", None, False)])
+
+    def test_invalid_file(self):
+        self.write("sqlalchemy { pool_size = ")
+        self.assertEqual(self.watcher.check(), [])
+        self.assertEqual(self.app.config.get("sqlalchemy.pool_size"), 5)
+
+    def test_overrides(self):
+        config = SelectConfig()
+        config.update(self.app.config.thaw())
+        config.set("sqlalchemy.url", "cli")
+        self.watcher.set_overrides({"sqlalchemy": {"url": "cli"}})
+        self.watcher.config = config
+        self.app.config = config.snapshot()
+        self.write("sqlalchemy { pool_size = 10, url = file }\n")
+        self.assertEqual(self.watcher.check(), ["debug", "sqlalchemy.pool_size"])
+        self.assertEqual(self.app.config.get("sqlalchemy.url"), "cli")
+        # the mutable config is synchronized
+        self.assertEqual(config.get("sqlalchemy"), {"pool_size": 10, "url": "cli"})
+        self.assertFalse("debug" in config)
+
+    def test_file_layers(self):
+        local = os.path.join(self.path, "local.conf")
+        self.write("sqlalchemy.pool_size = 20", local)
+        self.watcher.add_file(local)
+        self.app.config = self.app.config.updated({"sqlalchemy.pool_size": 20})
+        # the later file keeps its key
+        self.write("sqlalchemy { pool_size = 10, url = db }\ndebug = off")
+        self.assertEqual(self.watcher.check(), [])
+        self.assertEqual(self.app.config.get("sqlalchemy.pool_size"), 20)
+        # the earlier file value is used after the later file removes the key
+        self.write("", local)
+        self.assertEqual(self.watcher.check(), ["sqlalchemy.pool_size"])
+        self.assertEqual(self.app.config.get("sqlalchemy.pool_size"), 10)
+
+    def test_include(self):
+        base = os.path.join(self.path, "base.conf")
+        self.write("cache.ttl = 1", base)
+        self.write('include "base.conf"\nsqlalchemy { pool_size = 5, url = db }\ndebug = off')
+        self.assertEqual(self.watcher.check(), ["cache.ttl"])
+        self.write("cache.ttl = 30", base)
+        self.assertEqual(self.watcher.check(), ["cache.ttl"])
+        self.assertEqual(self.app.config.get("cache.ttl"), 30)